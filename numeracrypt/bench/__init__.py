@@ -0,0 +1,5 @@
+"""
+Benchmark suite for NumeraCrypt.
+
+Run it with `python -m numeracrypt.bench --help`.
+"""
@@ -0,0 +1,79 @@
+"""
+Command line entry point of the benchmark suite:
+
+    python -m numeracrypt.bench --sizes 1K,1M --out bench.json
+    python -m numeracrypt.bench --sizes 1K,1M --baseline bench.json
+"""
+from numeracrypt.bench.cases import default_cases
+from numeracrypt.bench import runner
+import argparse
+import sys
+
+GROUPS = ("cipher", "codec", "key", "file", "dir", "startup")
+UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as 512, 64K, 1M or 1G (binary units)."""
+    text = text.strip().upper().rstrip("B") or "0"
+    unit = text[-1] if text[-1] in UNITS else ""
+    try:
+        return int(text[:len(text) - len(unit)]) * UNITS[unit]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size: {text!r}")
+
+
+def _list(convert):
+    return lambda text: [convert(item) for item in text.split(",") if item.strip()]
+
+
+def _format(result) -> str:
+    rate = f"{result['mb_per_s']:10.1f} MB/s" if result["mb_per_s"] is not None else " " * 15
+    rss = f"{result['peak_rss'] / (1 << 20):8.1f} MiB" if result["peak_rss"] is not None else ""
+    return (f"{result['label']:<70} p50 {result['p50'] * 1e3:10.3f} ms  "
+            f"p99 {result['p99'] * 1e3:10.3f} ms {rate} {rss}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m numeracrypt.bench", description="Benchmark NumeraCrypt.")
+    parser.add_argument("--sizes", type=_list(parse_size), default=[1, 1 << 10, 1 << 20],
+                        help="Comma separated payload sizes, e.g. 1,1K,1M,1G.")
+    parser.add_argument("--rounds", type=_list(int), default=[8, 64], help="Comma separated key round counts.")
+    parser.add_argument("--backends", type=_list(str), default=["python", "numpy"],
+                        help="Comma separated backends (python, numpy, auto).")
+    parser.add_argument("--groups", type=_list(str), default=list(GROUPS),
+                        help="Comma separated case groups: " + ", ".join(GROUPS) + ".")
+    parser.add_argument("--min-time", type=float, default=runner.MIN_TIME,
+                        help="Minimum time in seconds spent on each case.")
+    parser.add_argument("--trace", action="store_true", help="Also record peak allocations with tracemalloc.")
+    parser.add_argument("--no-isolate", dest="isolate", action="store_false",
+                        help="Run all cases in this process (peak RSS is then cumulative).")
+    parser.add_argument("--out", help="Write the JSON report to this file.")
+    parser.add_argument("--baseline", help="Compare against a JSON report written by --out.")
+    parser.add_argument("--threshold", type=float, default=runner.DEFAULT_THRESHOLD,
+                        help="Allowed relative p50 slowdown before a case counts as a regression.")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"Unknown groups: {', '.join(sorted(unknown))}")
+
+    cases = default_cases(args.sizes, args.rounds, args.backends, args.groups)
+    report = runner.run(cases, isolate=args.isolate, progress=lambda r: print(_format(r), flush=True),
+                        min_time=args.min_time, trace=args.trace)
+    if args.out:
+        runner.save(report, args.out)
+
+    if args.baseline:
+        regressions = runner.compare(report, runner.load(args.baseline), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression.label}: p50 {regression.baseline * 1e3:.3f} ms -> "
+                  f"{regression.current * 1e3:.3f} ms ({regression.change:+.0%})")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Benchmark cases. Every case factory does its setup (payloads, keys, synthetic files) and
+returns the zero-argument function that gets timed, plus the number of bytes it processes.
+"""
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.convert import ASCII
+from numeracrypt.core.key import Key
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+Timed = Tuple[Callable[[], object], int]
+
+# Scratch directories created by the current process, removed by cleanup().
+_SCRATCH: List[str] = []
+
+
+class Case(NamedTuple):
+    """One benchmark: a registered factory name and the parameters passed to it."""
+    name: str
+    params: Dict[str, object]
+
+    @property
+    def label(self) -> str:
+        return self.name + "".join(f" {k}={v}" for k, v in sorted(self.params.items()))
+
+
+def _key(rounds: int) -> str:
+    return Key("bench", rounds=rounds).generate()
+
+
+def _text(size: int) -> str:
+    # Printable ASCII, so the legacy string path sees realistic input.
+    rng = random.Random(size)
+    return "".join(chr(rng.randint(32, 126)) for _ in range(min(size, 1 << 16))) * (size // (1 << 16) + 1)
+
+
+def _scratch() -> str:
+    path = tempfile.mkdtemp(prefix="numeracrypt-bench-")
+    _SCRATCH.append(path)
+    return path
+
+
+def cipher_encrypt(size: int, rounds: int, backend: str) -> Timed:
+    """NumeraCrypt.encrypt() on a string (rounds + Base91)."""
+    nc = NumeraCrypt(_text(size)[:size], _key(rounds), backend=backend)
+    return nc.encrypt, size
+
+
+def cipher_decrypt(size: int, rounds: int, backend: str) -> Timed:
+    """NumeraCrypt.decrypt() on the ciphertext of a string."""
+    key = _key(rounds)
+    encrypted = NumeraCrypt(_text(size)[:size], key).encrypt()
+    nc = NumeraCrypt(encrypted, key, backend=backend)
+    return nc.decrypt, size
+
+
+def cipher_encrypt_bytes(size: int, rounds: int, backend: str) -> Timed:
+    """NumeraCrypt.encrypt_bytes() in place on a bytearray."""
+    nc = NumeraCrypt("", _key(rounds), backend=backend)
+    buf = bytearray(os.urandom(size))
+    return (lambda: nc.encrypt_bytes(buf)), size
+
+
+def codec_encode_base91(size: int) -> Timed:
+    """ASCII.encode_base91()."""
+    ascii_inst = ASCII(_text(size)[:size])
+    return ascii_inst.encode_base91, size
+
+
+def codec_decode_base91(size: int) -> Timed:
+    """ASCII.decode_base91()."""
+    ascii_inst = ASCII(ASCII(_text(size)[:size]).encode_base91())
+    return ascii_inst.decode_base91, size
+
+
+def key_generate(rounds: int) -> Timed:
+    """Key.generate()."""
+    key = Key("bench", rounds=rounds)
+    return key.generate, 0
+
+
+def key_disassemble(rounds: int) -> Timed:
+    """Key.disassemble()."""
+    key = Key(_key(rounds))
+    return key.disassemble, 0
+
+
+def file_encrypt(size: int, stream: bool, encoding: str, backend: str) -> Timed:
+    """File mode: encrypt one synthetic file, decrypting it again between runs."""
+    path = os.path.join(_scratch(), "payload.bin")
+    with open(path, "wb") as handle:
+        handle.write(_text(size)[:size].encode("ascii"))
+    key = _key(8)
+    options = dict(file=True, stream=stream, encoding=encoding, backend=backend)
+    encrypt = NumeraCrypt(path, key, **options).encrypt
+    decrypt = NumeraCrypt(path, key, **options).decrypt
+    state = {"encrypted": False}
+
+    def run():
+        # Alternate so the input never grows into ciphertext of ciphertext.
+        (decrypt if state["encrypted"] else encrypt)()
+        state["encrypted"] = not state["encrypted"]
+    return run, size
+
+
+def dir_encrypt(files: int, size: int, workers: int, backend: str) -> Timed:
+    """Directory mode over a synthetic two-level tree, alternating encrypt and decrypt."""
+    root = _scratch()
+    payload = _text(size)[:size].encode("ascii")
+    for i in range(files):
+        folder = os.path.join(root, f"d{i % 16:02d}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"f{i}.txt"), "wb") as handle:
+            handle.write(payload)
+    key = _key(8)
+    options = dict(dir=True, stream=True, workers=workers, backend=backend)
+    encrypt = NumeraCrypt(root, key, **options).encrypt
+    decrypt = NumeraCrypt(root, key, **options).decrypt
+    state = {"encrypted": False}
+
+    def run():
+        (decrypt if state["encrypted"] else encrypt)()
+        state["encrypted"] = not state["encrypted"]
+    return run, files * size
+
+
+def _python(*args: str) -> Callable[[], object]:
+    # A fresh interpreter that imports this checkout and never forwards to a server.
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, NUMERACRYPT_DAEMON="0")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    command = [sys.executable, *args]
+    return lambda: subprocess.run(command, check=True, env=env, stdout=subprocess.DEVNULL)
+
+
+def startup_python() -> Timed:
+    """A bare interpreter start, the baseline of the other startup cases."""
+    return _python("-c", "pass"), 0
+
+
+def startup_import() -> Timed:
+    """Interpreter start plus importing numeracrypt.core.cipher."""
+    return _python("-c", "import numeracrypt.core.cipher"), 0
+
+
+def startup_cli() -> Timed:
+    """`numeracrypt encrypt --content` on a short string, in a fresh interpreter."""
+    return _python("-m", "numeracrypt.cli", "encrypt", "--content", "hello", "--key", _key(8)), 0
+
+
+FACTORIES = {
+    "cipher.encrypt": cipher_encrypt,
+    "cipher.decrypt": cipher_decrypt,
+    "cipher.encrypt_bytes": cipher_encrypt_bytes,
+    "codec.encode_base91": codec_encode_base91,
+    "codec.decode_base91": codec_decode_base91,
+    "key.generate": key_generate,
+    "key.disassemble": key_disassemble,
+    "file.encrypt": file_encrypt,
+    "dir.encrypt": dir_encrypt,
+    "startup.python": startup_python,
+    "startup.import": startup_import,
+    "startup.cli": startup_cli,
+}
+
+
+def build(case: Case) -> Timed:
+    return FACTORIES[case.name](**case.params)
+
+
+def cleanup() -> None:
+    """Remove the scratch directories created by the file and directory cases."""
+    while _SCRATCH:
+        shutil.rmtree(_SCRATCH.pop(), ignore_errors=True)
+
+
+def default_cases(sizes, rounds, backends, groups) -> Iterator[Case]:
+    """The benchmark matrix for the given payload sizes, round counts and backends."""
+    if "cipher" in groups:
+        for size in sizes:
+            for r in rounds:
+                for backend in backends:
+                    yield Case("cipher.encrypt", dict(size=size, rounds=r, backend=backend))
+                    yield Case("cipher.decrypt", dict(size=size, rounds=r, backend=backend))
+                    yield Case("cipher.encrypt_bytes", dict(size=size, rounds=r, backend=backend))
+    if "codec" in groups:
+        for size in sizes:
+            yield Case("codec.encode_base91", dict(size=size))
+            yield Case("codec.decode_base91", dict(size=size))
+    if "key" in groups:
+        for r in rounds:
+            yield Case("key.generate", dict(rounds=r))
+            yield Case("key.disassemble", dict(rounds=r))
+    if "file" in groups:
+        for size in sizes:
+            for backend in backends:
+                yield Case("file.encrypt", dict(size=size, stream=True, encoding="base91", backend=backend))
+                yield Case("file.encrypt", dict(size=size, stream=True, encoding="raw", backend=backend))
+                yield Case("file.encrypt", dict(size=size, stream=False, encoding="base91", backend=backend))
+    if "dir" in groups:
+        for backend in backends:
+            yield Case("dir.encrypt", dict(files=200, size=4096, workers=1, backend=backend))
+            yield Case("dir.encrypt", dict(files=200, size=4096, workers=4, backend=backend))
+    if "startup" in groups:
+        yield Case("startup.python", {})
+        yield Case("startup.import", {})
+        yield Case("startup.cli", {})
@@ -0,0 +1,165 @@
+"""
+Benchmark runner: times cases, collects latency percentiles, throughput and peak memory,
+and compares a run against a stored baseline.
+"""
+from numeracrypt.bench.cases import Case, build, cleanup
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# A case is repeated until it ran at least MIN_REPEATS times and for at least MIN_TIME seconds,
+# but never more than MAX_REPEATS times.
+MIN_REPEATS = 5
+MAX_REPEATS = 1000
+MIN_TIME = 0.5
+
+# A case is a regression when its median latency grew by more than this fraction.
+DEFAULT_THRESHOLD = 0.10
+
+
+class Regression(NamedTuple):
+    label: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _peak_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(case: Case, min_repeats: int = MIN_REPEATS, min_time: float = MIN_TIME,
+            max_repeats: int = MAX_REPEATS, trace: bool = False) -> Dict[str, object]:
+    """
+    Run one case in the current process and return its statistics.
+
+    :param case: The case to run.
+    :param min_repeats: Minimum number of timed calls.
+    :param min_time: Minimum total time in seconds spent in timed calls.
+    :param max_repeats: Maximum number of timed calls.
+    :param trace: Also record the peak Python allocation of one extra call with tracemalloc.
+        That call is not timed, since tracing slows allocation down considerably.
+    """
+    try:
+        func, nbytes = build(case)
+        func()  # warm up caches and lazily built tables
+        samples = []
+        total = 0.0
+        while len(samples) < max_repeats and (len(samples) < min_repeats or total < min_time):
+            begin = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - begin
+            samples.append(elapsed)
+            total += elapsed
+
+        peak_alloc = None
+        if trace:
+            tracemalloc.start()
+            func()
+            peak_alloc = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        cleanup()
+
+    samples.sort()
+    p50 = _percentile(samples, 0.50)
+    return {
+        "label": case.label,
+        "case": case.name,
+        "params": case.params,
+        "bytes": nbytes,
+        "repeats": len(samples),
+        "min": samples[0],
+        "mean": total / len(samples),
+        "p50": p50,
+        "p90": _percentile(samples, 0.90),
+        "p99": _percentile(samples, 0.99),
+        "mb_per_s": nbytes / p50 / 1e6 if nbytes and p50 else None,
+        "peak_rss": _peak_rss(),
+        "peak_alloc": peak_alloc,
+    }
+
+
+def metadata() -> Dict[str, object]:
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy_version,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run(cases: Iterable[Case], isolate: bool = True, progress=None, **options) -> Dict[str, object]:
+    """
+    Run all cases and return the JSON-serialisable report.
+
+    :param cases: The cases to run.
+    :param isolate: Run every case in a fresh process, so peak RSS belongs to that case alone.
+    :param progress: Optional callable receiving each result as soon as it is available.
+    :param options: Passed on to measure().
+    """
+    results = []
+    for case in cases:
+        if isolate:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(measure, case, **options).result()
+        else:
+            result = measure(case, **options)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return {"meta": metadata(), "results": results}
+
+
+def load(path: str) -> Dict[str, object]:
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def save(report: Dict[str, object], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """
+    Return the cases whose median latency is more than `threshold` above the baseline.
+    Cases missing from either report are ignored.
+    """
+    previous = {r["label"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old: Optional[dict] = previous.get(result["label"])
+        if old and old["p50"] > 0 and result["p50"] > old["p50"] * (1 + threshold):
+            regressions.append(Regression(result["label"], old["p50"], result["p50"]))
+    return regressions
@@ -1,76 +1,211 @@
 import typer
-from numeracrypt.core.cipher import NumeraCrypt
-from numeracrypt.core.key import Key
+from numeracrypt.core.cipher import NumeraCrypt, resolve_stream
+from numeracrypt.core.key import Key, key_store_location
+from numeracrypt.core.keycache import key_cache
+from numeracrypt.core.backend import BACKENDS
+from numeracrypt.core.codec import CODECS
+from numeracrypt.core.compress import METHODS
+from numeracrypt.core.keystore import KeyStore, default_store_path, file_fingerprint
+from numeracrypt.core.file import FSYNC_POLICIES, SYMLINK_POLICIES, File
+from numeracrypt.core.metrics import Profile
+from contextlib import contextmanager
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import List
 import os
-# Get the directory where this file resides.
-base_dir = os.path.dirname(os.path.abspath(__file__))
-dotenv_path = os.path.join(base_dir, '.env')
-load_dotenv(dotenv_path)
-
-def key_store_location() -> str:
-    env_path = os.getenv("KEY_STORAGE_DIRECTORY")
-    if not env_path:
-        # Warn the user and use the current working directory as a fallback.
-        import typer
-        typer.echo("❗ Warning: KEY_STORAGE_DIRECTORY is not set. Using the current working directory.")
-        return os.getcwd()
-    return os.path.expandvars(env_path)
+import sys
 
 
 app = typer.Typer(help="NumeraCrypt: A custom encryption tool.")
 
 def validate_single_source(*sources):
-    """Ensure that exactly one source (content, file, dir) is provided."""
+    """Ensure that exactly one source (content, file, dir, stdin) is provided."""
     provided = [s for s in sources if s is not None]
     if len(provided) == 0:
-        typer.echo("❗ Error: Please specify exactly one of --content, --file, or --dir.")
+        typer.echo("❗ Error: Please specify exactly one of --content, --file, --dir or --stdin.")
         raise typer.Exit(1)
     if len(provided) > 1:
-        typer.echo("❗ Error: Please provide only one of --content, --file, or --dir at a time.")
+        typer.echo("❗ Error: Please provide only one of --content, --file, --dir or --stdin at a time.")
+        raise typer.Exit(1)
+
+def validate_pipe(stdin: bool, stream: bool, mmap: bool):
+    """Standard input can only be processed as a stream."""
+    if stdin and (stream is False or mmap):
+        typer.echo("❗ Error: --stdin is always streamed; it cannot be combined with --no-stream or --mmap.", err=True)
+        raise typer.Exit(1)
+
+
+def pipe(nc: NumeraCrypt, encrypt: bool):
+    """Stream standard input through the cipher to standard output."""
+    try:
+        (nc.encrypt_pipe if encrypt else nc.decrypt_pipe)(sys.stdin.buffer, sys.stdout.buffer)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`). Point stdout at devnull so the interpreter
+        # does not fail again flushing it on exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise typer.Exit(1)
+    except ValueError as e:
+        typer.echo(f"❗ Error: {e}", err=True)
+        raise typer.Exit(1)
+
+def validate_backend(backend: str):
+    """Ensure the requested transform backend exists."""
+    if backend not in ("auto", *BACKENDS):
+        typer.echo(f"❗ Error: Unknown backend '{backend}'. Choose one of: auto, {', '.join(BACKENDS)}.")
+        raise typer.Exit(1)
+
+def validate_encoding(encoding: str):
+    """Ensure the requested output encoding exists."""
+    if encoding not in CODECS:
+        typer.echo(f"❗ Error: Unknown encoding '{encoding}'. Choose one of: {', '.join(CODECS)}.")
+        raise typer.Exit(1)
+
+def validate_file_options(backend: str, encoding: str, stream: bool, mmap: bool, fsync: str, symlinks: str,
+                          compression: str = None, fingerprint: bool = False) -> bool:
+    """
+    Check the options shared by encrypt, decrypt and rekey.
+
+    :return: Whether files are streamed: --stream/--no-stream, or the legacy text format
+        unless a stream encoding is given.
+    """
+    validate_backend(backend)
+    validate_encoding(encoding)
+    if mmap and encoding != "raw":
+        typer.echo("❗ Error: --mmap requires --encoding raw.")
+        raise typer.Exit(1)
+    if compression is not None and compression not in METHODS:
+        typer.echo(f"❗ Error: Unknown compression '{compression}'. Choose one of: {', '.join(METHODS)}.")
+        raise typer.Exit(1)
+    if mmap and compression:
+        typer.echo("❗ Error: --mmap cannot be combined with --compression.")
+        raise typer.Exit(1)
+    if fsync not in FSYNC_POLICIES:
+        typer.echo(f"❗ Error: Unknown fsync policy '{fsync}'. Choose one of: {', '.join(FSYNC_POLICIES)}.")
+        raise typer.Exit(1)
+    if symlinks not in SYMLINK_POLICIES:
+        typer.echo(f"❗ Error: Unknown symlink policy '{symlinks}'. Choose one of: {', '.join(SYMLINK_POLICIES)}.")
+        raise typer.Exit(1)
+    if fingerprint and encoding != "container":
+        typer.echo("❗ Error: --fingerprint requires --encoding container.")
+        raise typer.Exit(1)
+    try:
+        return resolve_stream(stream, encoding, mmap)
+    except ValueError as e:
+        typer.echo(f"❗ Error: {e}")
+        raise typer.Exit(1)
+
+@contextmanager
+def profiled(profile: bool, profile_dump: Path):
+    """
+    Record the block with a stage Profile and print its breakdown (--profile), and/or run it
+    under cProfile and write the pstats dump (--profile-dump).
+    """
+    if not profile and profile_dump is None:
+        yield
+        return
+    import cProfile
+    stages = Profile()
+    profiler = cProfile.Profile() if profile_dump is not None else None
+    with stages:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(str(profile_dump))
+            if profile:
+                typer.echo(stages.report(), err=True)
+            if profiler is not None:
+                typer.echo(f"📄 Profile written to {profile_dump}", err=True)
+
+def save_key(key: str, label: str = None, err: bool = False):
+    """Add a key to the key store and print its fingerprint."""
+    directory = key_store_location()
+    fingerprint = Key(key).safe(directory, label)
+    typer.echo(f"📄 Key {fingerprint} saved to {default_store_path(directory)}", err=err)
+
+def report_results(results):
+    """Print failed files of a directory run and exit with an error if there were any."""
+    failed = [r for r in results if not r.ok]
+    skipped = sum(1 for r in results if r.skipped)
+    for result in failed:
+        typer.echo(f"❗ {result.path}: {result.error}")
+    typer.echo(f"📄 {len(results) - len(failed) - skipped} of {len(results)} files processed, {skipped} unchanged.")
+    if failed:
         raise typer.Exit(1)
 
 @app.command()
 def encrypt(
     content: str = typer.Option(None, help="Content to encrypt."),
-    file: Path = typer.Option(None, exists=True, help="Path to the file to encrypt."),
+    file: Path = typer.Option(None, exists=True, allow_dash=True, help="Path to the file to encrypt, or - for standard input."),
     dir: Path = typer.Option(None, exists=True, help="Path to the directory to encrypt."),
     key: str = typer.Option(None, help="Encryption key. If not provided, one will be generated."),
-    keysafe: bool = typer.Option(False, help="Flag to save the encryption key to a file."),
-    contentsafe: bool = typer.Option(False, help="Flag to save the encrypted content to a file.")
+    keysafe: bool = typer.Option(False, help="Flag to save the encryption key to the key store."),
+    label: str = typer.Option(None, help="Label stored with the key by --keysafe."),
+    fingerprint: bool = typer.Option(False, help="Record the key's fingerprint in the file (requires --encoding container)."),
+    contentsafe: bool = typer.Option(False, help="Flag to save the encrypted content to a file."),
+    backend: str = typer.Option("auto", help="Byte transform backend: auto, python or numpy."),
+    stream: bool = typer.Option(None, help="Stream files in chunks as raw bytes (implied by --encoding other than base91 and by --mmap). Without it files use the legacy text format."),
+    encoding: str = typer.Option("base91", help="Output encoding of streamed files: base91, base64, raw or container."),
+    workers: int = typer.Option(1, help="Number of worker processes for --dir, or of workers splitting one --file with --encoding raw."),
+    include: List[str] = typer.Option(None, help="Glob pattern of files to process in --dir (repeatable)."),
+    exclude: List[str] = typer.Option(None, help="Glob pattern of files or folders to skip in --dir (repeatable)."),
+    max_depth: int = typer.Option(None, help="How many folder levels --dir descends (0 = top level only)."),
+    symlinks: str = typer.Option("skip", help="Symlinks in --dir: skip, files or follow."),
+    manifest: bool = typer.Option(True, help="Track --dir files in a manifest and skip those already encrypted."),
+    fsync: str = typer.Option("none", help="Flush written files to disk: none, file (each file) or batch (once per --dir run)."),
+    mmap: bool = typer.Option(False, help="Transform files in place through a memory map (requires --encoding raw)."),
+    profile: bool = typer.Option(False, help="Print the time spent in file I/O, cipher rounds and encoding."),
+    profile_dump: Path = typer.Option(None, help="Write a cProfile/pstats dump of the run to this file."),
+    stdin: bool = typer.Option(False, "--stdin", help="Stream standard input to standard output (same as --file -)."),
+    compression: str = typer.Option(None, help="Compress before encrypting: zlib, lzma or bz2 (skipped for incompressible data)."),
+    compression_level: int = typer.Option(None, help="Compression level (lzma preset); default depends on --compression.")
 ):
-    """Encrypt files, directories, or strings using NumeraCrypt."""
+    """Encrypt files, directories, strings or standard input using NumeraCrypt."""
+    if file is not None and str(file) == "-":
+        file, stdin = None, True
     # Ensure exactly one source is provided.
-    validate_single_source(content, file, dir)
+    validate_single_source(content, file, dir, True if stdin else None)
+    validate_pipe(stdin, stream, mmap)
 
     # Generate a key if one wasn't provided.
     if not key:
         key = Key(rounds=8, max_length=64).generate()
-        typer.echo(f"🔑 Generated key: {key}")
+        # Standard output carries the ciphertext in pipe mode.
+        typer.echo(f"🔑 Generated key: {key}", err=stdin)
 
     # Validate the provided (or generated) key.
-    if not Key(key).validate():
+    if not key_cache.validate(key):
         typer.echo("❗ Invalid key format. Please use a valid key.")
         raise typer.Exit(1)
+    stream = validate_file_options(backend, encoding, stream, mmap, fsync, symlinks, compression, fingerprint)
+    file_options = dict(compression=compression, compression_level=compression_level, fingerprint=fingerprint)
 
     encrypted_result = None
-    if content:
-        nc = NumeraCrypt(str(content), key)
-        encrypted_result = nc.encrypt()
-        typer.echo(f"🔒 Encrypted content: {encrypted_result}")
-    elif file:
-        nc = NumeraCrypt(str(file), key, file=True)
-        nc.encrypt()
-        typer.echo(f"🔒 Encrypted file: {file}")
-    elif dir:
-        nc = NumeraCrypt(str(dir), key, dir=True)
-        nc.encrypt()
-        typer.echo(f"🔒 Encrypted directory: {dir}")
+    with profiled(profile, profile_dump):
+        if content:
+            nc = NumeraCrypt(str(content), key, backend=backend, compression=compression,
+                             compression_level=compression_level)
+            encrypted_result = nc.encrypt()
+            typer.echo(f"🔒 Encrypted content: {encrypted_result}")
+        elif file:
+            nc = NumeraCrypt(str(file), key, file=True, backend=backend, stream=stream, encoding=encoding,
+                             workers=workers, fsync=fsync, mmap=mmap, **file_options)
+            nc.encrypt()
+            typer.echo(f"🔒 Encrypted file: {file}")
+        elif dir:
+            nc = NumeraCrypt(str(dir), key, dir=True, backend=backend, stream=stream, encoding=encoding,
+                             workers=workers, include=include, exclude=exclude, max_depth=max_depth,
+                             symlinks=symlinks, manifest=manifest, fsync=fsync, mmap=mmap, **file_options)
+            report_results(nc.encrypt())
+            typer.echo(f"🔒 Encrypted directory: {dir}")
+        elif stdin:
+            nc = NumeraCrypt("", key, backend=backend, stream=True, encoding=encoding, **file_options)
+            pipe(nc, True)
 
     if keysafe:
-        Key(key).safe()
-        typer.echo(f"📄 Key saved to {key_store_location()}")
+        save_key(key, label, err=stdin)
 
     if contentsafe:
         # Only applicable for string encryption.
@@ -84,43 +219,77 @@ def encrypt(
 @app.command()
 def decrypt(
     content: str = typer.Option(None, help="Content to decrypt."),
-    file: Path = typer.Option(None, exists=True, help="Path to the file to decrypt."),
+    file: Path = typer.Option(None, exists=True, allow_dash=True, help="Path to the file to decrypt, or - for standard input."),
     dir: Path = typer.Option(None, exists=True, help="Path to the directory to decrypt."),
     key: str = typer.Option(None, help="Decryption key."),
-    keysafe: bool = typer.Option(False, help="Flag to save the decryption key to a file."),
-    contentsafe: bool = typer.Option(False, help="Flag to save the decrypted content to a file.")
+    keysafe: bool = typer.Option(False, help="Flag to save the decryption key to the key store."),
+    label: str = typer.Option(None, help="Label stored with the key by --keysafe."),
+    key_store: bool = typer.Option(False, help="Decrypt containers carrying a key fingerprint with their key from the key store; --key is then only needed for files without one."),
+    contentsafe: bool = typer.Option(False, help="Flag to save the decrypted content to a file."),
+    backend: str = typer.Option("auto", help="Byte transform backend: auto, python or numpy."),
+    stream: bool = typer.Option(None, help="Stream files in chunks as raw bytes (implied by --encoding other than base91 and by --mmap). Without it files use the legacy text format."),
+    encoding: str = typer.Option("base91", help="Output encoding of streamed files: base91, base64, raw or container."),
+    workers: int = typer.Option(1, help="Number of worker processes for --dir, or of workers splitting one --file with --encoding raw."),
+    include: List[str] = typer.Option(None, help="Glob pattern of files to process in --dir (repeatable)."),
+    exclude: List[str] = typer.Option(None, help="Glob pattern of files or folders to skip in --dir (repeatable)."),
+    max_depth: int = typer.Option(None, help="How many folder levels --dir descends (0 = top level only)."),
+    symlinks: str = typer.Option("skip", help="Symlinks in --dir: skip, files or follow."),
+    manifest: bool = typer.Option(True, help="Track --dir files in a manifest and skip those already decrypted."),
+    fsync: str = typer.Option("none", help="Flush written files to disk: none, file (each file) or batch (once per --dir run)."),
+    mmap: bool = typer.Option(False, help="Transform files in place through a memory map (requires --encoding raw)."),
+    profile: bool = typer.Option(False, help="Print the time spent in file I/O, cipher rounds and encoding."),
+    profile_dump: Path = typer.Option(None, help="Write a cProfile/pstats dump of the run to this file."),
+    stdin: bool = typer.Option(False, "--stdin", help="Stream standard input to standard output (same as --file -).")
 ):
-    """Decrypt files, directories, or strings using NumeraCrypt."""
+    """Decrypt files, directories, strings or standard input using NumeraCrypt."""
+    if file is not None and str(file) == "-":
+        file, stdin = None, True
     # Validate that a source is provided before doing any further processing.
-    if not (content or file or dir):
-        typer.echo("❗ Error: Please specify at least one of --content, --file, or --dir.")
+    if not (content or file or dir or stdin):
+        typer.echo("❗ Error: Please specify at least one of --content, --file, --dir or --stdin.")
         raise typer.Exit(1)
+    validate_pipe(stdin, stream, mmap)
 
-    # Now, if key wasn't provided, prompt the user.
-    if not key:
+    # With --key-store, files name their own key; without one, prompt the user.
+    store = KeyStore(default_store_path()) if key_store and (file or dir) else None
+    if not key and store is None:
+        if stdin:
+            typer.echo("❗ Error: --key is required with --stdin, which carries the data.", err=True)
+            raise typer.Exit(1)
         key = typer.prompt("Please enter the decryption key")
 
-    if not Key(key).validate():
+    if key and not key_cache.validate(key):
         typer.echo("❗ Invalid key format. Please use a valid key.")
         raise typer.Exit(1)
+    stream = validate_file_options(backend, encoding, stream, mmap, fsync, symlinks)
 
     decrypted_result = None
-    if content:
-        nc = NumeraCrypt(str(content), key)
-        decrypted_result = nc.decrypt()
-        typer.echo(f"🔓 Decrypted content: {decrypted_result}")
-    elif file:
-        nc = NumeraCrypt(str(file), key, file=True)
-        nc.decrypt()
-        typer.echo(f"🔓 Decrypted file: {file}")
-    elif dir:
-        nc = NumeraCrypt(str(dir), key, dir=True)
-        nc.decrypt()
-        typer.echo(f"🔓 Decrypted directory: {dir}")
+    with profiled(profile, profile_dump):
+        if content:
+            nc = NumeraCrypt(str(content), key, backend=backend)
+            decrypted_result = nc.decrypt()
+            typer.echo(f"🔓 Decrypted content: {decrypted_result}")
+        elif file:
+            nc = NumeraCrypt(str(file), key or "", file=True, backend=backend, stream=stream, encoding=encoding,
+                             workers=workers, fsync=fsync, mmap=mmap, key_store=store)
+            try:
+                nc.decrypt()
+            except ValueError as e:
+                typer.echo(f"❗ Error: {e}")
+                raise typer.Exit(1)
+            typer.echo(f"🔓 Decrypted file: {file}")
+        elif dir:
+            nc = NumeraCrypt(str(dir), key or "", dir=True, backend=backend, stream=stream, encoding=encoding,
+                             workers=workers, include=include, exclude=exclude, max_depth=max_depth,
+                             symlinks=symlinks, manifest=manifest, fsync=fsync, mmap=mmap, key_store=store)
+            report_results(nc.decrypt())
+            typer.echo(f"🔓 Decrypted directory: {dir}")
+        elif stdin:
+            nc = NumeraCrypt("", key, backend=backend, stream=True, encoding=encoding)
+            pipe(nc, False)
 
-    if keysafe:
-        Key(key).safe()
-        typer.echo(f"📄 Key saved to {key_store_location()}")
+    if keysafe and key:
+        save_key(key, label, err=stdin)
 
     if contentsafe:
         # Only applicable when decrypting content.
@@ -131,13 +300,79 @@ def decrypt(
         else:
             typer.echo("❗ Decrypted content saving is only available for string decryption.")
 
+@app.command()
+def rekey(
+    content: str = typer.Option(None, help="Encrypted content to move to the new key."),
+    file: Path = typer.Option(None, exists=True, dir_okay=False, help="Path to the encrypted file to re-encrypt."),
+    dir: Path = typer.Option(None, exists=True, file_okay=False, help="Path to the encrypted directory to re-encrypt."),
+    key: str = typer.Option(None, help="Current key of the data."),
+    new_key: str = typer.Option(None, help="Key to re-encrypt with. If not provided, one will be generated."),
+    keysafe: bool = typer.Option(False, help="Flag to save the new key to the key store."),
+    label: str = typer.Option(None, help="Label stored with the key by --keysafe."),
+    fingerprint: bool = typer.Option(False, help="Record the new key's fingerprint in containers (requires --encoding container)."),
+    backend: str = typer.Option("auto", help="Byte transform backend: auto, python or numpy."),
+    stream: bool = typer.Option(None, help="Stream files in chunks as raw bytes (implied by --encoding other than base91 and by --mmap). Without it files use the legacy text format."),
+    encoding: str = typer.Option("base91", help="Encoding of the encrypted files: base91, base64, raw or container."),
+    workers: int = typer.Option(1, help="Number of worker processes for --dir, or of workers splitting one --file with --encoding raw."),
+    include: List[str] = typer.Option(None, help="Glob pattern of files to process in --dir (repeatable)."),
+    exclude: List[str] = typer.Option(None, help="Glob pattern of files or folders to skip in --dir (repeatable)."),
+    max_depth: int = typer.Option(None, help="How many folder levels --dir descends (0 = top level only)."),
+    symlinks: str = typer.Option("skip", help="Symlinks in --dir: skip, files or follow."),
+    manifest: bool = typer.Option(True, help="Use the --dir manifest to skip files that are not encrypted or already rotated."),
+    fsync: str = typer.Option("none", help="Flush written files to disk: none, file (each file) or batch (once per --dir run)."),
+    mmap: bool = typer.Option(False, help="Transform files in place through a memory map (requires --encoding raw)."),
+    profile: bool = typer.Option(False, help="Print the time spent in file I/O, cipher rounds and encoding."),
+    profile_dump: Path = typer.Option(None, help="Write a cProfile/pstats dump of the run to this file.")
+):
+    """Move encrypted files, directories or strings to a new key in a single pass."""
+    validate_single_source(content, file, dir)
+
+    if not key:
+        key = typer.prompt("Please enter the current key")
+    if not key_cache.validate(key):
+        typer.echo("❗ Invalid key format. Please use a valid key.")
+        raise typer.Exit(1)
+    if not new_key:
+        new_key = Key(rounds=8, max_length=64).generate()
+        typer.echo(f"🔑 Generated key: {new_key}")
+    if not key_cache.validate(new_key):
+        typer.echo("❗ Invalid new key format. Please use a valid key.")
+        raise typer.Exit(1)
+    stream = validate_file_options(backend, encoding, stream, mmap, fsync, symlinks, fingerprint=fingerprint)
+
+    with profiled(profile, profile_dump):
+        if content:
+            nc = NumeraCrypt(str(content), key, backend=backend)
+            typer.echo(f"🔁 Re-encrypted content: {nc.rekey(new_key)}")
+        elif file:
+            nc = NumeraCrypt(str(file), key, file=True, backend=backend, stream=stream, encoding=encoding,
+                             workers=workers, fsync=fsync, mmap=mmap, fingerprint=fingerprint)
+            try:
+                nc.rekey(new_key)
+            except ValueError as e:
+                typer.echo(f"❗ Error: {e}")
+                raise typer.Exit(1)
+            typer.echo(f"🔁 Re-encrypted file: {file}")
+        elif dir:
+            nc = NumeraCrypt(str(dir), key, dir=True, backend=backend, stream=stream, encoding=encoding,
+                             workers=workers, include=include, exclude=exclude, max_depth=max_depth,
+                             symlinks=symlinks, manifest=manifest, fsync=fsync, mmap=mmap, fingerprint=fingerprint)
+            report_results(nc.rekey(new_key))
+            typer.echo(f"🔁 Re-encrypted directory: {dir}")
+
+    if keysafe:
+        save_key(new_key, label)
+
 @app.command()
 def key(
     key: str = typer.Option(None, help="Key to validate."),
     salt: str = typer.Option(None, help="Salt to generate a key from."),
     rounds: int = typer.Option(8, help="Number of rounds to use for encryption (min 5)."),
     length: int = typer.Option(64, help="Length of the key (min 64)."),
-    keysafe: bool = typer.Option(False, help="Flag to save the generated key to a file.")
+    keysafe: bool = typer.Option(False, help="Flag to save the generated key to the key store."),
+    label: str = typer.Option(None, help="Label stored with the key by --keysafe."),
+    count: int = typer.Option(1, help="Number of keys to generate."),
+    out: Path = typer.Option(None, dir_okay=False, help="Write the generated keys to this file, one per line.")
 ):
     """Generate a key or validate an existing one."""
     if rounds < 5:
@@ -146,9 +381,28 @@ def key(
     if length < 64:
         typer.echo("❗ Key length must be at least 64.")
         raise typer.Exit(1)
+    if count < 1:
+        typer.echo("❗ Count must be at least 1.")
+        raise typer.Exit(1)
+
+    if not key and (count > 1 or out):
+        keys = Key(salt or "", rounds, length).generate_many(count)
+        data = "".join(f"{k}\n" for k in keys)
+        if out:
+            with File(str(out)).writer() as handle:
+                handle.write(data.encode("utf-8"))
+            typer.echo(f"🔑 Generated {count} keys in {out}")
+        else:
+            sys.stdout.write(data)
+        if keysafe:
+            directory = key_store_location()
+            with KeyStore(default_store_path(directory)) as store:
+                store.add_many(keys, label)
+            typer.echo(f"📄 {count} keys saved to {default_store_path(directory)}", err=not out)
+        return
 
     if key:
-        if not Key(key).validate():
+        if not key_cache.validate(key):
             typer.echo("❗ Invalid key format.")
             raise typer.Exit(1)
         typer.echo("✅ Key is valid.")
@@ -162,8 +416,72 @@ def key(
         typer.echo(f"🔑 Generated key: {key}")
 
     if keysafe:
-        key_generator.safe()
-        typer.echo(f"📄 Key saved to {key_store_location()}")
+        save_key(key, label)
+
+@app.command()
+def keys(
+    label: str = typer.Option(None, help="Only list keys with this label."),
+    file: Path = typer.Option(None, exists=True, dir_okay=False, help="Show the stored key a fingerprinted container was encrypted with."),
+    import_dir: Path = typer.Option(None, exists=True, file_okay=False, help="Import the key_* files of older versions from this directory."),
+    show: bool = typer.Option(False, help="Print the keys themselves, not only their fingerprints.")
+):
+    """List the keys in the key store, find the key of a file or import old key files."""
+    from datetime import datetime
+
+    with KeyStore(default_store_path()) as store:
+        if import_dir:
+            imported = store.import_files(str(import_dir))
+            typer.echo(f"📥 Imported {len(imported)} keys from {import_dir}.")
+            return
+        if file:
+            fp = file_fingerprint(str(file))
+            if fp is None:
+                typer.echo(f"❗ {file} carries no key fingerprint.")
+                raise typer.Exit(1)
+            stored = store.get(fp)
+            if stored is None:
+                typer.echo(f"❗ Key {fp} of {file} is not in the key store.")
+                raise typer.Exit(1)
+            entries = [stored]
+        else:
+            entries = store.find(label) if label else list(store)
+        for stored in entries:
+            created = datetime.fromtimestamp(stored.created).strftime("%Y-%m-%d %H:%M:%S")
+            line = f"🔑 {stored.fingerprint}  rounds={stored.rounds}  {created}  {stored.label or ''}".rstrip()
+            typer.echo(f"{line}  {stored.key}" if show else line)
+
+@app.command()
+def verify(
+    file: Path = typer.Option(..., exists=True, dir_okay=False, help="Container file to check.")
+):
+    """Check the checksums of a container file (--encoding container) without the key."""
+    from numeracrypt.core.container import ContainerReader
+
+    try:
+        with open(file, "rb") as handle:
+            reader = ContainerReader(handle)
+            reader.verify()
+    except ValueError as e:
+        typer.echo(f"❗ {file}: {e}")
+        raise typer.Exit(1)
+    checked = "checksums verified" if reader.header.checksums else "no checksums stored"
+    typer.echo(f"✅ {file}: {len(reader.chunks)} chunks, {reader.size} bytes, {checked}.")
+
+@app.command()
+def serve(
+    socket: Path = typer.Option(None, help="Unix socket to listen on (default: $NUMERACRYPT_SOCKET or a per-user runtime path).")
+):
+    """Keep keys and backends loaded and answer encrypt/decrypt calls forwarded by the CLI."""
+    from numeracrypt.core import daemon
+
+    try:
+        daemon.serve(str(socket) if socket else None,
+                     ready=lambda path: typer.echo(f"🛰️ NumeraCrypt server listening on {path}"))
+    except (RuntimeError, PermissionError) as e:
+        typer.echo(f"❗ Error: {e}")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        typer.echo("🛑 Server stopped.")
 
 if __name__ == "__main__":
     app()
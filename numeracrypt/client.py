@@ -0,0 +1,83 @@
+"""
+Entry point of the `numeracrypt` console script.
+
+Simple `encrypt`/`decrypt` calls (--content or --file with a --key) are forwarded to a
+running `numeracrypt serve` process, which skips importing typer and the library and
+parsing the key. Everything else, and every call the server cannot answer, runs through
+the full CLI in numeracrypt.cli, so the output is the same either way.
+"""
+import os
+import sys
+
+# Options the fast path understands, mapped to the names used in the request.
+_VALUE_OPTIONS = {"--content": "content", "--file": "file", "--key": "key", "--backend": "backend",
+                  "--encoding": "encoding", "--fsync": "fsync"}
+_FLAG_OPTIONS = {"--stream": ("stream", "1"), "--no-stream": ("stream", "0")}
+
+
+def parse_fast(argv):
+    """
+    Return (op, options) if argv is a call the server can answer, otherwise None.
+    """
+    if not argv or argv[0] not in ("encrypt", "decrypt"):
+        return None
+    options = {}
+    args = iter(argv[1:])
+    for arg in args:
+        name, eq, value = arg.partition("=")
+        if name in _FLAG_OPTIONS and not eq:
+            key, flag = _FLAG_OPTIONS[name]
+            options[key] = flag
+        elif name in _VALUE_OPTIONS:
+            if not eq:
+                value = next(args, None)
+                if value is None:
+                    return None
+            options[_VALUE_OPTIONS[name]] = value
+        else:
+            return None
+    if not options.get("key") or bool(options.get("content")) == ("file" in options):
+        return None
+    if options.get("file") == "-":
+        # Standard input is streamed by the CLI itself.
+        return None
+    if "file" in options:
+        # The server may run in another directory; echo the path the way the CLI would.
+        from pathlib import Path
+        options["display"] = str(Path(options["file"]))
+        options["file"] = os.path.abspath(options["file"])
+    return argv[0], options
+
+
+def forward(argv) -> bool:
+    """
+    Try to answer the call through a running server and print its output.
+
+    :return: True if the server handled the call.
+    """
+    from numeracrypt.core import daemon
+    if os.environ.get(daemon.DAEMON_ENV) == "0":
+        return False
+    request = parse_fast(argv)
+    if request is None:
+        return False
+    try:
+        status, output = daemon.call(*request)
+    except (OSError, AttributeError, ValueError):
+        # No server (or no Unix sockets on this platform).
+        return False
+    if status != "ok":
+        return False
+    sys.stdout.write(output + "\n")
+    return True
+
+
+def main() -> None:
+    if forward(sys.argv[1:]):
+        return
+    from numeracrypt.cli import app
+    app()
+
+
+if __name__ == "__main__":
+    main()
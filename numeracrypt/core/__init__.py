@@ -1,4 +1,19 @@
-from . import cipher
-from . import convert
-from . import file
-from . import key
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so `import numeracrypt`
+# stays cheap and a command only loads the parts it uses.
+__all__ = [
+    "aio", "backend", "cipher", "codec", "compress", "config", "container", "convert", "daemon",
+    "file", "key", "keycache", "keystore", "manifest", "metrics", "parallel", "reader", "schedule",
+    "segment",
+]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,163 @@
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.compress import Compressor, Decompressor
+from numeracrypt.core.container import MAGIC
+from numeracrypt.core.file import DEFAULT_CHUNK_SIZE
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+import asyncio
+
+# Payloads up to this size are processed directly on the event loop.
+INLINE_THRESHOLD = 64 * 1024
+
+
+def _encrypt_chunk(schedule, encoder, chunk: bytes, position: int):
+    buf = bytearray(chunk)
+    schedule.encrypt_into(buf, position)
+    return encoder, encoder.update(buf)
+
+
+def _decrypt_chunk(schedule, decoder, chunk: bytes, position: int):
+    buf = bytearray(decoder.update(chunk))
+    schedule.decrypt_into(buf, position)
+    return decoder, buf
+
+
+async def _iterate(chunks: Union[AsyncIterable[bytes], Iterable[bytes]]) -> AsyncIterator[bytes]:
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+async def _prepend(head: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield head
+    async for chunk in chunks:
+        yield chunk
+
+
+class AsyncNumeraCrypt:
+    """
+    Asyncio facade over NumeraCrypt for services encrypting many payloads under one key.
+
+    The key is parsed and compiled once. Payloads up to inline_threshold bytes are processed
+    right away on the event loop; larger ones are offloaded to an executor, with at most
+    max_workers of them running at a time, so big payloads do not stall other requests.
+
+    Usage:
+        async with AsyncNumeraCrypt(key) as anc:
+            token = await anc.encrypt("payload")
+    """
+
+    def __init__(self, key: str, backend: str = "auto", encoding: str = "base91",
+                 executor: Optional[Executor] = None, max_workers: int = 4,
+                 inline_threshold: int = INLINE_THRESHOLD, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 compression: Optional[str] = None, compression_level: Optional[int] = None):
+        """
+        :param key: The assembled key.
+        :param backend: Byte transform backend: "python", "numpy" or "auto".
+        :param encoding: Output encoding of the streaming variants.
+        :param executor: Executor for large payloads. Defaults to a private thread pool;
+            a ProcessPoolExecutor also works since all offloaded calls are picklable.
+        :param max_workers: Maximum number of payloads processed off the loop at once.
+        :param inline_threshold: Payloads up to this many bytes are processed inline.
+        :param chunk_size: Size of the frames written by encrypt_iter() with encoding="container".
+        :param compression: Compress strings and streams before encrypting them (see core.compress).
+        :param compression_level: Level of the compression; None for the method's default.
+        """
+        self.nc = NumeraCrypt("", key, backend=backend, encoding=encoding, chunk_size=chunk_size,
+                              compression=compression, compression_level=compression_level)
+        self.inline_threshold = inline_threshold
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="numeracrypt")
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def __aenter__(self) -> "AsyncNumeraCrypt":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the executor if it was created by this instance."""
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    async def _run(self, size: int, func, *args):
+        if size <= self.inline_threshold:
+            return func(*args)
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _run_local(self, size: int, func, *args):
+        # Compressor state cannot be pickled, so it stays in this process: large chunks go
+        # to the loop's default thread pool (the codecs release the GIL) instead of the executor.
+        if size <= self.inline_threshold:
+            return func(*args)
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def encrypt(self, value: Union[str, bytes, bytearray, memoryview]):
+        """
+        Encrypt a payload.
+
+        :param value: A string (returns a Base91 string like NumeraCrypt.encrypt()) or a
+            bytes-like object (returns raw ciphertext like NumeraCrypt.encrypt_bytes()).
+        """
+        if isinstance(value, str):
+            return await self._run(len(value), self.nc.encrypt_text, value)
+        return await self._run(memoryview(value).nbytes, self.nc.encrypt_bytes, bytes(value))
+
+    async def decrypt(self, value: Union[str, bytes, bytearray, memoryview]):
+        """
+        Decrypt a payload produced by encrypt().
+
+        :param value: A Base91 string or raw ciphertext bytes.
+        """
+        if isinstance(value, str):
+            return await self._run(len(value), self.nc.decrypt_text, value)
+        return await self._run(memoryview(value).nbytes, self.nc.decrypt_bytes, bytes(value))
+
+    async def encrypt_iter(self, chunks: Union[AsyncIterable[bytes], Iterable[bytes]]) -> AsyncIterator[bytes]:
+        """
+        Encrypt a (possibly asynchronous) stream of raw chunks and yield encoded output,
+        identical to NumeraCrypt.encrypt_stream().
+        """
+        encoder = self.nc.codec.encoder()
+        compressor = Compressor(self.nc.compression, self.nc.compression_level)
+        position = 0
+        async for chunk in _iterate(chunks):
+            data = await self._run_local(len(chunk), compressor.update, chunk)
+            encoder, out = await self._run(len(data), _encrypt_chunk, self.nc.schedule, encoder, data, position)
+            position += len(data)
+            yield out
+        # The flush compresses whatever the engine still buffers.
+        data = await self._run_local(position, compressor.finish)
+        encoder, out = await self._run(len(data), _encrypt_chunk, self.nc.schedule, encoder, data, position)
+        yield out
+        yield encoder.finish()
+
+    async def decrypt_iter(self, chunks: Union[AsyncIterable[bytes], Iterable[bytes]]) -> AsyncIterator[bytes]:
+        """
+        Decrypt a (possibly asynchronous) stream produced by encrypt_iter() and yield the plain bytes.
+        A container is recognised by its header and decoded as one, whatever the encoding.
+        """
+        chunks = _iterate(chunks)
+        # Like NumeraCrypt.decrypt_stream(), look at the first bytes before choosing the codec.
+        head = bytearray()
+        async for chunk in chunks:
+            head += chunk
+            if len(head) >= len(MAGIC):
+                break
+        decoder = self.nc._stream_codec(bytes(head)).decoder()
+        decompressor = Decompressor()
+        position = 0
+        async for chunk in _prepend(bytes(head), chunks):
+            decoder, out = await self._run(len(chunk), _decrypt_chunk, self.nc.schedule, decoder, chunk, position)
+            position += len(out)
+            yield bytes(await self._run_local(len(out), decompressor.update, out))
+        tail = bytearray(decoder.finish())
+        self.nc.schedule.decrypt_into(tail, position)
+        yield bytes(decompressor.update(tail))
+        yield bytes(decompressor.finish())
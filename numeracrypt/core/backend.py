@@ -0,0 +1,199 @@
+from typing import Sequence, Union
+import importlib.util
+import sys
+import warnings
+
+# NumPy is an optional dependency, and importing it takes longer than encrypting a short
+# string, so it is only imported when a backend first needs it (see _numpy()).
+np = None
+
+WritableBuffer = Union[bytearray, memoryview]
+
+# Below this many key periods the Python backend adds byte by byte instead of per column.
+SHORT_BUFFER_PERIODS = 8
+# The auto backend imports NumPy for the first buffer of at least this many bytes.
+AUTO_NUMPY_THRESHOLD = 64 * 1024
+
+
+def numpy_available() -> bool:
+    """Return whether NumPy can be imported, without importing it."""
+    return "numpy" in sys.modules or importlib.util.find_spec("numpy") is not None
+
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+# Translation tables for adding a constant to every byte, built on first use.
+_SHIFT_TABLES = {}
+
+
+def shift_table(shift: int) -> bytes:
+    """
+    Return a 256-byte translation table that adds `shift` (mod 256) to a byte.
+
+    :param shift: The amount to add, reduced modulo 256.
+    :return: A table usable with bytes.translate().
+    """
+    shift &= 0xFF
+    table = _SHIFT_TABLES.get(shift)
+    if table is None:
+        table = bytes((i + shift) & 0xFF for i in range(256))
+        _SHIFT_TABLES[shift] = table
+    return table
+
+
+class PythonBackend:
+    """
+    Pure-Python byte transform. Each key position is one strided slice
+    translated in a single C-level call.
+    """
+
+    name = "python"
+
+    def transform(self, buf: WritableBuffer, offsets: bytes, start: int = 0) -> None:
+        """
+        Add the periodic offset table to `buf` in place.
+
+        :param buf: A writable byte buffer.
+        :param offsets: The offset for every key position.
+        :param start: Absolute position of buf[0] within the whole message.
+        """
+        period = len(offsets)
+        if len(buf) < SHORT_BUFFER_PERIODS * period:
+            # Too short for the per-column calls to pay off: add byte by byte.
+            phase = start % period
+            rotated = offsets[phase:] + offsets[:phase]
+            rotated *= len(buf) // period + 1
+            buf[:] = bytes([(b + o) & 0xFF for b, o in zip(buf, rotated)])
+            return
+        for j in range(period):
+            column = buf[j::period]
+            # memoryview slices have no translate(); copy just this column.
+            if isinstance(column, memoryview):
+                column = column.tobytes()
+            buf[j::period] = column.translate(shift_table(offsets[(start + j) % period]))
+
+    def transform_packed(self, buf: bytearray, offsets: bytes, starts: Sequence[int]) -> None:
+        """
+        Add the offset table to several records packed into one buffer, in place.
+        Every record starts at key position 0, as if it was encrypted on its own.
+
+        :param buf: The packed records.
+        :param offsets: The offset for every key position.
+        :param starts: Start index of every record in buf, ascending.
+        """
+        bounds = [*starts, len(buf)]
+        for begin, end in zip(bounds, bounds[1:]):
+            record = buf[begin:end]
+            self.transform(record, offsets)
+            buf[begin:end] = record
+
+
+class NumpyBackend:
+    """
+    Vectorized byte transform. The buffer is viewed as a uint8 array and the offset
+    table is broadcast over it row by row, relying on uint8 wrap-around for mod 256.
+    """
+
+    name = "numpy"
+
+    def __init__(self):
+        try:
+            _numpy()
+        except ImportError:
+            raise ImportError("The numpy backend requires NumPy to be installed.") from None
+
+    def transform(self, buf: WritableBuffer, offsets: bytes, start: int = 0) -> None:
+        """
+        Add the periodic offset table to `buf` in place.
+
+        :param buf: A writable byte buffer.
+        :param offsets: The offset for every key position.
+        :param start: Absolute position of buf[0] within the whole message.
+        """
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        period = len(offsets)
+        # Rotate the table so that its first entry belongs to buf[0].
+        table = np.roll(np.frombuffer(offsets, dtype=np.uint8), -(start % period))
+        full = arr.size - arr.size % period
+        if full:
+            rows = arr[:full].reshape(-1, period)
+            rows += table
+        if full < arr.size:
+            arr[full:] += table[:arr.size - full]
+
+    def transform_packed(self, buf: bytearray, offsets: bytes, starts: Sequence[int]) -> None:
+        """
+        Add the offset table to several records packed into one buffer, in place.
+        Every record starts at key position 0, as if it was encrypted on its own.
+        The whole batch is transformed with a single vectorized gather and add.
+
+        :param buf: The packed records.
+        :param offsets: The offset for every key position.
+        :param starts: Start index of every record in buf, ascending.
+        """
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        if not arr.size:
+            return
+        begins = np.asarray(starts, dtype=np.int64)
+        lengths = np.diff(np.append(begins, arr.size))
+        # Position of every byte within its own record, wrapped to the key period.
+        phase = np.arange(arr.size, dtype=np.int64) - np.repeat(begins, lengths)
+        phase %= len(offsets)
+        arr += np.frombuffer(offsets, dtype=np.uint8)[phase]
+
+
+class AutoBackend:
+    """
+    Default backend: the Python backend for short buffers and, when it is installed, NumPy
+    for long ones. NumPy is imported once the first buffer of AUTO_NUMPY_THRESHOLD bytes
+    arrives (or as soon as something else imported it); from then on it handles every
+    buffer. A short-lived process encrypting a short string never pays for the import.
+    """
+
+    name = "auto"
+
+    def __init__(self):
+        self._python = PythonBackend()
+        self._numpy = None
+
+    def _pick(self, size: int):
+        if self._numpy is None:
+            if size < AUTO_NUMPY_THRESHOLD and "numpy" not in sys.modules:
+                return self._python
+            self._numpy = NumpyBackend()
+        return self._numpy
+
+    def transform(self, buf: WritableBuffer, offsets: bytes, start: int = 0) -> None:
+        self._pick(len(buf)).transform(buf, offsets, start)
+
+    def transform_packed(self, buf: bytearray, offsets: bytes, starts: Sequence[int]) -> None:
+        self._pick(len(buf)).transform_packed(buf, offsets, starts)
+
+
+BACKENDS = {
+    PythonBackend.name: PythonBackend,
+    NumpyBackend.name: NumpyBackend,
+}
+
+
+def get_backend(name: str = "auto"):
+    """
+    Return a backend instance by name.
+
+    :param name: "python", "numpy" or "auto" (NumPy for long buffers when installed,
+        otherwise Python).
+    :return: The backend instance.
+    """
+    if name == "auto":
+        return AutoBackend() if numpy_available() else PythonBackend()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Choose one of: auto, {', '.join(BACKENDS)}.")
+    if name == NumpyBackend.name and not numpy_available():
+        warnings.warn("NumPy is not installed; falling back to the python backend.")
+        name = PythonBackend.name
+    return BACKENDS[name]()
@@ -1,9 +1,74 @@
-from numeracrypt.core.convert import ASCII
+from numeracrypt.core.convert import ASCII, Base91Decoder
+from numeracrypt.core.codec import SNIFF_MIN, SNIFF_SIZE, get_codec, possible_encodings
+from numeracrypt.core.compress import SIGNATURE, Compressor, Decompressor, check_method, compress, decompress, is_compressed
+from numeracrypt.core.container import MAGIC, ContainerCodec, is_container
 from numeracrypt.core.key import Key
-from numeracrypt.core.file import File
+from numeracrypt.core.file import File, DEFAULT_CHUNK_SIZE, FSYNC_POLICIES, read_chunks, sync_paths
+from numeracrypt.core.schedule import KeySchedule, compute_offset, rekey
+from numeracrypt.core.keycache import key_cache
+from numeracrypt.core.keystore import KeyStore, file_fingerprint, fingerprint_bytes
+from numeracrypt.core.parallel import FileResult, process_files
+from numeracrypt.core.metrics import arg_size, instrumented, wrap
+from numeracrypt.core.reader import NumeraCryptReader, Source
+from numeracrypt.core.segment import transform_buffer, transform_file
+from numeracrypt.core.manifest import CHANGED, DECRYPTED, ENCRYPTED, MANIFEST_NAME, REKEYED, Manifest, snapshot
+from itertools import chain, islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+import codecs
+import copy
+
+# Number of records packed into one buffer by encrypt_many()/decrypt_many().
+BATCH_SIZE = 1024
+
+Record = Union[str, bytes, bytearray, memoryview]
+
+
+def _peek(chunks: Iterator[bytes], size: int):
+    """Read chunks until at least `size` bytes are buffered; return them and the rest."""
+    head = bytearray()
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= size:
+            break
+    return bytes(head), chunks
+
+
+def _is_legacy_text(data: bytes) -> bool:
+    """
+    Whether decoded Base91 data is that of the whole-file text format: the UTF-8 of the
+    encrypted characters, all below 256. Raw ciphertext is hardly ever valid UTF-8.
+    """
+    try:
+        # Incremental, since `data` may end inside a character.
+        text = codecs.getincrementaldecoder("utf-8")().decode(bytes(data))
+    except UnicodeDecodeError:
+        return False
+    return all(ord(c) < 256 for c in text)
+
+
+def resolve_stream(stream: Optional[bool], encoding: str, mmap: bool = False) -> bool:
+    """
+    Decide between stream mode and the whole-file text format for the CLI options.
+
+    :param stream: --stream/--no-stream, or None if neither was given.
+    :return: The explicit choice, otherwise stream mode for any encoding but the default.
+    :raises ValueError: If the text format is asked for with options only stream mode has.
+    """
+    if stream is None:
+        return encoding != "base91" or mmap
+    if not stream and (encoding != "base91" or mmap):
+        raise ValueError("The legacy text format (--no-stream) is always Base91; "
+                         "--encoding and --mmap need --stream.")
+    return stream
 
 class NumeraCrypt:
-    def __init__(self, value: str, key: str, file: bool = False,dir: bool = False):
+    def __init__(self, value: str, key: str, file: bool = False,dir: bool = False, backend: str = "auto",
+                 stream: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "base91",
+                 workers: int = 1, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                 max_depth: Optional[int] = None, symlinks: str = "skip", manifest: bool = False,
+                 fsync: str = "none", mmap: bool = False, compression: Optional[str] = None,
+                 compression_level: Optional[int] = None, fingerprint: bool = False,
+                 key_store: Optional[KeyStore] = None):
         """
         Initialize NumeraCrypt with either a plaintext or a file's content,
         plus a key (which will later be disassembled into its raw form and rounds).
@@ -11,9 +76,56 @@ class NumeraCrypt:
         :param value: String content or file path.
         :param key: The key as a string.
         :param file: Flag indicating if 'value' should be read from a file.
+        :param backend: Byte transform backend: "python", "numpy" or "auto".
+        :param stream: Process files chunk by chunk as raw bytes, with memory bounded by chunk_size.
+        :param chunk_size: Size of the chunks read in stream mode.
+        :param encoding: Output encoding of stream mode: "base91", "base64", "raw" or
+            "container" (binary, with a chunk index and checksums; see core.container).
+        :param workers: Number of processes used in directory mode. Raw-binary files (stream or
+            mmap mode with encoding="raw") and buffers given to encrypt_bytes() are split into
+            ranges transformed by this many threads or processes (see core.segment).
+        :param include: Directory mode only processes files matching one of these glob patterns.
+        :param exclude: Directory mode skips files and subdirectories matching these glob patterns.
+        :param max_depth: How deep directory mode recurses (0 = top level only, None = unlimited).
+        :param symlinks: Symlink policy of directory mode: "skip", "files" or "follow".
+        :param manifest: Track processed files in a manifest in the directory and skip files
+            that are already in the wanted state.
+        :param fsync: When written files are flushed to disk: "none", "file" (each file before
+            it replaces the original) or "batch" (all files once a directory is done).
+        :param mmap: Transform files in place through a memory map, chunk_size bytes at a
+            time. Requires encoding="raw", since only then the output has the input's length.
+            Compressed files, and plain files starting with the compression signature, are
+            processed in stream mode instead.
+        :param compression: Compress the plain data before encrypting it: "zlib", "lzma" or
+            "bz2" (see core.compress). Skipped for incompressible data. Decryption detects
+            compressed data by itself, so this is only needed when encrypting.
+        :param compression_level: Level of the compression (preset for lzma); None for the default.
+        :param fingerprint: Record the key's fingerprint in the header, so the key can be
+            looked up in a key store (see core.keystore). Requires encoding="container".
+        :param key_store: When decrypting files, use the stored key named by a file's
+            fingerprint instead of `key`; `key` (may then be empty) is used for files without one.
         """
         self.file = file
         self.dir = dir
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.codec = get_codec(encoding)
+        self.workers = workers
+        # The manifest itself is never encrypted.
+        exclude = [*(exclude or ()), MANIFEST_NAME]
+        self.walk_options = dict(include=include, exclude=exclude, max_depth=max_depth, symlinks=symlinks)
+        self.manifest = Manifest(value) if dir and manifest else None
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Choose one of: {', '.join(FSYNC_POLICIES)}.")
+        self.fsync = fsync
+        if mmap and encoding != "raw":
+            raise ValueError("Memory-mapped mode requires the raw encoding.")
+        self.mmap = mmap
+        check_method(compression)
+        if mmap and compression:
+            raise ValueError("Memory-mapped mode cannot compress, since it keeps the file's length.")
+        self.compression = compression
+        self.compression_level = compression_level
         if file:
             self.file_inst = File(value)
             self.value = ""
@@ -23,10 +135,117 @@ class NumeraCrypt:
         else:
             self.value = value
 
-        self.key = Key(key)
-        self.key_raw, self.rounds = self.key.disassemble()
+        self.backend = backend
+        if fingerprint and encoding != "container":
+            raise ValueError("Only the container encoding can carry a key fingerprint.")
+        self.fingerprint = fingerprint
+        self.key_store = key_store
+        self._set_key(key)
+        # Set by rekey(): the combined old-to-new schedule and the codec of the new key.
+        self._rekey: Optional[KeySchedule] = None
+        self._rekey_codec = self.codec
         self.ascii_inst = ASCII(self.value)
 
+    def _set_key(self, key: str) -> None:
+        self.key = Key(key)
+        if not key and self.key_store is not None:
+            # Every file must name its key by fingerprint.
+            self.schedule = None
+            self.key_raw, self.rounds = [], 0
+            return
+        # All rounds collapsed into one offset table, compiled once per key and shared
+        # through the key cache.
+        self.schedule = key_cache.get(key, self.backend)
+        self.key_raw, self.rounds = self.schedule.key_raw, self.schedule.rounds
+        if isinstance(self.codec, ContainerCodec):
+            self.codec = self._container_codec(key, self.schedule)
+
+    def _container_codec(self, key: str, schedule: KeySchedule) -> ContainerCodec:
+        # The container header records the key's rounds and period, so decrypting with the
+        # wrong key fails before any output is written.
+        return ContainerCodec(schedule.rounds, schedule.period, self.chunk_size,
+                              fingerprint=fingerprint_bytes(key) if self.fingerprint else None)
+
+    def _is_foreign_container(self, path: str) -> bool:
+        """Whether `path` is a container although this instance uses another encoding."""
+        if isinstance(self.codec, ContainerCodec):
+            return False
+        with open(path, "rb") as handle:
+            return is_container(handle.read(len(MAGIC)))
+
+    def _check_format(self, path: str) -> None:
+        """
+        Refuse to decrypt or rotate `path` if it starts like ciphertext in another format
+        than this instance's. Decoding it anyway yields garbage instead of an error.
+
+        :raises ValueError: If the encoding, or stream mode vs. the legacy text format,
+            does not match the file.
+        """
+        if isinstance(self.codec, ContainerCodec):
+            # The container decoder checks the header itself.
+            return
+        with open(path, "rb") as handle:
+            head = handle.read(SNIFF_SIZE)
+        stream = self.stream or self.mmap
+        name = self.codec.name if stream else "base91"
+        possible = possible_encodings(head)
+        if name not in possible:
+            expected = f"{name} ciphertext" if stream else "in the legacy text format"
+            raise ValueError(f"{path} is not {expected}; it looks like {' or '.join(sorted(possible))} "
+                             f"ciphertext. Use the encoding it was written with.")
+        if name != "base91":
+            return
+        data = Base91Decoder().update(head)
+        if len(data) < SNIFF_MIN:
+            return
+        if stream and _is_legacy_text(data):
+            raise ValueError(f"{path} is in the legacy text format; process it with stream=False (--no-stream).")
+        if not stream and not _is_legacy_text(data):
+            raise ValueError(f"{path} was written in stream mode; process it with stream=True (--stream).")
+
+    def _stream_codec(self, head: bytes):
+        """
+        Return the codec decoding a stream that starts with `head`: a container is decoded
+        as one, whatever the encoding.
+        """
+        if not isinstance(self.codec, ContainerCodec) and is_container(head):
+            return self._container_codec(self.key.value, self.schedule)
+        return self.codec
+
+    def _as_container(self, key: str) -> "NumeraCrypt":
+        """
+        Return a copy of this instance that decrypts containers with `key`. Decoding a
+        container as text or raw ciphertext would replace the file with garbage.
+        """
+        inst = copy.copy(self)
+        inst.codec = get_codec("container")
+        inst.stream, inst.mmap = True, False
+        inst._set_key(key)
+        return inst
+
+    def _keyed(self, path: str) -> "NumeraCrypt":
+        """
+        Return the instance that decrypts `path`: this one, or, if a key store is set and the
+        file carries the fingerprint of another key, a copy using that key.
+        """
+        if self.key_store is None:
+            return self
+        fp = file_fingerprint(path)
+        if fp is None:
+            if self.schedule is None:
+                raise ValueError(f"{path} carries no key fingerprint and no key was given.")
+            return self
+        try:
+            key = self.key_store.key(fp)
+        except KeyError as e:
+            raise ValueError(e.args[0]) from None
+        if key == self.key.value:
+            return self
+        # Only containers carry a fingerprint, so the copy reads the file as one.
+        keyed = self._as_container(key)
+        keyed.key_store = None
+        return keyed
+
     @staticmethod
     def compute_offset(round_num: int, key: int) -> int:
         """
@@ -39,9 +258,7 @@ class NumeraCrypt:
         Returns:
             int: An offset value between 0 and 255.
         """
-        # Multiplication and XOR, then mod 256 to ensure result is a byte.
-        offset = ((round_num * (2 * key + 1)) ^ (round_num + key)) % 256
-        return offset
+        return compute_offset(round_num, key)
 
     def _update_read(self):
         if self.file:
@@ -89,6 +306,81 @@ class NumeraCrypt:
         original = (encrypted - offset) % 256
         return original
 
+    @staticmethod
+    def _byte_view(buf) -> memoryview:
+        """
+        Return a flat unsigned-byte view over any buffer-protocol object.
+
+        :param buf: bytes, bytearray, memoryview, mmap or any other buffer.
+        :return: A one-dimensional memoryview with format 'B'.
+        """
+        view = memoryview(buf)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        return view
+
+    def encrypt_bytes(self, buf):
+        """
+        Encrypt raw bytes, without any text conversion or Base91 encoding.
+        The ciphertext has exactly the same length as the input.
+
+        Writable buffers (bytearray, writable memoryview, mmap) are encrypted in place and
+        returned as they are; read-only ones (bytes, read-only memoryview) are copied
+        into a new bytearray.
+
+        :param buf: Any buffer-protocol object.
+        :return: The encrypted buffer.
+        """
+        view = self._byte_view(buf)
+        if view.readonly:
+            out = bytearray(view)
+            transform_buffer(self.schedule, memoryview(out), True, workers=self.workers)
+            return out
+        transform_buffer(self.schedule, view, True, workers=self.workers)
+        return buf
+
+    def decrypt_bytes(self, buf):
+        """
+        Decrypt raw bytes produced by encrypt_bytes().
+        Writable buffers are decrypted in place, read-only ones are copied.
+
+        :param buf: Any buffer-protocol object.
+        :return: The decrypted buffer.
+        """
+        view = self._byte_view(buf)
+        if view.readonly:
+            out = bytearray(view)
+            transform_buffer(self.schedule, memoryview(out), False, workers=self.workers)
+            return out
+        transform_buffer(self.schedule, view, False, workers=self.workers)
+        return buf
+
+    def decrypt_range(self, source: Union[Source, bytes, bytearray, memoryview], start: int, length: int) -> bytes:
+        """
+        Decrypt `length` plain bytes starting at position `start` of raw-binary ciphertext,
+        without decrypting (or reading) anything before it.
+
+        :param source: Ciphertext of encrypt_bytes() in memory, or a path/seekable handle of
+            a file written with encoding="raw" or encoding="container".
+        :param start: Position of the first wanted byte.
+        :param length: Number of bytes wanted; the result is shorter at the end of the data.
+        :return: The plain bytes.
+        :raises ValueError: If the ciphertext is compressed or text-encoded (base91/base64).
+        """
+        if start < 0 or length < 0:
+            raise ValueError("Range start and length must not be negative.")
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # encrypt_bytes() never compresses, so there is no envelope to look for.
+            view = self._byte_view(source)
+            possible = possible_encodings(view[:SNIFF_SIZE])
+            if "raw" not in possible:
+                raise ValueError(f"The data looks like {' or '.join(sorted(possible))} ciphertext; in memory "
+                                 f"only raw ciphertext can be decrypted by range.")
+            return bytes(self.schedule.decrypt(view[start:start + length], start))
+        with NumeraCryptReader(source, self.schedule) as reader:
+            reader.seek(start)
+            return reader.read(length)
+
     def _key_part(self, index: int) -> int:
         """
         Retrieve the key component for the current position.
@@ -126,27 +418,311 @@ class NumeraCrypt:
             for i, v in enumerate(self.ascii_inst.ascii)
         ]
 
+    def encrypt_text(self, text: str) -> str:
+        """
+        Encrypt a string and return it Base91-encoded, exactly like encrypt() in content mode,
+        but without reading or changing the instance's value, so one instance can serve
+        many strings (also from several threads).
+
+        :param text: The plain text.
+        :return: The encrypted text as a Base91 string.
+        """
+        data = compress(ASCII(text).byte_values, self.compression, self.compression_level)
+        encrypted = self.schedule.encrypt(data)
+        # Every code is a byte, so latin-1 maps it to the same character chr() would.
+        return ASCII(encrypted.decode("latin-1")).encode_base91()
+
+    def decrypt_text(self, text: str) -> str:
+        """
+        Decrypt a Base91 string produced by encrypt_text() or encrypt() in content mode.
+
+        :param text: The encrypted Base91 text.
+        :return: The decrypted text.
+        """
+        decrypted = self.schedule.decrypt(ASCII(ASCII(text).decode_base91()).byte_values)
+        return bytes(decompress(decrypted)).decode("latin-1")
+
+    def encrypt_many(self, values: Iterable[Record], pack: bool = False,
+                     batch_size: int = BATCH_SIZE) -> Iterator[Union[str, bytearray]]:
+        """
+        Encrypt many independent records under this instance's key, parsed only once.
+
+        Strings come back as Base91 strings (like encrypt_text()), bytes-like records as raw
+        ciphertext (like encrypt_bytes(), but never modified in place). Results are yielded
+        in input order as soon as they are ready.
+
+        :param values: The records.
+        :param pack: Copy batch_size records at a time into one reused buffer and transform
+            the batch in a single backend call (vectorized on the NumPy backend).
+        :param batch_size: Records per packed batch.
+        """
+        return self._many(values, True, pack, batch_size)
+
+    def decrypt_many(self, values: Iterable[Record], pack: bool = False,
+                     batch_size: int = BATCH_SIZE) -> Iterator[Union[str, bytearray]]:
+        """
+        Decrypt records produced by encrypt_many(), in input order.
+
+        :param values: The encrypted records (Base91 strings or raw bytes).
+        :param pack: Transform batch_size records at a time in one backend call.
+        :param batch_size: Records per packed batch.
+        """
+        return self._many(values, False, pack, batch_size)
+
+    def _many(self, values: Iterable[Record], encrypt: bool, pack: bool, batch_size: int):
+        if not pack:
+            transform = self.schedule.encrypt if encrypt else self.schedule.decrypt
+            text = self.encrypt_text if encrypt else self.decrypt_text
+            for value in values:
+                yield text(value) if isinstance(value, str) else transform(value)
+            return
+
+        transform_packed = self.schedule.encrypt_packed if encrypt else self.schedule.decrypt_packed
+        values = iter(values)
+        buf = bytearray()
+        while True:
+            batch = list(islice(values, batch_size))
+            if not batch:
+                return
+            buf.clear()
+            starts = []
+            for value in batch:
+                starts.append(len(buf))
+                if isinstance(value, str) and encrypt:
+                    # Like encrypt_text(): strings are compressed, bytes-like records are not.
+                    buf += compress(ASCII(value).byte_values, self.compression, self.compression_level)
+                elif isinstance(value, str):
+                    buf += ASCII(ASCII(value).decode_base91()).byte_values
+                else:
+                    buf += value
+            transform_packed(buf, starts)
+            ends = starts[1:] + [len(buf)]
+            for value, begin, end in zip(batch, starts, ends):
+                record = buf[begin:end]
+                if not isinstance(value, str):
+                    yield record
+                elif encrypt:
+                    yield ASCII(record.decode("latin-1")).encode_base91()
+                else:
+                    yield bytes(decompress(record)).decode("latin-1")
+
     def _encrypt(self):
         """
         Encrypt the input content for the given number of rounds and return a Base91-encoded string.
+        All rounds are applied in a single pass through the compiled key schedule.
 
         :return: The encrypted content as a Base91 string.
         """
         self._value_check()
-        for round_c in range(self.rounds):
-            # Update ascii_inst.value with the encrypted list (which is then interpreted as bytes later by ASCII)
-            self.ascii_inst.value = self._enc_round(round_c)
-        return self.ascii_inst.encode_base91()
+        return self.encrypt_text(self.ascii_inst.string)
+
+    def encrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Encrypt a stream of raw byte chunks and yield the encoded output as bytes.
+
+        Each chunk is offset by its absolute position, so the output does not depend on
+        how the input is split and equals the encoding of encrypt_bytes(whole input)
+        (of the compressed input, if compression is set).
+
+        :param chunks: Iterable of bytes-like chunks.
+        :return: Iterator over the encoded output pieces.
+        """
+        encoder = self.codec.encoder()
+        compressor = Compressor(self.compression, self.compression_level)
+        position = 0
+        for chunk in chunks:
+            buf = bytearray(compressor.update(chunk))
+            self.schedule.encrypt_into(buf, position)
+            position += len(buf)
+            yield encoder.update(buf)
+        buf = bytearray(compressor.finish())
+        self.schedule.encrypt_into(buf, position)
+        yield encoder.update(buf)
+        yield encoder.finish()
+
+    def decrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Decrypt a stream produced by encrypt_stream() and yield the raw plain bytes.
+        A container is recognised by its header and decoded as one, whatever the encoding.
+
+        :param chunks: Iterable of encoded chunks (bytes).
+        :return: Iterator over the decrypted pieces.
+        """
+        head, chunks = b"", iter(chunks)
+        if not isinstance(self.codec, ContainerCodec):
+            head, chunks = _peek(chunks, len(MAGIC))
+        decoder = self._stream_codec(head).decoder()
+        decompressor = Decompressor()
+        position = 0
+        for chunk in chain([head], chunks):
+            buf = bytearray(decoder.update(chunk))
+            self.schedule.decrypt_into(buf, position)
+            position += len(buf)
+            yield bytes(decompressor.update(buf))
+        buf = bytearray(decoder.finish())
+        self.schedule.decrypt_into(buf, position)
+        yield bytes(decompressor.update(buf))
+        yield bytes(decompressor.finish())
+
+    def encrypt_pipe(self, source: BinaryIO, sink: BinaryIO) -> None:
+        """
+        Encrypt everything read from `source` (e.g. sys.stdin.buffer) and write the encoded
+        output to `sink` (e.g. sys.stdout.buffer) as it is produced, with memory bounded by
+        chunk_size. The output equals encrypt_stream() over the whole input.
+        """
+        self._pipe(source, sink, self.encrypt_stream)
+
+    def decrypt_pipe(self, source: BinaryIO, sink: BinaryIO) -> None:
+        """
+        Decrypt a stream produced by encrypt_pipe() or encrypt_stream() from `source` and
+        write the plain bytes to `sink` as they are produced.
+        """
+        self._pipe(source, sink, self.decrypt_stream)
+
+    def _pipe(self, source: BinaryIO, sink: BinaryIO, transform) -> None:
+        write = wrap("file.write", sink.write, arg_size(0))
+        for piece in transform(read_chunks(source, self.chunk_size)):
+            if piece:
+                write(piece)
+                # Pass each piece on right away; the other end may be waiting for it.
+                sink.flush()
+
+    def _stream_file(self, file: File, transform) -> None:
+        """
+        Run a file through a streaming transform, replacing it once the output is complete.
+        """
+        with file.writer(self.fsync == "file") as out:
+            write = wrap("file.write", out.write, arg_size(0))
+            for piece in transform(file.reader(self.chunk_size)):
+                write(piece)
+
+    def _map_file(self, file: File, apply) -> None:
+        """
+        Transform a raw-binary file in place through a memory map, one window at a time.
+
+        :param apply: The in-place transform, called as apply(window, start).
+        """
+        with file.map() as mapped, memoryview(mapped) as view:
+            for start in range(0, len(view), self.chunk_size):
+                apply(view[start:start + self.chunk_size], start)
+            if self.fsync == "file" and len(view):
+                mapped.flush()
+
+    def _segmented(self) -> bool:
+        """Whether a single file is split across the workers (raw output only)."""
+        return (self.workers > 1 and self.codec.name == "raw" and (self.stream or self.mmap)
+                and self.compression is None)
+
+    def _is_compressed_file(self, path: str) -> bool:
+        """
+        Whether raw ciphertext in `path` decrypts to compressed data. Its plain bytes are
+        shorter than the ciphertext, so it cannot be decrypted in place or range by range.
+        """
+        with open(path, "rb") as handle:
+            head = handle.read(len(SIGNATURE))
+        return is_compressed(self.schedule.decrypt(head))
+
+    @staticmethod
+    def _starts_with_signature(path: str) -> bool:
+        """
+        Whether the plain file `path` starts with the compression signature. Encrypting it
+        adds a stored envelope (see core.compress), which changes its length, so it cannot
+        be encrypted in place or range by range.
+        """
+        with open(path, "rb") as handle:
+            return is_compressed(handle.read(len(SIGNATURE)))
+
+    def _segment_file(self, file: File, schedule: KeySchedule, encrypt: bool) -> None:
+        transform_file(schedule, str(file.path), encrypt, self.workers, self.chunk_size,
+                       in_place=self.mmap, fsync=self.fsync == "file")
+
+    def _encrypt_path(self, path: str) -> None:
+        """Encrypt a single file in place (used for each file in directory mode)."""
+        file = File(path)
+        if self.mmap and not self._starts_with_signature(path):
+            self._map_file(file, self.schedule.encrypt_into)
+            return
+        if self.stream or self.mmap:
+            self._stream_file(file, self.encrypt_stream)
+            return
+        self.value = file.read()
+        self.ascii_inst.value = self.value
+        file.write(self._encrypt(), self.fsync == "file")
+
+    def _dir_files(self) -> Iterator[str]:
+        # A generator, so the tree is walked while earlier files are being processed.
+        return (str(file.path) for file in self.dir_inst.walk(**self.walk_options))
+
+    def _sync_path(self, path: str, encrypt: bool) -> FileResult:
+        """
+        Process one file unless the manifest shows it is already in the wanted state.
+
+        Files whose content changed since the last run are taken to be new plaintext: they
+        are encrypted, but left alone when decrypting.
+        """
+        rel = self.manifest.relative(path)
+        target = ENCRYPTED if encrypt else DECRYPTED
+        state, refreshed = self.manifest.check(rel, path)
+        if state == target or (state == CHANGED and not encrypt):
+            return FileResult(path, True, skipped=True, entry=refreshed)
+        if encrypt:
+            self._encrypt_path(path)
+        else:
+            self._decrypt_path(path)
+        return FileResult(path, True, entry=snapshot(path, target))
 
+    def _sync_encrypt_path(self, path: str) -> FileResult:
+        return self._sync_path(path, True)
+
+    def _sync_decrypt_path(self, path: str) -> FileResult:
+        return self._sync_path(path, False)
+
+    def _run_dir(self, encrypt: bool) -> List[FileResult]:
+        """Process every file of the directory and return one FileResult per file."""
+        if self.manifest is None:
+            return self._process_dir(self._encrypt_path if encrypt else self._decrypt_path)
+        return self._process_dir(self._sync_encrypt_path if encrypt else self._sync_decrypt_path)
+
+    def _process_dir(self, func) -> List[FileResult]:
+        """Run `func` on every file of the directory, keeping the manifest up to date."""
+        if self.manifest is None:
+            results = list(process_files(func, self._dir_files(), self.workers))
+        else:
+            results = []
+            try:
+                for result in process_files(func, self._dir_files(), self.workers):
+                    if result.entry is not None:
+                        self.manifest.record(self.manifest.relative(result.path), result.entry)
+                    results.append(result)
+            finally:
+                self.manifest.save()
+        if self.fsync == "batch":
+            sync_paths(r.path for r in results if r.ok and not r.skipped)
+        return results
+
+    @instrumented("encrypt")
     def encrypt(self):
+        """
+        Encrypt the content, file or directory.
+
+        :return: The encrypted string in content mode, a list of FileResult in directory mode.
+        """
         if self.file:
-            self._update_read()
-            self.file_inst.write(self._encrypt())
+            if (self._segmented() or self.mmap) and self._starts_with_signature(str(self.file_inst.path)):
+                self._stream_file(self.file_inst, self.encrypt_stream)
+            elif self._segmented():
+                self._segment_file(self.file_inst, self.schedule, True)
+            elif self.mmap:
+                self._map_file(self.file_inst, self.schedule.encrypt_into)
+            elif self.stream:
+                self._stream_file(self.file_inst, self.encrypt_stream)
+            else:
+                self._update_read()
+                self.file_inst.write(self._encrypt(), self.fsync == "file")
+            if self.fsync == "batch":
+                sync_paths([str(self.file_inst.path)])
         elif self.dir:
-            for file in self.dir_inst.dir:
-                self.value = file.read()
-                self.ascii_inst.value = self.value
-                file.write(self._encrypt())
+            return self._run_dir(True)
         else:
             return self._encrypt()
 
@@ -157,23 +733,162 @@ class NumeraCrypt:
         :return: The decrypted (original) content.
         """
         self._value_check()
-        self.ascii_inst.value = self.ascii_inst.decode_base91()
-        for round_c in range(self.rounds):
-            self.ascii_inst.value = self._dec_round(round_c)
-        return self.ascii_inst.string
+        return self.decrypt_text(self.ascii_inst.string)
+
+    def _decrypt_path(self, path: str) -> None:
+        """Decrypt a single file in place (used for each file in directory mode)."""
+        keyed = self._keyed(path)
+        if keyed is not self:
+            keyed._decrypt_path(path)
+            return
+        if self._is_foreign_container(path):
+            self._as_container(self.key.value)._decrypt_path(path)
+            return
+        self._check_format(path)
+        file = File(path)
+        if self.mmap and not self._is_compressed_file(path):
+            self._map_file(file, self.schedule.decrypt_into)
+            return
+        if self.stream or self.mmap:
+            self._stream_file(file, self.decrypt_stream)
+            return
+        self.value = file.read()
+        self.ascii_inst.value = self.value
+        file.write(self._decrypt(), self.fsync == "file")
 
+    @instrumented("decrypt")
     def decrypt(self):
+        """
+        Decrypt the content, file or directory.
+
+        :return: The decrypted string in content mode, a list of FileResult in directory mode.
+        """
         if self.file:
-            self._update_read()
-            self.file_inst.write(self._decrypt())
+            keyed = self._keyed(str(self.file_inst.path))
+            if keyed is not self:
+                return keyed.decrypt()
+            if self._is_foreign_container(str(self.file_inst.path)):
+                return self._as_container(self.key.value).decrypt()
+            self._check_format(str(self.file_inst.path))
+            if (self._segmented() or self.mmap) and self._is_compressed_file(str(self.file_inst.path)):
+                self._stream_file(self.file_inst, self.decrypt_stream)
+            elif self._segmented():
+                self._segment_file(self.file_inst, self.schedule, False)
+            elif self.mmap:
+                self._map_file(self.file_inst, self.schedule.decrypt_into)
+            elif self.stream:
+                self._stream_file(self.file_inst, self.decrypt_stream)
+            else:
+                self._update_read()
+                self.file_inst.write(self._decrypt(), self.fsync == "file")
+            if self.fsync == "batch":
+                sync_paths([str(self.file_inst.path)])
         elif self.dir:
-            for file in self.dir_inst.dir:
-                self.value = file.read()
-                self.ascii_inst.value = self.value
-                file.write(self._decrypt())
+            return self._run_dir(False)
         else:
             return self._decrypt()
 
+    def rekey_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Move a stream produced by encrypt_stream() to the key set by rekey() and yield the
+        encoded output. Every piece is decoded, shifted by the combined schedule and encoded
+        again; the plain bytes never exist.
+
+        :param chunks: Iterable of encoded chunks (bytes).
+        :return: Iterator over the re-encrypted, encoded output pieces.
+        """
+        decoder = self.codec.decoder()
+        encoder = self._rekey_codec.encoder()
+        position = 0
+        for chunk in chunks:
+            buf = bytearray(decoder.update(chunk))
+            self._rekey.encrypt_into(buf, position)
+            position += len(buf)
+            yield encoder.update(buf)
+        buf = bytearray(decoder.finish())
+        self._rekey.encrypt_into(buf, position)
+        yield encoder.update(buf)
+        yield encoder.finish()
+
+    def _rekey_text(self, text: str) -> str:
+        """Move a Base91 string of encrypt_text() to the key set by rekey()."""
+        rekeyed = self._rekey.encrypt(ASCII(ASCII(text).decode_base91()).byte_values)
+        return ASCII(rekeyed.decode("latin-1")).encode_base91()
+
+    def _rekey_path(self, path: str) -> None:
+        """Re-encrypt a single file in place (used for each file in directory mode)."""
+        self._check_rekey_format(path)
+        file = File(path)
+        if self.mmap:
+            self._map_file(file, self._rekey.encrypt_into)
+        elif self.stream:
+            self._stream_file(file, self.rekey_stream)
+        else:
+            file.write(self._rekey_text(file.read()), self.fsync == "file")
+
+    def _check_rekey_format(self, path: str) -> None:
+        """
+        :raises ValueError: If `path` is a container but the encoding is not "container"
+            (shifting the header and frames would destroy the file), or is otherwise not
+            in this instance's format (see _check_format()).
+        """
+        if self._is_foreign_container(path):
+            raise ValueError(f"{path} is a container; rotate it with encoding='container'.")
+        self._check_format(path)
+
+    def _sync_rekey_path(self, path: str) -> FileResult:
+        """
+        Re-encrypt one file unless the manifest shows it is not encrypted with the old key.
+
+        Rotated files are recorded as REKEYED until the whole directory is done, so running
+        the same rotation again after an interruption skips them instead of shifting twice.
+        """
+        rel = self.manifest.relative(path)
+        state, refreshed = self.manifest.check(rel, path)
+        if state not in (None, ENCRYPTED):
+            return FileResult(path, True, skipped=True, entry=refreshed)
+        self._rekey_path(path)
+        return FileResult(path, True, entry=snapshot(path, REKEYED))
+
+    @instrumented("rekey")
+    def rekey(self, new_key: str):
+        """
+        Rotate the content, file or directory from this instance's key to `new_key` in a
+        single pass: ciphertext is decoded, shifted by the combined schedule (see
+        schedule.rekey()) and encoded again, instead of a full decrypt followed by a full
+        encrypt. Files are rewritten atomically and directories use the worker processes,
+        the manifest and the fsync policy like encrypt() and decrypt().
+
+        The input must be in this instance's format (stream/encoding/mmap); the output is
+        in the same format. Containers get a new header for the new key.
+
+        :param new_key: The key to encrypt with from now on.
+        :return: The re-encrypted string in content mode, a list of FileResult in directory mode.
+        """
+        new = key_cache.get(new_key, self.backend)
+        self._rekey = rekey(self.schedule, new, self.backend)
+        if isinstance(self.codec, ContainerCodec):
+            self._rekey_codec = self._container_codec(new_key, new)
+        if self.file:
+            if self._segmented():
+                self._check_rekey_format(str(self.file_inst.path))
+                self._segment_file(self.file_inst, self._rekey, True)
+            else:
+                self._rekey_path(str(self.file_inst.path))
+            if self.fsync == "batch":
+                sync_paths([str(self.file_inst.path)])
+        elif self.dir:
+            if self.manifest is None:
+                return self._process_dir(self._rekey_path)
+            results = self._process_dir(self._sync_rekey_path)
+            if all(r.ok for r in results):
+                self.manifest.relabel(REKEYED, ENCRYPTED)
+                self.manifest.save()
+            return results
+        else:
+            self._value_check()
+            return self._rekey_text(self.value)
+
 
 if __name__ == "__main__":
     import time
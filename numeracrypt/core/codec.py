@@ -0,0 +1,156 @@
+from numeracrypt.core.convert import BASE91_ALPHABET, Base91Decoder, Base91Encoder
+from numeracrypt.core.container import ContainerCodec, is_container
+from numeracrypt.core.metrics import arg_size, instrumented, result_size
+import binascii
+
+# Bytes read from the start of a file by possible_encodings().
+SNIFF_SIZE = 4096
+# Fewer characters than this could be written in any encoding.
+SNIFF_MIN = 16
+# Base91 text of this length uses characters outside the base64 alphabet (but for a
+# chance of about 1e-37).
+_SNIFF_BASE64_MIN = 256
+_WHITESPACE = b" \t\r\n"
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+
+class Base91Codec:
+    """Base91 text, the default NumeraCrypt output format (about 23% overhead)."""
+
+    name = "base91"
+
+    def encoder(self) -> Base91Encoder:
+        return Base91Encoder()
+
+    def decoder(self) -> Base91Decoder:
+        return Base91Decoder()
+
+
+class _Base64Encoder:
+    def __init__(self) -> None:
+        self._pending = b""
+
+    @instrumented("encode", arg_size())
+    def update(self, data: bytes) -> bytes:
+        data = self._pending + bytes(data)
+        # Only whole 3-byte groups can be encoded without padding.
+        whole = len(data) - len(data) % 3
+        self._pending = data[whole:]
+        return binascii.b2a_base64(data[:whole], newline=False)
+
+    @instrumented("encode")
+    def finish(self) -> bytes:
+        out = binascii.b2a_base64(self._pending, newline=False) if self._pending else b""
+        self._pending = b""
+        return out
+
+
+class _Base64Decoder:
+    def __init__(self) -> None:
+        self._pending = b""
+
+    @instrumented("decode", result_size)
+    def update(self, data: bytes) -> bytes:
+        # Drop line breaks and other whitespace so 4-character groups stay aligned.
+        data = self._pending + b"".join(bytes(data).split())
+        whole = len(data) - len(data) % 4
+        self._pending = data[whole:]
+        return binascii.a2b_base64(data[:whole])
+
+    def finish(self) -> bytes:
+        if self._pending:
+            raise ValueError("Truncated base64 input.")
+        return b""
+
+
+class Base64Codec:
+    """Standard base64 via binascii (about 33% overhead, but encoded in C)."""
+
+    name = "base64"
+
+    def encoder(self) -> _Base64Encoder:
+        return _Base64Encoder()
+
+    def decoder(self) -> _Base64Decoder:
+        return _Base64Decoder()
+
+
+class _Passthrough:
+    def update(self, data: bytes) -> bytes:
+        return bytes(data)
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class RawCodec:
+    """Raw binary output: no text encoding, ciphertext is as long as the input."""
+
+    name = "raw"
+
+    def encoder(self) -> _Passthrough:
+        return _Passthrough()
+
+    def decoder(self) -> _Passthrough:
+        return _Passthrough()
+
+
+CODECS = {
+    Base91Codec.name: Base91Codec,
+    Base64Codec.name: Base64Codec,
+    RawCodec.name: RawCodec,
+    ContainerCodec.name: ContainerCodec,
+}
+
+
+def get_codec(name: str = "base91"):
+    """
+    Return an output codec by name.
+
+    Every codec provides encoder() and decoder(), which return incremental coders with
+    update(chunk) and finish() methods; encode()/decode() cover whole buffers.
+
+    :param name: "base91", "base64", "raw" or "container".
+    :return: The codec instance.
+    """
+    if name not in CODECS:
+        raise ValueError(f"Unknown encoding '{name}'. Choose one of: {', '.join(CODECS)}.")
+    return CODECS[name]()
+
+
+def encode(data: bytes, name: str = "base91") -> bytes:
+    """Encode a whole buffer with the named codec."""
+    encoder = get_codec(name).encoder()
+    return encoder.update(data) + encoder.finish()
+
+
+def decode(data: bytes, name: str = "base91") -> bytes:
+    """Decode a whole buffer with the named codec."""
+    decoder = get_codec(name).decoder()
+    return bytes(decoder.update(data) + decoder.finish())
+
+
+def possible_encodings(head: bytes) -> set:
+    """
+    Tell which encodings ciphertext starting with `head` can be in, so a file is not
+    decoded with the wrong codec (the base91 and base64 decoders skip foreign characters
+    and the raw one takes anything, so that would yield garbage instead of an error).
+
+    Raw ciphertext contains bytes that are not printable, text uses only its codec's
+    alphabet. Too short a head fits every encoding.
+
+    :param head: The first bytes of the ciphertext, ideally SNIFF_SIZE of them.
+    :return: A set of codec names.
+    """
+    if is_container(head):
+        return {ContainerCodec.name}
+    text = bytes(head).translate(None, _WHITESPACE)
+    if len(text) < SNIFF_MIN:
+        return set(CODECS)
+    if text.translate(None, BASE91_ALPHABET):
+        return {RawCodec.name}
+    if text.translate(None, _BASE64_ALPHABET):
+        return {Base91Codec.name}
+    if len(text) < _SNIFF_BASE64_MIN:
+        return {Base91Codec.name, Base64Codec.name}
+    return {Base64Codec.name}
@@ -0,0 +1,194 @@
+"""
+Optional compression of the plain data before it is encrypted.
+
+Ciphertext looks random and cannot be compressed afterwards, so compression runs first and
+the cipher and the output encoding only see the compressed bytes. Compressed data starts
+with an envelope: the 8-byte SIGNATURE and a method byte, followed by the compressor's
+output. Decryption recognises the envelope and reverses it; data without one is returned
+as it is, so existing ciphertext keeps decrypting. Plain data that happens to begin with
+the signature is wrapped in a "stored" envelope, so the check never misfires.
+
+Incompressible input (already compressed or encrypted files) is detected on a sample and
+left uncompressed, without an envelope.
+"""
+from numeracrypt.core.metrics import arg_size, instrumented, result_size
+from typing import Optional, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+SIGNATURE = b"\x89NCZ\r\n\x1a\n"
+METHOD_STORED = 0
+METHODS = {"zlib": 1, "lzma": 2, "bz2": 3}
+HEADER_SIZE = len(SIGNATURE) + 1
+
+# Bytes compressed on trial to decide whether compression pays off.
+SAMPLE_SIZE = 64 * 1024
+# Compression is skipped unless the sample shrinks to at most this fraction of its size.
+AUTO_SKIP_RATIO = 0.9
+
+
+def _compressor(method: int, level: Optional[int]):
+    # The codec modules are only imported when used.
+    if method == METHODS["zlib"]:
+        import zlib
+        return zlib.compressobj(-1 if level is None else level)
+    if method == METHODS["lzma"]:
+        import lzma
+        return lzma.LZMACompressor(preset=level)
+    import bz2
+    return bz2.BZ2Compressor(9 if level is None else level)
+
+
+def _decompressor(method: int):
+    if method == METHOD_STORED:
+        return None
+    if method == METHODS["zlib"]:
+        import zlib
+        return zlib.decompressobj()
+    if method == METHODS["lzma"]:
+        import lzma
+        return lzma.LZMADecompressor()
+    if method == METHODS["bz2"]:
+        import bz2
+        return bz2.BZ2Decompressor()
+    raise ValueError(f"Unsupported compression method {method}.")
+
+
+def check_method(name: Optional[str]) -> None:
+    """
+    :raises ValueError: If `name` is neither None nor one of METHODS.
+    """
+    if name is not None and name not in METHODS:
+        raise ValueError(f"Unknown compression '{name}'. Choose one of: {', '.join(METHODS)}.")
+
+
+def is_compressed(head: BytesLike) -> bool:
+    """Return whether plain data starting with `head` carries a compression envelope."""
+    return bytes(head[:len(SIGNATURE)]) == SIGNATURE
+
+
+class Compressor:
+    """
+    Incremental compression with the update()/finish() interface of the codecs.
+
+    The method is chosen on the first SAMPLE_SIZE bytes: if they do not compress well,
+    everything passes through unchanged. With method=None nothing is compressed and only
+    the first bytes are checked for the signature.
+    """
+
+    def __init__(self, method: Optional[str] = None, level: Optional[int] = None):
+        """
+        :param method: "zlib", "lzma", "bz2" or None.
+        :param level: Compression level (preset for lzma); None for the method's default.
+        """
+        check_method(method)
+        self.method = METHODS[method] if method else None
+        self.level = level
+        self._pending = bytearray()
+        self._started = False
+        self._engine = None
+
+    def _sample_size(self) -> int:
+        return SAMPLE_SIZE if self.method is not None else len(SIGNATURE)
+
+    def _start(self, final: bool) -> bytes:
+        """Choose the method from the buffered bytes and return the output for them."""
+        self._started = True
+        data = bytes(self._pending)
+        self._pending.clear()
+        if self.method is not None:
+            sample = data if final else data[:SAMPLE_SIZE]
+            engine = _compressor(self.method, self.level)
+            trial = engine.compress(sample) + engine.flush()
+            if len(trial) <= AUTO_SKIP_RATIO * len(sample):
+                header = SIGNATURE + bytes([self.method])
+                if final:
+                    return header + trial
+                self._engine = _compressor(self.method, self.level)
+                return header + self._engine.compress(data)
+        if is_compressed(data):
+            return SIGNATURE + bytes([METHOD_STORED]) + data
+        return data
+
+    @instrumented("compress", arg_size())
+    def update(self, data: BytesLike) -> bytes:
+        """Add plain bytes and return the compressed bytes produced so far."""
+        if not self._started:
+            self._pending += data
+            if len(self._pending) < self._sample_size():
+                return b""
+            return self._start(False)
+        if self._engine is not None:
+            return self._engine.compress(data)
+        return data
+
+    @instrumented("compress")
+    def finish(self) -> bytes:
+        if not self._started:
+            return self._start(True)
+        if self._engine is not None:
+            return self._engine.flush()
+        return b""
+
+
+class Decompressor:
+    """
+    Incremental counterpart of Compressor: reverses the envelope if the data starts with
+    one and passes everything else through.
+    """
+
+    def __init__(self):
+        self._pending = bytearray()
+        self._started = False
+        self._engine = None
+
+    def _start(self) -> bytes:
+        self._started = True
+        data = bytes(self._pending)
+        self._pending.clear()
+        if is_compressed(data) and len(data) >= HEADER_SIZE:
+            self._engine = _decompressor(data[len(SIGNATURE)])
+            data = data[HEADER_SIZE:]
+        return self._process(data)
+
+    def _process(self, data: BytesLike) -> bytes:
+        if self._engine is None:
+            return data
+        if self._engine.eof:
+            if data:
+                raise ValueError("Unexpected data after the compressed stream.")
+            return b""
+        return self._engine.decompress(data)
+
+    @instrumented("decompress", result_size)
+    def update(self, data: BytesLike) -> bytes:
+        """Add decrypted bytes and return the plain bytes recovered so far."""
+        if not self._started:
+            self._pending += data
+            if len(self._pending) < HEADER_SIZE:
+                return b""
+            return self._start()
+        return self._process(data)
+
+    @instrumented("decompress", result_size)
+    def finish(self) -> bytes:
+        out = self._start() if not self._started else b""
+        if self._engine is not None and not self._engine.eof:
+            raise ValueError("Truncated compressed data.")
+        return out
+
+
+def compress(data: BytesLike, method: Optional[str] = None, level: Optional[int] = None) -> bytes:
+    """Compress a whole buffer (see Compressor); returns `data` itself when nothing changes."""
+    if method is None and not is_compressed(data):
+        return data
+    compressor = Compressor(method, level)
+    return compressor.update(data) + compressor.finish()
+
+
+def decompress(data: BytesLike) -> bytes:
+    """Reverse compress(); returns `data` itself when it carries no envelope."""
+    if not is_compressed(data):
+        return data
+    decompressor = Decompressor()
+    return decompressor.update(data) + decompressor.finish()
@@ -0,0 +1,35 @@
+from typing import Optional
+import os
+
+_package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The .env files read on first use, in this order. Variables that are already set, in the
+# environment or by an earlier file, are never overridden.
+DOTENV_PATHS = (
+    os.path.join(_package_dir, "core", ".env"),
+    os.path.join(_package_dir, ".env"),
+)
+
+_loaded = False
+
+
+def load() -> None:
+    """
+    Load the .env files into the environment. Only the first call does any work, and
+    python-dotenv is only imported when one of the files exists.
+    """
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    paths = [path for path in DOTENV_PATHS if os.path.isfile(path)]
+    if paths:
+        from dotenv import load_dotenv
+        for path in paths:
+            load_dotenv(path)
+
+
+def get(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Return a configuration variable, loading the .env files first if needed."""
+    load()
+    return os.getenv(name, default)
@@ -0,0 +1,301 @@
+"""
+The NumeraCrypt container: a compact binary format for encrypted files.
+
+Layout (all integers little-endian):
+
+    header   magic "NCRY", version, flags, rounds, key period, chunk size, fingerprint
+    frames   one per chunk: method, stored length, plain length, CRC-32, then the bytes
+    end      a frame header with method END, then the index and the footer
+    index    per chunk: data offset, stored length, plain length, CRC-32, method
+    footer   index offset, chunk count, plain size, CRC-32 of the index, magic "NCIX"
+
+The payload is raw ciphertext, so there is no text-encoding overhead. Chunk i holds the
+ciphertext of plain bytes [i * chunk_size, (i + 1) * chunk_size), encrypted at its absolute
+position, so the concatenated payload equals the raw ciphertext of the whole input.
+A stream can be decoded front to back (the frames are self-delimiting), while a seekable
+file can be opened through the footer and index to read any range without touching the
+rest. CRC-32 checksums of the stored bytes let readers verify the file without the key.
+"""
+from numeracrypt.core.file import DEFAULT_CHUNK_SIZE
+from numeracrypt.core.metrics import arg_size, instrumented, result_size
+from typing import BinaryIO, List, NamedTuple, Optional
+import bisect
+import struct
+import zlib
+
+MAGIC = b"NCRY"
+INDEX_MAGIC = b"NCIX"
+VERSION = 1
+
+# Header flags.
+FLAG_CHECKSUMS = 1
+FLAG_FINGERPRINT = 2
+
+# Frame methods: how the stored bytes of a chunk were produced from the ciphertext.
+METHOD_STORED = 0
+# Marks the end of the frames; the index and footer follow.
+METHOD_END = 0xFF
+
+HEADER = struct.Struct("<4sBBHHI16s")
+FRAME = struct.Struct("<BIII")
+ENTRY = struct.Struct("<QIIIB")
+FOOTER = struct.Struct("<QIQI4s")
+
+
+class Header(NamedTuple):
+    version: int
+    flags: int
+    rounds: int
+    period: int
+    chunk_size: int
+    fingerprint: bytes
+
+    @property
+    def checksums(self) -> bool:
+        return bool(self.flags & FLAG_CHECKSUMS)
+
+
+class Chunk(NamedTuple):
+    """Index entry of one chunk; `start` is its position in the plain data."""
+    offset: int
+    stored: int
+    plain: int
+    crc: int
+    method: int
+    start: int
+
+
+def parse_header(data: bytes) -> Header:
+    """
+    Parse and check the fixed-size header at the start of a container.
+
+    :raises ValueError: If the data is not a container of a supported version.
+    """
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        raise ValueError("Not a NumeraCrypt container.")
+    magic, version, flags, rounds, period, chunk_size, fingerprint = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"Unsupported container version {version}.")
+    return Header(version, flags, rounds, period, chunk_size, fingerprint)
+
+
+def is_container(prefix: bytes) -> bool:
+    """Return whether data starting with `prefix` looks like a container."""
+    return prefix[:4] == MAGIC
+
+
+class ContainerEncoder:
+    """
+    Incremental container writer with the update()/finish() interface of the other codecs.
+    Input is regrouped into chunk_size chunks, so the output does not depend on how the
+    ciphertext is fed in.
+    """
+
+    def __init__(self, header: Header):
+        self.header = header
+        self._pending = bytearray()
+        self._position = 0
+        self._entries: List[bytes] = []
+        self._plain = 0
+        self._started = False
+
+    def _start(self) -> bytes:
+        self._started = True
+        h = self.header
+        data = HEADER.pack(MAGIC, h.version, h.flags, h.rounds, h.period, h.chunk_size, h.fingerprint)
+        self._position = len(data)
+        return data
+
+    def _frame(self, chunk: bytes) -> bytes:
+        crc = zlib.crc32(chunk) if self.header.checksums else 0
+        head = FRAME.pack(METHOD_STORED, len(chunk), len(chunk), crc)
+        offset = self._position + len(head)
+        self._entries.append(ENTRY.pack(offset, len(chunk), len(chunk), crc, METHOD_STORED))
+        self._position = offset + len(chunk)
+        self._plain += len(chunk)
+        return head + chunk
+
+    @instrumented("encode", arg_size())
+    def update(self, data: bytes) -> bytes:
+        """Add ciphertext and return the container bytes completed so far."""
+        out = [] if self._started else [self._start()]
+        self._pending += data
+        size = self.header.chunk_size
+        whole = len(self._pending) - len(self._pending) % size
+        for begin in range(0, whole, size):
+            out.append(self._frame(bytes(self._pending[begin:begin + size])))
+        del self._pending[:whole]
+        return b"".join(out)
+
+    @instrumented("encode")
+    def finish(self) -> bytes:
+        """Write the last chunk, the end marker, the index and the footer."""
+        out = [] if self._started else [self._start()]
+        if self._pending:
+            out.append(self._frame(bytes(self._pending)))
+            self._pending.clear()
+        out.append(FRAME.pack(METHOD_END, 0, 0, 0))
+        index = b"".join(self._entries)
+        index_offset = self._position + FRAME.size
+        out.append(index)
+        out.append(FOOTER.pack(index_offset, len(self._entries), self._plain, zlib.crc32(index), INDEX_MAGIC))
+        return b"".join(out)
+
+
+class ContainerDecoder:
+    """
+    Incremental container reader for streams: parses the frames front to back, checks
+    their checksums and returns the ciphertext.
+    """
+
+    def __init__(self, expected: Optional[Header] = None):
+        """
+        :param expected: If given, the container must have been written with the same rounds
+            and key period (a quick check for the wrong key).
+        """
+        self.expected = expected
+        self.header: Optional[Header] = None
+        self._buffer = bytearray()
+        self._done = False
+
+    def _check_key(self) -> None:
+        expected, header = self.expected, self.header
+        if expected is None or not (expected.rounds and header.rounds):
+            return
+        if (expected.rounds, expected.period) != (header.rounds, header.period):
+            raise ValueError("The container was written with a different key.")
+
+    @instrumented("decode", result_size)
+    def update(self, data: bytes) -> bytes:
+        """Add container bytes and return the ciphertext of the frames completed so far."""
+        if self._done:
+            return b""
+        buf = self._buffer
+        buf += data
+        if self.header is None:
+            if len(buf) < HEADER.size:
+                return b""
+            self.header = parse_header(buf)
+            self._check_key()
+            del buf[:HEADER.size]
+        out = []
+        pos = 0
+        while len(buf) - pos >= FRAME.size:
+            method, stored, plain, crc = FRAME.unpack_from(buf, pos)
+            if method == METHOD_END:
+                self._done = True
+                pos = len(buf)
+                break
+            if method != METHOD_STORED:
+                raise ValueError(f"Unsupported chunk method {method}.")
+            end = pos + FRAME.size + stored
+            if len(buf) < end:
+                break
+            chunk = bytes(buf[pos + FRAME.size:end])
+            if self.header.checksums and zlib.crc32(chunk) != crc:
+                raise ValueError("Container chunk is corrupt (checksum mismatch).")
+            out.append(chunk)
+            pos = end
+        del buf[:pos]
+        return b"".join(out)
+
+    @instrumented("decode", result_size)
+    def finish(self) -> bytes:
+        if self.header is None:
+            parse_header(self._buffer)
+        if not self._done:
+            raise ValueError("Truncated container.")
+        return b""
+
+
+class ContainerCodec:
+    """
+    Binary container with a header, checksummed chunks and an index (see module docstring).
+    Configured with the key's rounds and period so decoding can reject the wrong key early.
+    """
+
+    name = "container"
+
+    def __init__(self, rounds: int = 0, period: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 checksums: bool = True, fingerprint: Optional[bytes] = None):
+        flags = (FLAG_CHECKSUMS if checksums else 0) | (FLAG_FINGERPRINT if fingerprint else 0)
+        self.header = Header(VERSION, flags, rounds, period, chunk_size, (fingerprint or b"").ljust(16, b"\0"))
+
+    def encoder(self) -> ContainerEncoder:
+        return ContainerEncoder(self.header)
+
+    def decoder(self) -> ContainerDecoder:
+        return ContainerDecoder(self.header)
+
+
+class ContainerReader:
+    """
+    Random access to a container in a seekable file, through its footer and index.
+
+    Usage:
+        with open(path, "rb") as handle:
+            reader = ContainerReader(handle)
+            reader.verify()
+            cipher = reader.read_cipher(start, length)
+    """
+
+    def __init__(self, handle: BinaryIO):
+        self.handle = handle
+        handle.seek(0)
+        self.header = parse_header(handle.read(HEADER.size))
+        handle.seek(0, 2)
+        end = handle.tell()
+        if end < HEADER.size + FRAME.size + FOOTER.size:
+            raise ValueError("Truncated container.")
+        handle.seek(end - FOOTER.size)
+        index_offset, count, self.size, index_crc, magic = FOOTER.unpack(handle.read(FOOTER.size))
+        if magic != INDEX_MAGIC or index_offset + count * ENTRY.size != end - FOOTER.size:
+            raise ValueError("Container index is missing or damaged.")
+        handle.seek(index_offset)
+        index = handle.read(count * ENTRY.size)
+        if zlib.crc32(index) != index_crc:
+            raise ValueError("Container index is corrupt (checksum mismatch).")
+        self.chunks: List[Chunk] = []
+        start = 0
+        for offset, stored, plain, crc, method in ENTRY.iter_unpack(index):
+            self.chunks.append(Chunk(offset, stored, plain, crc, method, start))
+            start += plain
+        self._starts = [chunk.start for chunk in self.chunks]
+
+    def _read_chunk(self, chunk: Chunk) -> bytes:
+        self.handle.seek(chunk.offset)
+        data = self.handle.read(chunk.stored)
+        if len(data) != chunk.stored:
+            raise ValueError("Truncated container.")
+        if self.header.checksums and zlib.crc32(data) != chunk.crc:
+            raise ValueError("Container chunk is corrupt (checksum mismatch).")
+        if chunk.method != METHOD_STORED:
+            raise ValueError(f"Unsupported chunk method {chunk.method}.")
+        return data
+
+    def verify(self) -> None:
+        """
+        Check every chunk against its checksum without decrypting anything.
+
+        :raises ValueError: On the first damaged chunk.
+        """
+        for chunk in self.chunks:
+            self._read_chunk(chunk)
+
+    def read_cipher(self, start: int, length: int) -> bytes:
+        """
+        Return the ciphertext of plain bytes [start, start + length), reading only the
+        chunks that overlap the range. The result is cut off at the end of the data.
+        """
+        start = max(start, 0)
+        end = min(start + max(length, 0), self.size)
+        if start >= end:
+            return b""
+        first = bisect.bisect_right(self._starts, start) - 1
+        parts = []
+        for chunk in self.chunks[first:]:
+            if chunk.start >= end:
+                break
+            data = self._read_chunk(chunk)
+            parts.append(data[max(start - chunk.start, 0):end - chunk.start])
+        return b"".join(parts)
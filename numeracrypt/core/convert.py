@@ -1,5 +1,6 @@
-import base91
+from numeracrypt.core.metrics import arg_size, instrumented, result_size
 from typing import Union, List
+import sys
 
 
 class ASCII:
@@ -61,18 +62,197 @@ class ASCII:
         else:
             raise ValueError("Unsupported type for value")
 
+    @property
+    def byte_values(self) -> bytes:
+        """
+        Return the ASCII code(s) as a bytes object, each code reduced modulo 256.
+        Unlike ascii, a one-character string still yields a sequence.
+        """
+        if isinstance(self.value, str):
+            try:
+                return self.value.encode("latin-1")
+            except UnicodeEncodeError:
+                return bytes(ord(c) & 0xFF for c in self.value)
+        elif isinstance(self.value, (bytes, bytearray)):
+            return bytes(self.value)
+        elif isinstance(self.value, list):
+            return bytes(int(i) & 0xFF for i in self.value)
+        elif isinstance(self.value, int):
+            return bytes([self.value & 0xFF])
+        else:
+            raise ValueError("Unsupported type for value")
+
     def encode_base91(self) -> str:
         """
         Encode the string representation of self.value into Base91 format.
         """
-        return base91.encode(self.string.encode("utf-8"))
+        return base91_encode(self.string.encode("utf-8"))
 
     def decode_base91(self) -> str:
         """
         Decode self.value from Base91. Assumes self.value is the Base91 encoded string.
         """
         # Here we use self.string as the input Base91 string.
-        return base91.decode(self.string).decode("utf-8")
+        return base91_decode(self.string).decode("utf-8")
+
+
+BASE91_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!#$%&()*+,./:;<=>?@[]^_`{|}~"'
+BASE91_DECODE = {c: i for i, c in enumerate(BASE91_ALPHABET)}
+
+# Characters outside the alphabet are ignored by the decoder.
+_B91_IGNORED = bytes(c for c in range(256) if c not in BASE91_DECODE)
+# Lookup tables, built on first use since that takes longer than a short encryption.
+_B91_PAIRS = None
+_B91_GROUP = _B91_WIDTH = None
+
+
+def _b91_pairs() -> list:
+    # Every 13/14-bit group is written as two characters, so one lookup yields both.
+    global _B91_PAIRS
+    if _B91_PAIRS is None:
+        _B91_PAIRS = [bytes((BASE91_ALPHABET[v % 91], BASE91_ALPHABET[v // 91])) for v in range(91 * 91)]
+    return _B91_PAIRS
+
+
+def _b91_groups() -> tuple:
+    # Two characters read as one native-endian 16-bit word map to their group value and bit width.
+    global _B91_GROUP, _B91_WIDTH
+    if _B91_GROUP is None:
+        group = [0] * 65536
+        width = [0] * 65536
+        for lo in BASE91_ALPHABET:
+            for hi in BASE91_ALPHABET:
+                v = BASE91_DECODE[lo] + BASE91_DECODE[hi] * 91
+                word = int.from_bytes(bytes((lo, hi)), sys.byteorder)
+                group[word] = v
+                width[word] = 13 if (v & 8191) > 88 else 14
+        _B91_GROUP, _B91_WIDTH = group, width
+    return _B91_GROUP, _B91_WIDTH
+
+
+class Base91Encoder:
+    """
+    Incremental, table-driven Base91 encoder. Feeding the input in any number of chunks
+    through update() and calling finish() once yields the same text as base91.encode().
+    """
+
+    def __init__(self) -> None:
+        self._bits = 0
+        self._nbits = 0
+
+    @instrumented("encode", arg_size())
+    def update(self, data: bytes) -> bytes:
+        """Encode the next chunk and return the Base91 characters completed so far."""
+        b, n = self._bits, self._nbits
+        parts = []
+        append = parts.append
+        pairs = _b91_pairs()
+        view = memoryview(data).cast("B")
+        whole = len(view) - len(view) % 4
+        # Groups are emitted as soon as more than 13 bits are pending, so feeding 32 bits
+        # at a time produces exactly the same groups as feeding single bytes.
+        words = view[:whole].cast("I") if sys.byteorder == "little" and whole else ()
+        for word in words:
+            b |= word << n
+            n += 32
+            while n > 13:
+                v = b & 8191
+                if v > 88:
+                    b >>= 13
+                    n -= 13
+                else:
+                    v = b & 16383
+                    b >>= 14
+                    n -= 14
+                append(pairs[v])
+        for byte in (view[whole:] if words else view):
+            b |= byte << n
+            n += 8
+            if n > 13:
+                v = b & 8191
+                if v > 88:
+                    b >>= 13
+                    n -= 13
+                else:
+                    v = b & 16383
+                    b >>= 14
+                    n -= 14
+                append(pairs[v])
+        self._bits, self._nbits = b, n
+        return b"".join(parts)
+
+    @instrumented("encode")
+    def finish(self) -> bytes:
+        """Flush the remaining bits. The encoder must not be used afterwards."""
+        b, n = self._bits, self._nbits
+        out = bytearray()
+        if n:
+            out.append(BASE91_ALPHABET[b % 91])
+            if n > 7 or b > 90:
+                out.append(BASE91_ALPHABET[b // 91])
+        self._bits = self._nbits = 0
+        return bytes(out)
+
+
+class Base91Decoder:
+    """
+    Incremental, table-driven Base91 decoder, the counterpart of Base91Encoder.
+    Characters outside the alphabet (e.g. line breaks) are skipped like base91.decode() does.
+    """
+
+    def __init__(self) -> None:
+        self._pending = b""
+        self._bits = 0
+        self._nbits = 0
+
+    @instrumented("decode", result_size)
+    def update(self, data: bytes) -> bytearray:
+        """Decode the next chunk of Base91 text and return the bytes completed so far."""
+        data = self._pending + bytes(data).translate(None, _B91_IGNORED)
+        whole = len(data) & ~1
+        self._pending = data[whole:]
+        b, n = self._bits, self._nbits
+        out = bytearray()
+        groups, widths = _b91_groups()
+        for word in memoryview(data)[:whole].cast("H"):
+            b |= groups[word] << n
+            n += widths[word]
+            # Bytes are written 4 at a time instead of one per group.
+            if n >= 32:
+                out += (b & 0xFFFFFFFF).to_bytes(4, "little")
+                b >>= 32
+                n -= 32
+        # Flush whole bytes; fewer than 8 bits stay pending for the next group.
+        count = n // 8
+        if count:
+            out += (b & ((1 << 8 * count) - 1)).to_bytes(count, "little")
+            b >>= 8 * count
+            n -= 8 * count
+        self._bits, self._nbits = b, n
+        return out
+
+    @instrumented("decode", result_size)
+    def finish(self) -> bytearray:
+        """Flush a trailing partial group. The decoder must not be used afterwards."""
+        out = bytearray()
+        if self._pending:
+            out.append((self._bits | BASE91_DECODE[self._pending[0]] << self._nbits) & 255)
+        self._pending, self._bits, self._nbits = b"", 0, 0
+        return out
+
+
+def base91_encode(data: bytes) -> str:
+    """Encode bytes into a Base91 string."""
+    encoder = Base91Encoder()
+    return (encoder.update(data) + encoder.finish()).decode("ascii")
+
+
+def base91_decode(text: Union[str, bytes]) -> bytearray:
+    """Decode a Base91 string (or its ASCII bytes) into bytes."""
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    decoder = Base91Decoder()
+    return decoder.update(text) + decoder.finish()
 
 
 # Example usage:
@@ -0,0 +1,218 @@
+"""
+Resident NumeraCrypt server on a Unix domain socket, and the client side of its protocol.
+
+The server keeps compiled keys (through the key cache) and warm backends in memory, so a
+forwarded `encrypt --content` costs a round trip instead of an interpreter start, imports
+and key parsing. The client half only needs the C socket module and is imported by the
+console script before anything else.
+
+Protocol: a request and its response are each a sequence of length-prefixed UTF-8 fields
+(4-byte big-endian length, then the bytes), preceded by the number of fields (4 bytes).
+A request is [op, name=value, ...]; a response is ["ok", output] or ["error", message].
+"""
+# _socket instead of socket: the wrapper module costs more to import than a forwarded call.
+import _socket
+import os
+import stat
+import struct
+
+SOCKET_ENV = "NUMERACRYPT_SOCKET"
+# Set to "0" to never forward CLI calls to a running server.
+DAEMON_ENV = "NUMERACRYPT_DAEMON"
+# Seconds the client waits for the server to accept a connection.
+CONNECT_TIMEOUT = 0.5
+
+_HEADER = struct.Struct("!I")
+
+
+def _temp_dir() -> str:
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"numeracrypt-{os.getuid()}")
+
+
+def socket_path() -> str:
+    """
+    The socket used by `numeracrypt serve` and the CLI client: $NUMERACRYPT_SOCKET, else
+    numeracrypt.sock in $XDG_RUNTIME_DIR, else numeracrypt.sock in a per-user directory
+    (mode 0700) in the temp directory.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "numeracrypt.sock")
+    return os.path.join(_temp_dir(), "numeracrypt.sock")
+
+
+def _check_socket(path: str) -> None:
+    """
+    Keys and plaintext go to whoever listens on the socket, so only connect to a socket
+    of the current user (in a shared directory, anyone could bind the name first).
+
+    :raises PermissionError: If `path` is not a socket owned by the current user.
+    """
+    st = os.lstat(path)
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not a socket owned by the current user.")
+
+
+def _private_dir(directory: str) -> None:
+    """
+    Create `directory` with mode 0700, or check that an existing one is private.
+
+    :raises PermissionError: If it exists but belongs to another user or is open to others.
+    """
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            raise PermissionError(f"{directory} must be a directory private to the current user.") from None
+
+
+def pack(fields) -> bytes:
+    """Serialise a list of strings into one message."""
+    parts = [_HEADER.pack(len(fields))]
+    for field in fields:
+        data = field.encode("utf-8", "surrogateescape")
+        parts.append(_HEADER.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def unpack(sock) -> list:
+    """Read one message from a connected socket."""
+    count = _HEADER.unpack(_recv_exact(sock, 4))[0]
+    fields = []
+    for _ in range(count):
+        size = _HEADER.unpack(_recv_exact(sock, 4))[0]
+        fields.append(_recv_exact(sock, size).decode("utf-8", "surrogateescape"))
+    return fields
+
+
+def call(op: str, options: dict, path: str = None) -> list:
+    """
+    Send one request to a running server and return its response fields.
+
+    :raises OSError: If no server is listening on the socket.
+    :raises PermissionError: If the socket belongs to another user.
+    """
+    path = path or socket_path()
+    _check_socket(path)
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(path)
+        # File requests may take a while once accepted.
+        sock.settimeout(None)
+        sock.sendall(pack([op, *(f"{name}={value}" for name, value in options.items())]))
+        return unpack(sock)
+    finally:
+        sock.close()
+
+
+def handle(op: str, options: dict) -> str:
+    """
+    Run one request in the server process and return the CLI output it produced.
+
+    :raises ValueError: For unknown operations or an invalid key.
+    """
+    from numeracrypt.core.cipher import NumeraCrypt, resolve_stream
+    from numeracrypt.core.keycache import key_cache
+
+    if op == "ping":
+        return "pong"
+    if op not in ("encrypt", "decrypt"):
+        raise ValueError(f"Unknown operation '{op}'.")
+    key = options["key"]
+    if not key_cache.validate(key):
+        raise ValueError("Invalid key format.")
+    encrypt = op == "encrypt"
+    icon, verb = ("🔒", "Encrypted") if encrypt else ("🔓", "Decrypted")
+    backend = options.get("backend", "auto")
+    if "content" in options:
+        nc = NumeraCrypt("", key, backend=backend)
+        content = options["content"]
+        result = nc.encrypt_text(content) if encrypt else nc.decrypt_text(content)
+        return f"{icon} {verb} content: {result}"
+    path = options["file"]
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"File {path} does not exist.")
+    encoding = options.get("encoding", "base91")
+    # Same default as the CLI: the legacy text format unless a stream encoding is given.
+    stream = resolve_stream(None if "stream" not in options else options["stream"] == "1", encoding)
+    nc = NumeraCrypt(path, key, file=True, backend=backend, stream=stream, encoding=encoding,
+                     fsync=options.get("fsync", "none"))
+    nc.encrypt() if encrypt else nc.decrypt()
+    return f"{icon} {verb} file: {options.get('display', path)}"
+
+
+def serve(path: str = None, ready=None) -> None:
+    """
+    Listen on the Unix socket and answer requests until interrupted, one thread per
+    connection. A stale socket file left by a crashed server is replaced; a live one is not.
+
+    :param path: The socket path; defaults to socket_path().
+    :param ready: Called with the socket path once the server accepts connections.
+    :raises RuntimeError: If another server already listens on the socket.
+    :raises PermissionError: If the socket or its per-user directory belongs to another user.
+    """
+    import signal
+    import socketserver
+    import sys
+    import threading
+
+    path = path or socket_path()
+    if os.path.dirname(path) == _temp_dir():
+        _private_dir(os.path.dirname(path))
+    if os.path.lexists(path):
+        _check_socket(path)
+        try:
+            call("ping", {}, path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"A NumeraCrypt server is already listening on {path}.")
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            try:
+                op, *fields = unpack(self.request)
+                options = dict(field.split("=", 1) for field in fields)
+                response = ["ok", handle(op, options)]
+            except Exception as e:
+                response = ["error", f"{type(e).__name__}: {e}"]
+            self.request.sendall(pack(response))
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    # Keys travel over the socket, so only the owner may connect.
+    umask = os.umask(0o177)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(umask)
+    if threading.current_thread() is threading.main_thread():
+        # Let `kill` stop the server through the cleanup below.
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        with server:
+            if ready is not None:
+                ready(path)
+            server.serve_forever()
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
@@ -1,20 +1,90 @@
 from pathlib import Path
-from datetime import datetime
-from dotenv import load_dotenv
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, List, Optional, Union
+from numeracrypt.core import metrics
+import fnmatch
 import os
-# Get the directory where this file resides.
-base_dir = os.path.dirname(os.path.abspath(__file__))
-dotenv_path = os.path.join(base_dir, '.env')
-load_dotenv(dotenv_path)
+import stat
 
-def key_file_extension() -> str:
-    env_path = os.getenv("KEY_FILE_EXTENSION")
-    if not env_path:
-        # Warn the user and use the current working directory as a fallback.
-        import typer
-        typer.echo("❗ Warning: KEY_FILE_EXTENSION is not set. Using the current default.")
-        return ".nkey"
-    return env_path
+if TYPE_CHECKING:
+    import mmap
+
+# Default size of the chunks read and written by the streaming primitives.
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Suffix of the temporary files created by File.writer(); directory walks skip them.
+TEMP_SUFFIX = ".ncrypt.tmp"
+# Buffer size of File.writer(), so chunked output reaches the OS in large writes.
+WRITE_BUFFER_SIZE = 4 << 20
+# When written files are fsynced: never, before each file is moved into place, or once
+# for a whole batch of files via sync_paths().
+FSYNC_POLICIES = ("none", "file", "batch")
+# Symlink policies of File.walk().
+SYMLINK_POLICIES = ("skip", "files", "follow")
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist a directory entry change (e.g. a rename). Not supported on every OS."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def sync_paths(paths: Iterable[str]) -> None:
+    """
+    Flush already written files and their directories to disk in one go.
+    Used by the "batch" fsync policy after a whole directory has been processed.
+    """
+    directories = set()
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        directories.add(os.path.dirname(os.path.abspath(path)))
+    for directory in directories:
+        _fsync_dir(directory)
+
+
+def read_chunks(handle: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield everything readable from an open binary stream, at most chunk_size bytes at a time.
+
+    Uses read1() where available, so data arriving on a pipe is passed on as soon as it is
+    there instead of once a whole chunk has accumulated.
+    """
+    read = metrics.wrap("file.read", getattr(handle, "read1", handle.read), metrics.result_size)
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _match_segments(parts: List[str], pattern: List[str]) -> bool:
+    # '*' and '?' stay within one segment; a '**' segment spans any number of them.
+    if not pattern:
+        return not parts
+    if pattern[0] == "**":
+        return any(_match_segments(parts[i:], pattern[1:]) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatchcase(parts[0], pattern[0]) and _match_segments(parts[1:], pattern[1:])
+
+
+def _matches(name: str, rel: str, patterns: Iterable[str]) -> bool:
+    for p in patterns:
+        if "/" in p:
+            if _match_segments(rel.split("/"), p.split("/")):
+                return True
+        elif fnmatch.fnmatchcase(name, p):
+            return True
+    return False
 
 
 class File:
@@ -22,6 +92,14 @@ class File:
         self.path = Path(file_path)
         self._is_dir: bool = self.path.is_dir()
 
+    @classmethod
+    def from_entry(cls, entry: os.DirEntry) -> "File":
+        """Create a File from a scandir entry, reusing its cached type instead of a new stat."""
+        file = cls.__new__(cls)
+        file.path = Path(entry.path)
+        file._is_dir = entry.is_dir()
+        return file
+
     def _exists(self):
         if not self.path.exists():
             raise FileNotFoundError(f"File {self.path} does not exist.")
@@ -30,15 +108,90 @@ class File:
         if not self._is_dir and _is:
             raise IsADirectoryError(f"{self.path} is a directory.")
 
+    @metrics.instrumented("file.read", metrics.result_size)
     def read(self) -> str:
         self._exists()
         self._dir(False)
         return self.path.read_text(encoding="utf-8")
 
-    def write(self, content: str):
+    @metrics.instrumented("file.write", metrics.arg_size())
+    def write(self, content: str, fsync: bool = False):
         self._exists()
         self._dir(False)
-        self.path.write_text(content, encoding="utf-8")
+        with self.writer(fsync) as out:
+            out.write(content.encode("utf-8"))
+
+    def reader(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the file content as raw bytes, chunk_size bytes at a time.
+
+        :param chunk_size: Maximum size of each yielded chunk.
+        """
+        self._exists()
+        self._dir(False)
+        with self.path.open("rb") as handle:
+            read = metrics.wrap("file.read", handle.read, metrics.result_size)
+            while True:
+                chunk = read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    @contextmanager
+    def writer(self, fsync: bool = False) -> Iterator[BinaryIO]:
+        """
+        Open a buffered binary handle whose content atomically replaces this file once the
+        block exits.
+
+        The data goes to a temporary file in the same directory, which is moved over the
+        original with os.replace() only when the block completes without an exception.
+        A crash mid-write therefore leaves the original untouched. If this file is a
+        symlink, its target is replaced and the link stays as it is.
+
+        :param fsync: Flush the data to disk before the replace and the directory entry
+            after it, so the new content also survives a power loss.
+        """
+        import shutil
+        import tempfile
+        # os.replace() would swap the link itself for a regular file.
+        path = Path(os.path.realpath(self.path))
+        handle = tempfile.NamedTemporaryFile(
+            "wb", buffering=WRITE_BUFFER_SIZE, dir=path.parent,
+            prefix=f".{path.name}.", suffix=TEMP_SUFFIX, delete=False
+        )
+        try:
+            with handle:
+                yield handle
+                if fsync:
+                    handle.flush()
+                    metrics.wrap("file.fsync", os.fsync)(handle.fileno())
+            if path.exists():
+                shutil.copymode(path, handle.name)
+            os.replace(handle.name, path)
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+        if fsync:
+            _fsync_dir(str(path.parent))
+
+    @contextmanager
+    def map(self) -> Iterator[Union["mmap.mmap", bytearray]]:
+        """
+        Memory-map the file for in-place reading and writing.
+
+        Changes made through the map go straight to the page cache; nothing is copied into
+        Python objects. Unlike writer(), this is not atomic: an interrupted transform leaves
+        the file partly modified. An empty file cannot be mapped and yields an empty bytearray.
+        """
+        import mmap
+        self._exists()
+        self._dir(False)
+        with self.path.open("r+b") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                yield bytearray()
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_WRITE) as mapped:
+                yield mapped
 
     @property
     def dir(self):
@@ -48,11 +201,98 @@ class File:
             if item.is_file():
                 yield File(str(item))
 
-    def key_store(self,key:str):
-        """Store key in file"""
-        if not self.path.exists():
-            self.path.mkdir(parents=True)
+    def walk(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+             max_depth: Optional[int] = None, symlinks: str = "skip") -> Iterator["File"]:
+        """
+        Lazily yield the files below this directory, recursing into subdirectories.
+
+        Built on os.scandir, so the file/directory checks use the type information cached
+        on each DirEntry instead of a stat call per entry. Only one directory listing is
+        held in memory at a time.
+
+        Patterns without '/' are matched against the entry name. Patterns with '/' are
+        matched against the path relative to this directory, one segment at a time: '*'
+        and '?' do not cross a '/', and a '**' segment matches any number of directories
+        (also none), so 'a/*.txt' matches a/x.txt and 'a/**/*.txt' also a/b/c/x.txt.
+
+        Every file is yielded once, even if hard links or symlinks make it reachable under
+        several paths (it would otherwise be transformed twice). Symlinks are followed only
+        after the rest of the tree has been walked, so a file or directory inside the tree
+        is listed under its real path and one outside under the first link leading to it.
+
+        :param include: Only yield files matching one of these patterns.
+        :param exclude: Skip files and whole subdirectories matching one of these patterns.
+        :param max_depth: How many directory levels to descend; 0 only lists this directory,
+            None has no limit.
+        :param symlinks: "skip" ignores symlinks, "files" follows symlinked files but not
+            directories, "follow" follows both.
+        """
+        self._exists()
+        self._dir()
+        if symlinks not in SYMLINK_POLICIES:
+            raise ValueError(f"Unknown symlink policy '{symlinks}'. Choose one of: {', '.join(SYMLINK_POLICIES)}.")
+        include = list(include or ())
+        exclude = list(exclude or ())
+        # (st_dev, st_ino) of every yielded file and visited directory.
+        seen = set()
+        # Symlinks met on the way, followed once the real tree is done: (entry, rel, depth).
+        links = []
 
+        def tree(top: str, prefix: str, depth: int, dev: int) -> Iterator[File]:
+            stack = [(top, prefix, depth, dev)]
+            while stack:
+                top, prefix, depth, dev = stack.pop()
+                try:
+                    # Finish the listing before yielding: files get replaced while we go.
+                    with os.scandir(top) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                subdirs = []
+                for entry in entries:
+                    rel = prefix + entry.name
+                    if exclude and _matches(entry.name, rel, exclude):
+                        continue
+                    if entry.is_symlink():
+                        if symlinks == "follow" or (symlinks == "files" and not entry.is_dir()):
+                            links.append((entry, rel, depth))
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if max_depth is None or depth < max_depth:
+                            info = entry.stat(follow_symlinks=False)
+                            if (info.st_dev, info.st_ino) not in seen:
+                                seen.add((info.st_dev, info.st_ino))
+                                subdirs.append((entry.path, rel + "/", depth + 1, info.st_dev))
+                    elif entry.is_file(follow_symlinks=False):
+                        if entry.name.endswith(TEMP_SUFFIX):
+                            continue
+                        if include and not _matches(entry.name, rel, include):
+                            continue
+                        # Entries of one directory share its device; inode() needs no stat.
+                        if (dev, entry.inode()) in seen:
+                            continue
+                        seen.add((dev, entry.inode()))
+                        yield File.from_entry(entry)
+                stack.extend(reversed(subdirs))
 
-        current_time = datetime.now().strftime("%Y%m%d%H%M%S")
-        Path(self.path.resolve()).joinpath(f"key_{current_time}.{key_file_extension()}").write_text(key, encoding="utf-8")
+        root = os.stat(self.path)
+        seen.add((root.st_dev, root.st_ino))
+        yield from tree(str(self.path), "", 0, root.st_dev)
+        # Following a directory link can add more links to the list.
+        for entry, rel, depth in links:
+            try:
+                info = os.stat(entry.path)
+            except OSError:
+                # Dangling link.
+                continue
+            if (info.st_dev, info.st_ino) in seen:
+                continue
+            if stat.S_ISDIR(info.st_mode):
+                if symlinks == "follow" and (max_depth is None or depth < max_depth):
+                    seen.add((info.st_dev, info.st_ino))
+                    yield from tree(entry.path, rel + "/", depth + 1, info.st_dev)
+            elif stat.S_ISREG(info.st_mode):
+                if entry.name.endswith(TEMP_SUFFIX) or (include and not _matches(entry.name, rel, include)):
+                    continue
+                seen.add((info.st_dev, info.st_ino))
+                yield File.from_entry(entry)
@@ -1,16 +1,34 @@
-from numeracrypt.core.convert import ASCII
-from numeracrypt.core.file import File
-from dotenv import load_dotenv
-import random
+from numeracrypt.core.convert import ASCII, base91_encode
+from numeracrypt.core import config
+from typing import List
 import re
 import os
-# Get the directory where this file resides.
-base_dir = os.path.dirname(os.path.abspath(__file__))
-dotenv_path = os.path.join(base_dir, '.env')
-load_dotenv(dotenv_path)
+
+# Random bytes are mapped to decimal digits by translation tables: bytes below 250 (or 252
+# for the leading digit, which is never 0) become a digit, the rest are dropped, so every
+# digit is uniformly distributed.
+_DIGITS = bytes(48 + b % 10 for b in range(256))
+_DIGIT_REJECT = bytes(range(250, 256))
+_LEADING = bytes(49 + b % 9 for b in range(256))
+_LEADING_REJECT = bytes(range(252, 256))
+
+
+def random_digits(count: int, leading: bool = False) -> bytes:
+    """
+    Return `count` uniformly random ASCII decimal digits from the operating system's CSPRNG,
+    drawn in bulk (usually a single os.urandom() call).
+
+    :param leading: Draw digits 1-9 instead of 0-9.
+    """
+    table, reject = (_LEADING, _LEADING_REJECT) if leading else (_DIGITS, _DIGIT_REJECT)
+    out = bytearray()
+    while len(out) < count:
+        missing = count - len(out)
+        out += os.urandom(missing + missing // 32 + 16).translate(table, reject)
+    return bytes(out[:count])
 
 def key_store_location() -> str:
-    env_path = os.getenv("KEY_STORAGE_DIRECTORY")
+    env_path = config.get("KEY_STORAGE_DIRECTORY")
     if not env_path:
         # Warn the user and use the current working directory as a fallback.
         import typer
@@ -50,39 +68,52 @@ class Key:
         match = re.match(r'(\d+)/', text)
         return match.group(1) if match else None
 
-    def _random_num(self) -> int:
+    def _random_numbers(self, count: int) -> List[bytes]:
         """
-        Generates a random number of max_length digits and adds a salt-based offset.
-        The salt is processed by summing the ASCII values of its characters.
+        Generates random numbers of max_length digits, as ASCII digits, and adds a salt-based
+        offset. The salt is processed by summing the ASCII values of its characters.
         """
+        length = self.max_length
+        leading = random_digits(count, leading=True)
+        rest = random_digits(count * (length - 1))
+        numbers = [leading[i:i + 1] + rest[i * (length - 1):(i + 1) * (length - 1)] for i in range(count)]
         salt_value = sum(ord(char) for char in self.salt) if self.salt else 0
-        lower_bound = 10 ** (self.max_length - 1)
-        upper_bound = 10 ** self.max_length - 1
-        random_value = random.randint(lower_bound, upper_bound)
-        salted_random_number = random_value + salt_value
-        # Clamp the result to ensure it is still within the digit length.
-        return min(max(salted_random_number, lower_bound), upper_bound)
-
-    def _assemble_key(self, num: int) -> str:
+        if salt_value:
+            lower_bound = 10 ** (length - 1)
+            upper_bound = 10 ** length - 1
+            # Clamp the result to ensure it is still within the digit length.
+            numbers = [str(min(max(int(n) + salt_value, lower_bound), upper_bound)).encode("ascii") for n in numbers]
+        return numbers
+
+    def _assemble_key(self, num) -> str:
         """
-        Assembles the key using the rounds as prefix (with a slash) and the Base91-encoded number.
+        Assembles the key using the rounds as prefix (with a slash) and the Base91-encoded
+        decimal digits of the number (an int or its ASCII digits).
         """
-        prefix = str(self.rounds) + "/"
-        # Get the encoded key part from ASCII.
-        key_part = ASCII(num).encode_base91()
-        # Ensure key_part is a string (convert from bytes if needed)
-        if isinstance(key_part, bytes):
-            key_part = key_part.decode("utf-8")
-        return prefix + key_part
+        digits = num if isinstance(num, bytes) else str(num).encode("ascii")
+        return f"{self.rounds}/{base91_encode(digits)}"
 
     def generate(self) -> str:
         """
         Generates and a key.
         """
-        num = self._random_num()
-        self.value = self._assemble_key(num)
+        self.value = self._assemble_key(self._random_numbers(1)[0])
         return self.value
 
+    def generate_many(self, count: int) -> List[str]:
+        """
+        Generates `count` keys with the rounds, length and salt of this instance.
+        All randomness is drawn from the operating system's CSPRNG in bulk and every key is
+        assembled straight from its digits, so this is much faster than calling generate()
+        in a loop. The instance's own value is left unchanged.
+
+        :param count: Number of keys.
+        :return: The assembled keys.
+        """
+        if count < 0:
+            raise ValueError("Count must not be negative.")
+        return [self._assemble_key(num) for num in self._random_numbers(count)]
+
     def disassemble(self):
         """
         Disassembles the key into its Unicode-decoded number and the prefix (number of rounds).
@@ -110,17 +141,25 @@ class Key:
             return False
         return True
 
-    def safe(self,path:str = None):
-        """Safes the key to a file either using the provided path or the KEY_PATH environment variable."""
+    def safe(self, path: str = None, label: str = None) -> str:
+        """
+        Safes the key to the key store (see core.keystore) in the provided directory or the
+        KEY_STORAGE_DIRECTORY environment variable.
+
+        :param path: Directory of the key store.
+        :param label: Optional label stored with the key.
+        :return: The key's fingerprint.
+        """
+        from numeracrypt.core.keystore import KeyStore, default_store_path
+
         if not self.value:
             raise ValueError("No key value available to safe.")
 
         if not self.validate():
             raise ValueError("Invalid key format. Please use a valid key.")
 
-        if not path:
-            path = key_store_location()
-        File(path).key_store(self.value)
+        with KeyStore(default_store_path(path or None)) as store:
+            return store.add(self.value, label)
 
 
 
@@ -0,0 +1,112 @@
+from numeracrypt.core.key import Key
+from numeracrypt.core.schedule import KeySchedule
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+import threading
+
+# Default number of distinct keys kept compiled.
+DEFAULT_MAXSIZE = 128
+
+
+class CacheInfo(NamedTuple):
+    """Counters of a KeyCache: hits/misses count schedule lookups, validate_* count validate()."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    validate_hits: int
+    validate_misses: int
+
+
+class _Entry:
+    __slots__ = ("valid", "schedules")
+
+    def __init__(self) -> None:
+        self.valid: Optional[bool] = None
+        self.schedules: Dict[str, KeySchedule] = {}
+
+
+class KeyCache:
+    """
+    Thread-safe LRU cache of parsed and compiled keys, shared by all NumeraCrypt instances.
+
+    For every assembled key string it keeps the compiled KeySchedule (raw key bytes, rounds
+    and collapsed offset table) per backend, and the result of Key.validate(). Once a key is
+    cached, constructing NumeraCrypt with it does no parsing at all.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._validate_hits = 0
+        self._validate_misses = 0
+        self._evictions = 0
+
+    def _entry(self, key: str) -> _Entry:
+        # Must be called with the lock held.
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry()
+            while len(self._entries) > max(self.maxsize, 1):
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str, backend: str = "auto") -> KeySchedule:
+        """
+        Return the compiled schedule of a key, building it on the first request.
+
+        :param key: The assembled key string.
+        :param backend: Byte transform backend of the schedule.
+        :raises ValueError: If the key cannot be disassembled (such keys are not cached).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            schedule = entry.schedules.get(backend) if entry is not None else None
+            if schedule is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return schedule
+            self._misses += 1
+        # Compile outside the lock; a concurrent miss on the same key just builds it twice.
+        schedule = KeySchedule.from_key(Key(key), backend)
+        with self._lock:
+            return self._entry(key).schedules.setdefault(backend, schedule)
+
+    def validate(self, key: str) -> bool:
+        """Return Key(key).validate(), computed once per cached key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.valid is not None:
+                self._entries.move_to_end(key)
+                self._validate_hits += 1
+                return entry.valid
+            self._validate_misses += 1
+        valid = Key(key).validate()
+        with self._lock:
+            self._entry(key).valid = valid
+        return valid
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one key from the cache, or every key when none is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def info(self) -> CacheInfo:
+        """Return the schedule and validation hit/miss counters, evictions and the current size."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, len(self._entries), self.maxsize,
+                             self._validate_hits, self._validate_misses)
+
+
+# The cache used by NumeraCrypt and the CLI.
+key_cache = KeyCache()
@@ -0,0 +1,207 @@
+"""
+Indexed key store: one SQLite database per key directory instead of a file per key.
+
+Every key is stored under its fingerprint, a short hash of the assembled key, together with
+its rounds, the time it was added and an optional label. Containers written with
+fingerprint=True carry the fingerprint of their key in the header, so the key of such a file
+is found with one index lookup instead of trying every stored key.
+"""
+from numeracrypt.core.container import FLAG_FINGERPRINT, HEADER, is_container, parse_header
+from numeracrypt.core.key import Key, key_store_location
+from typing import Dict, Iterator, List, NamedTuple, Optional
+import hashlib
+import os
+import time
+
+# File name of the database inside the key storage directory.
+KEY_STORE_NAME = "numeracrypt-keys.db"
+# Bytes of the BLAKE2b digest used as fingerprint (shown as twice as many hex digits).
+FINGERPRINT_SIZE = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keys (
+    fingerprint TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    rounds INTEGER NOT NULL,
+    created REAL NOT NULL,
+    label TEXT
+);
+CREATE INDEX IF NOT EXISTS keys_label ON keys (label);
+"""
+
+
+class StoredKey(NamedTuple):
+    fingerprint: str
+    key: str
+    rounds: int
+    created: float
+    label: Optional[str]
+
+
+def fingerprint_bytes(key: str) -> bytes:
+    """Return the raw fingerprint of an assembled key."""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=FINGERPRINT_SIZE, person=b"numeracrypt-key").digest()
+
+
+def fingerprint(key: str) -> str:
+    """Return the fingerprint of an assembled key as a hex string."""
+    return fingerprint_bytes(key).hex()
+
+
+def file_fingerprint(path: str) -> Optional[str]:
+    """
+    Return the key fingerprint carried by a container file, or None if the file is not a
+    container or was written without one. Only the header is read.
+    """
+    with open(path, "rb") as handle:
+        data = handle.read(HEADER.size)
+    if not is_container(data):
+        return None
+    header = parse_header(data)
+    if not header.flags & FLAG_FINGERPRINT:
+        return None
+    return header.fingerprint[:FINGERPRINT_SIZE].hex()
+
+
+class KeyStore:
+    """
+    SQLite-backed key store, indexed by fingerprint.
+
+    The connection is opened on first use; worker processes receive the path and open their
+    own. Lookups are cached, so a directory of files sharing a few keys queries each key once.
+
+    Usage:
+        with KeyStore(path) as store:
+            fp = store.add(key, label="tenant-42")
+            key = store.key(file_fingerprint("report.nc"))
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._connection = None
+        self._cache: Dict[str, str] = {}
+
+    def __getstate__(self):
+        return {"path": self.path, "_connection": None, "_cache": {}}
+
+    def __enter__(self) -> "KeyStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            import sqlite3
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            # The database holds the keys themselves, so a new one is private to its owner
+            # (SQLite's journal files take the database's permissions).
+            umask = os.umask(0o177)
+            try:
+                self._connection = sqlite3.connect(self.path)
+                self._connection.executescript(_SCHEMA)
+            finally:
+                os.umask(umask)
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def add(self, key: str, label: Optional[str] = None) -> str:
+        """
+        Store a key; adding a key that is already stored only updates its label (if given).
+
+        :param key: The assembled key.
+        :param label: Free-form name, e.g. the tenant or data set the key belongs to.
+        :return: The key's fingerprint.
+        :raises ValueError: If the key is invalid.
+        """
+        return self.add_many([key], label)[0]
+
+    def add_many(self, keys: List[str], label: Optional[str] = None) -> List[str]:
+        """Store several keys in one transaction and return their fingerprints (see add())."""
+        rows = []
+        created = time.time()
+        for key in keys:
+            parsed = Key(key)
+            if not parsed.validate():
+                raise ValueError("Invalid key format. Please use a valid key.")
+            rows.append((fingerprint(key), key, int(parsed.extract_number_and_slash(key)), created, label))
+        with self.connection as db:
+            db.executemany(
+                "INSERT INTO keys (fingerprint, key, rounds, created, label) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (fingerprint) DO UPDATE SET label = COALESCE(excluded.label, label)",
+                rows,
+            )
+        return [row[0] for row in rows]
+
+    def get(self, fp: str) -> Optional[StoredKey]:
+        """Return the stored key with this fingerprint, or None."""
+        row = self.connection.execute(
+            "SELECT fingerprint, key, rounds, created, label FROM keys WHERE fingerprint = ?", (fp,)
+        ).fetchone()
+        return StoredKey(*row) if row else None
+
+    def key(self, fp: str) -> str:
+        """
+        Return the assembled key with this fingerprint.
+
+        :raises KeyError: If no such key is stored.
+        """
+        key = self._cache.get(fp)
+        if key is None:
+            stored = self.get(fp)
+            if stored is None:
+                raise KeyError(f"No key with fingerprint {fp} in {self.path}.")
+            key = self._cache[fp] = stored.key
+        return key
+
+    def find(self, label: str) -> List[StoredKey]:
+        """Return all keys with this label, oldest first."""
+        rows = self.connection.execute(
+            "SELECT fingerprint, key, rounds, created, label FROM keys WHERE label = ? ORDER BY created", (label,)
+        ).fetchall()
+        return [StoredKey(*row) for row in rows]
+
+    def remove(self, fp: str) -> bool:
+        """Delete a key; return whether it was stored."""
+        self._cache.pop(fp, None)
+        with self.connection as db:
+            return db.execute("DELETE FROM keys WHERE fingerprint = ?", (fp,)).rowcount > 0
+
+    def __iter__(self) -> Iterator[StoredKey]:
+        rows = self.connection.execute("SELECT fingerprint, key, rounds, created, label FROM keys ORDER BY created")
+        return (StoredKey(*row) for row in rows)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def __contains__(self, fp: str) -> bool:
+        return self.get(fp) is not None
+
+    def import_files(self, directory: str) -> List[str]:
+        """
+        Add the keys of the key_<timestamp> files written by earlier versions of Key.safe().
+
+        :return: The fingerprints of the imported keys.
+        """
+        keys = []
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            if entry.is_file() and entry.name.startswith("key_"):
+                with open(entry.path, "r", encoding="utf-8") as handle:
+                    key = handle.read().strip()
+                if Key(key).validate():
+                    keys.append(key)
+        return self.add_many(keys) if keys else []
+
+
+def default_store_path(directory: Optional[str] = None) -> str:
+    """The database in `directory`, by default the key storage directory (see key_store_location())."""
+    if directory is None:
+        directory = key_store_location()
+    return os.path.join(directory, KEY_STORE_NAME)
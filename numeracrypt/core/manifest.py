@@ -0,0 +1,140 @@
+from numeracrypt.core.file import File
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, TextIO, Tuple
+import hashlib
+import os
+
+# Name of the sidecar file kept in the root of a processed directory.
+MANIFEST_NAME = ".numeracrypt-manifest"
+MANIFEST_HEADER = "#numeracrypt-manifest 1\n"
+
+ENCRYPTED = "e"
+DECRYPTED = "d"
+# Already moved to the new key by a key rotation that has not finished yet.
+REKEYED = "k"
+# Returned by Manifest.check() for a file whose content differs from the recorded one.
+CHANGED = "changed"
+
+
+class ManifestEntry(NamedTuple):
+    """What the manifest remembers about one file after NumeraCrypt last wrote it."""
+    state: str
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def file_digest(path: str) -> str:
+    """Return a short BLAKE2b content hash of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in File(path).reader():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot(path: str, state: str) -> ManifestEntry:
+    """Describe the current content of `path` as being in `state`."""
+    info = os.stat(path)
+    return ManifestEntry(state, info.st_size, info.st_mtime_ns, file_digest(path))
+
+
+class Manifest:
+    """
+    Change manifest of a directory, used to skip files that are already in the wanted state.
+
+    The manifest is a text file with one tab-separated line per file:
+    state, size, mtime (ns), content hash and the path relative to the directory.
+    New entries are appended as soon as a file is done, so an interrupted run still knows
+    which files it already processed; later lines override earlier ones and save()
+    compacts the file. The file is only read on the first lookup.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_NAME
+        self._entries: Optional[Dict[str, ManifestEntry]] = None
+        self._journal: Optional[TextIO] = None
+
+    def __getstate__(self):
+        # Worker processes load their own copy on first use.
+        return {"directory": self.directory, "path": self.path, "_entries": None, "_journal": None}
+
+    @property
+    def entries(self) -> Dict[str, ManifestEntry]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, ManifestEntry]:
+        entries = {}
+        if not self.path.exists():
+            return entries
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                fields = line.rstrip("\n").split("\t")
+                # Skip the header and a line cut short by an interrupted append.
+                if len(fields) != 5 or not line.endswith("\n"):
+                    continue
+                state, size, mtime_ns, digest, rel = fields
+                entries[rel] = ManifestEntry(state, int(size), int(mtime_ns), digest)
+        return entries
+
+    def relative(self, path: str) -> str:
+        """Return the manifest key of a file below the directory."""
+        rel = Path(path).relative_to(self.directory).as_posix()
+        if "\t" in rel or "\n" in rel:
+            raise ValueError(f"Cannot track a path containing a tab or newline: {rel!r}")
+        return rel
+
+    def get(self, rel: str) -> Optional[ManifestEntry]:
+        return self.entries.get(rel)
+
+    def check(self, rel: str, path: str) -> Tuple[Optional[str], Optional[ManifestEntry]]:
+        """
+        Determine the state of a file from its manifest entry.
+
+        Size and mtime are compared first; the content is only hashed when they differ.
+
+        :return: (state, refreshed) where state is the recorded state, None for an unknown
+            file or CHANGED for modified content, and refreshed is a new entry when only
+            the metadata changed.
+        """
+        entry = self.get(rel)
+        if entry is None:
+            return None, None
+        info = os.stat(path)
+        if info.st_size == entry.size and info.st_mtime_ns == entry.mtime_ns:
+            return entry.state, None
+        digest = file_digest(path)
+        if digest == entry.digest:
+            return entry.state, ManifestEntry(entry.state, info.st_size, info.st_mtime_ns, digest)
+        return CHANGED, None
+
+    def record(self, rel: str, entry: ManifestEntry) -> None:
+        """Store an entry and append it to the manifest file right away."""
+        self.entries[rel] = entry
+        if self._journal is None:
+            new = not self.path.exists()
+            self._journal = self.path.open("a", encoding="utf-8")
+            if new:
+                self._journal.write(MANIFEST_HEADER)
+        self._journal.write(f"{entry.state}\t{entry.size}\t{entry.mtime_ns}\t{entry.digest}\t{rel}\n")
+        self._journal.flush()
+
+    def relabel(self, old: str, new: str) -> None:
+        """Change the state of every entry in state `old` to `new` (written by save())."""
+        for rel, entry in self.entries.items():
+            if entry.state == old:
+                self.entries[rel] = entry._replace(state=new)
+
+    def save(self) -> None:
+        """Rewrite the manifest with one line per file."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._entries is None:
+            return
+        lines = [MANIFEST_HEADER]
+        lines.extend(f"{e.state}\t{e.size}\t{e.mtime_ns}\t{e.digest}\t{rel}\n" for rel, e in self._entries.items())
+        with File(str(self.path)).writer() as out:
+            out.write("".join(lines).encode("utf-8"))
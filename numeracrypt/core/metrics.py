@@ -0,0 +1,192 @@
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+import threading
+import time
+
+# The Profile currently recording, if any. Instrumented functions only check this global,
+# so instrumentation costs one extra call and comparison while nothing is being recorded.
+_active: Optional["Profile"] = None
+
+
+def _tracemalloc():
+    # Imported on demand: only needed when allocations are traced.
+    import tracemalloc
+    return tracemalloc
+
+
+class StageEvent(NamedTuple):
+    """One timed call of an instrumented stage, as passed to a Profile callback."""
+    stage: str
+    seconds: float
+    nbytes: int
+    # Peak traced memory allocated during the call; None unless allocations are traced.
+    allocated: Optional[int]
+
+
+class StageStats:
+    """Totals of one stage over all recorded calls."""
+    __slots__ = ("calls", "seconds", "nbytes", "allocated")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.nbytes = 0
+        self.allocated: Optional[int] = None
+
+    @property
+    def mb_per_s(self) -> Optional[float]:
+        return self.nbytes / self.seconds / 1e6 if self.nbytes and self.seconds else None
+
+
+class Profile:
+    """
+    Records wall time, bytes processed and (optionally) allocations per stage of the
+    operations run while it is active.
+
+    Stages are "encrypt"/"decrypt"/"rekey" for whole NumeraCrypt operations, "rounds" for the
+    cipher transform, "encode"/"decode" for the output codec, "compress"/"decompress" for
+    the optional compression and "file.read", "file.write" and "file.fsync" for file I/O.
+    Stages nest: the time of an operation includes the time of the stages it ran.
+
+    Only the calling process is observed; directory runs with workers > 1 do their work
+    in other processes and only show up as whole operations.
+
+    Usage:
+        with Profile() as profile:
+            nc.encrypt()
+        print(profile.report())
+    """
+
+    def __init__(self, allocations: bool = False, callback: Optional[Callable[[StageEvent], None]] = None):
+        """
+        :param allocations: Trace allocations with tracemalloc and record the peak per stage.
+            This slows everything down considerably, so timings are less meaningful.
+        :param callback: Called with a StageEvent after every instrumented call.
+        """
+        self.allocations = allocations
+        self.callback = callback
+        self.stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        # Highest traced memory seen by the open stages, innermost last.
+        self._peaks: List[int] = []
+        self._previous: Optional[Profile] = None
+        self._started_tracing = False
+
+    def __enter__(self) -> "Profile":
+        global _active
+        if self.allocations and not _tracemalloc().is_tracing():
+            _tracemalloc().start()
+            self._started_tracing = True
+        self._previous, _active = _active, self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active
+        _active = self._previous
+        if self._started_tracing:
+            _tracemalloc().stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[List[int]]:
+        """
+        Time the block as one call of `name`. The block may append byte counts to the
+        yielded list.
+        """
+        nbytes: List[int] = []
+        if self.allocations:
+            tracemalloc = _tracemalloc()
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            self._peaks.append(base)
+        begin = time.perf_counter()
+        try:
+            yield nbytes
+        finally:
+            seconds = time.perf_counter() - begin
+            allocated = None
+            if self.allocations:
+                # reset_peak() of inner stages hides their peak from us, so they report it.
+                peak = max(tracemalloc.get_traced_memory()[1], self._peaks.pop())
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                allocated = max(peak - base, 0)
+            self.record(StageEvent(name, seconds, sum(nbytes), allocated))
+
+    def record(self, event: StageEvent) -> None:
+        """Add one stage call to the totals."""
+        with self._lock:
+            stats = self.stages.get(event.stage)
+            if stats is None:
+                stats = self.stages[event.stage] = StageStats()
+            stats.calls += 1
+            stats.seconds += event.seconds
+            stats.nbytes += event.nbytes
+            if event.allocated is not None:
+                stats.allocated = max(stats.allocated or 0, event.allocated)
+        if self.callback is not None:
+            self.callback(event)
+
+    def report(self) -> str:
+        """Return the recorded stages as a table, slowest first."""
+        lines = [f"{'stage':<12} {'calls':>8} {'seconds':>10} {'MB':>10} {'MB/s':>10} {'peak alloc':>12}"]
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].seconds):
+            rate = f"{stats.mb_per_s:10.1f}" if stats.mb_per_s is not None else f"{'-':>10}"
+            alloc = f"{stats.allocated / 1e6:9.2f} MB" if stats.allocated is not None else f"{'-':>12}"
+            lines.append(f"{name:<12} {stats.calls:>8} {stats.seconds:>10.4f} "
+                         f"{stats.nbytes / 1e6:>10.2f} {rate} {alloc}")
+        return "\n".join(lines)
+
+
+def active() -> Optional[Profile]:
+    """Return the Profile currently recording, or None."""
+    return _active
+
+
+def _no_size(args, result) -> int:
+    return 0
+
+
+def instrumented(name: str, size: Callable[[tuple, object], int] = _no_size):
+    """
+    Decorator recording every call of the function as stage `name` while a Profile is active.
+
+    :param name: The stage name.
+    :param size: Computes the bytes processed from the call's positional arguments and result.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _active
+            if profile is None:
+                return func(*args, **kwargs)
+            with profile.stage(name) as nbytes:
+                result = func(*args, **kwargs)
+                nbytes.append(size(args, result))
+            return result
+        return wrapper
+    return decorate
+
+
+def wrap(name: str, func: Callable, size: Callable[[tuple, object], int] = _no_size) -> Callable:
+    """
+    Return func instrumented as stage `name` if a Profile is active, else func itself.
+    For call sites inside loops, e.g. the read method of an open file.
+    """
+    if _active is None:
+        return func
+    return instrumented(name, size)(func)
+
+
+def arg_size(index: int = 1) -> Callable[[tuple, object], int]:
+    """Size function measuring positional argument `index` (1 = first argument after self)."""
+    def size(args, result) -> int:
+        data = args[index]
+        return len(data) if isinstance(data, str) else memoryview(data).nbytes
+    return size
+
+
+def result_size(args, result) -> int:
+    """Size of the returned data."""
+    return len(result)
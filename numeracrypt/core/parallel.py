@@ -0,0 +1,71 @@
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Iterable, Iterator, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    # concurrent.futures pulls in multiprocessing; it is imported only when workers > 1.
+    from concurrent.futures import Future
+
+# Number of queued tasks per worker; keeps workers busy without listing everything up front.
+QUEUE_DEPTH = 4
+
+# The per-file function of the current worker process, installed by _init_worker.
+_worker_func: Optional[Callable[[str], Any]] = None
+
+
+class FileResult(NamedTuple):
+    """Outcome of processing one file in directory mode."""
+    path: str
+    ok: bool
+    error: Optional[str] = None
+    skipped: bool = False
+    # Manifest entry describing the file after processing, if a manifest is in use.
+    entry: Optional[Any] = None
+
+
+def _run(func: Callable[[str], Any], path: str) -> FileResult:
+    try:
+        result = func(path)
+    except Exception as e:
+        return FileResult(path, False, f"{type(e).__name__}: {e}")
+    # func may describe its outcome itself, e.g. to report a skipped file.
+    return result if isinstance(result, FileResult) else FileResult(path, True)
+
+
+def _init_worker(func: Callable[[str], Any]) -> None:
+    global _worker_func
+    _worker_func = func
+
+
+def _run_in_worker(path: str) -> FileResult:
+    return _run(_worker_func, path)
+
+
+def process_files(func: Callable[[str], Any], paths: Iterable[str], workers: int = 1) -> Iterator[FileResult]:
+    """
+    Apply func to every path and yield one FileResult per path, in input order.
+    A failing file is reported instead of aborting the run.
+
+    With more than one worker the paths are dispatched to a process pool. func is pickled
+    once per worker process (not once per file), so a bound method carrying a compiled key
+    schedule is only shipped once. Paths are consumed lazily, with at most
+    workers * QUEUE_DEPTH of them in flight.
+
+    :param func: Callable taking a file path, optionally returning its own FileResult;
+        must be picklable when workers > 1.
+    :param paths: The files to process.
+    :param workers: Number of worker processes; 1 or less processes inline.
+    """
+    if workers <= 1:
+        for path in paths:
+            yield _run(func, path)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(func,)) as pool:
+        pending: Deque["Future"] = deque()
+        for path in paths:
+            pending.append(pool.submit(_run_in_worker, path))
+            if len(pending) >= workers * QUEUE_DEPTH:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,132 @@
+from numeracrypt.core.codec import SNIFF_SIZE, RawCodec, possible_encodings
+from numeracrypt.core.compress import HEADER_SIZE, METHOD_STORED, is_compressed
+from numeracrypt.core.container import ContainerReader, HEADER, is_container
+from numeracrypt.core.keycache import key_cache
+from numeracrypt.core.schedule import KeySchedule
+from typing import BinaryIO, Optional, Union
+import io
+import os
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+class NumeraCryptReader(io.RawIOBase):
+    """
+    Read-only, seekable file object returning the plain bytes of an encrypted file.
+
+    Works on raw-binary ciphertext (encoding="raw") and on containers (encoding="container",
+    detected by their header), but not on compressed data (see core.compress) or text
+    encodings; plain data in a stored envelope is read behind it. The offset of every byte only depends on its position
+    modulo the key period, so each read() decrypts just the requested window: raw files
+    are read at that position directly, containers through their chunk index.
+
+    Usage:
+        with NumeraCryptReader("dataset.bin", key) as reader:
+            reader.seek(10 * 2**30)
+            window = reader.read(4096)
+    """
+
+    def __init__(self, source: Source, key: Union[str, KeySchedule], backend: str = "auto"):
+        """
+        :param source: Path of the encrypted file, or a seekable binary handle (left open).
+        :param key: The assembled key, or a compiled KeySchedule.
+        :param backend: Byte transform backend when `key` is a string.
+        :raises ValueError: If the file is compressed or text-encoded.
+        """
+        super().__init__()
+        self.schedule = key if isinstance(key, KeySchedule) else key_cache.get(key, backend)
+        if isinstance(source, (str, os.PathLike)):
+            self._handle = open(source, "rb")
+            self._owns_handle = True
+        else:
+            self._handle = source
+            self._owns_handle = False
+        self._position = 0
+        # Ciphertext bytes before the plain data: the envelope of stored data.
+        self._skip = 0
+        self._container: Optional[ContainerReader] = None
+        try:
+            self._open()
+        except BaseException:
+            if self._owns_handle:
+                self._handle.close()
+            raise
+
+    def _open(self) -> None:
+        """Read the header or the size of the file and check that it can be read by position."""
+        self._handle.seek(0)
+        head = self._handle.read(SNIFF_SIZE)
+        if is_container(head[:HEADER.size]):
+            self._container = ContainerReader(self._handle)
+            self._size = self._container.size
+        else:
+            possible = possible_encodings(head)
+            if RawCodec.name not in possible:
+                raise ValueError(f"The file holds {' or '.join(sorted(possible))} text; only raw and "
+                                 f"container files can be read by position.")
+            self._size = self._handle.seek(0, io.SEEK_END)
+        plain = self.schedule.decrypt(self._cipher(0, HEADER_SIZE))
+        if is_compressed(plain):
+            if len(plain) < HEADER_SIZE or plain[-1] != METHOD_STORED:
+                raise ValueError("The file is compressed and can only be decrypted as a whole.")
+            self._skip = HEADER_SIZE
+            self._size -= HEADER_SIZE
+
+    @property
+    def size(self) -> int:
+        """Length of the plain data."""
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence}).")
+        if position < 0:
+            raise ValueError("Negative seek position.")
+        self._position = position
+        return position
+
+    def _cipher(self, start: int, length: int) -> bytes:
+        """Read `length` bytes of ciphertext from position `start` of the encrypted data."""
+        if self._container is not None:
+            return self._container.read_cipher(start, length)
+        self._handle.seek(start)
+        return self._handle.read(length)
+
+    def read(self, size: int = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        start = self._position
+        if size is None or size < 0:
+            size = max(self._size - start, 0)
+        buf = bytearray(self._cipher(self._skip + start, size))
+        self.schedule.decrypt_into(buf, self._skip + start)
+        self._position = start + len(buf)
+        return bytes(buf)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(memoryview(buffer).cast("B")))
+        memoryview(buffer).cast("B")[:len(data)] = data
+        return len(data)
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def close(self) -> None:
+        if not self.closed and self._owns_handle:
+            self._handle.close()
+        super().close()
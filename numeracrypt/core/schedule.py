@@ -0,0 +1,179 @@
+from numeracrypt.core.backend import get_backend
+from numeracrypt.core.key import Key
+from numeracrypt.core.metrics import arg_size, instrumented
+from typing import Dict, List, Sequence, Union
+import math
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def compute_offset(round_num: int, key: int) -> int:
+    """
+    Compute a pseudo-random offset from the round number and key.
+
+    Parameters:
+        round_num (int): The round number (0, 1, 2, ...).
+        key (int): The key (0-255).
+
+    Returns:
+        int: An offset value between 0 and 255.
+    """
+    # Multiplication and XOR, then mod 256 to ensure result is a byte.
+    return ((round_num * (2 * key + 1)) ^ (round_num + key)) % 256
+
+
+class KeySchedule:
+    """
+    Compiled form of a key.
+
+    Every round adds an offset that only depends on the round number and the key byte
+    at the current position, so all rounds together collapse into a single offset per
+    key position. The schedule stores that periodic offset table (one entry per key byte)
+    and applies it to a whole buffer in one pass.
+
+    Attributes:
+        key_raw (List[int]): The key bytes as returned by Key.disassemble().
+        rounds (int): The number of rounds the key encodes.
+        offsets (bytes): The collapsed offset for every key position.
+        period (int): The length of the offset table.
+        backend: The byte transform used to apply the table (see core.backend).
+    """
+
+    def __init__(self, key_raw: List[int], rounds: int, backend: str = "auto"):
+        if not key_raw:
+            raise ValueError("Key schedule requires at least one key byte.")
+        self.key_raw: List[int] = list(key_raw)
+        self.rounds: int = rounds
+        self._set_offsets(self.collapse(self.key_raw, rounds), backend)
+
+    def _set_offsets(self, offsets: bytes, backend: str) -> None:
+        self.offsets: bytes = bytes(offsets)
+        self.period: int = len(self.offsets)
+        self.inverse: bytes = bytes(-o & 0xFF for o in self.offsets)
+        self.backend = get_backend(backend)
+
+    @classmethod
+    def from_key(cls, key: Union[Key, str], backend: str = "auto") -> "KeySchedule":
+        """
+        Build a schedule from a Key instance or an assembled key string.
+        """
+        if isinstance(key, str):
+            key = Key(key)
+        key_raw, rounds = key.disassemble()
+        return cls(key_raw, rounds, backend)
+
+    @classmethod
+    def from_offsets(cls, offsets: BytesLike, backend: str = "auto") -> "KeySchedule":
+        """
+        Build a schedule that applies an arbitrary periodic offset table, e.g. one made by
+        rekey(). It has no key bytes and no rounds of its own.
+        """
+        if not offsets:
+            raise ValueError("Key schedule requires at least one offset.")
+        schedule = cls.__new__(cls)
+        schedule.key_raw = []
+        schedule.rounds = 0
+        schedule._set_offsets(offsets, backend)
+        return schedule
+
+    @staticmethod
+    def collapse(key_raw: List[int], rounds: int) -> bytes:
+        """
+        Sum the offsets of all rounds for every key byte.
+
+        :param key_raw: The key bytes.
+        :param rounds: The number of rounds.
+        :return: The collapsed offset table, one byte per key position.
+        """
+        # Keys only use a small alphabet, so compute each distinct byte once.
+        totals: Dict[int, int] = {}
+        for k in set(key_raw):
+            totals[k] = sum(compute_offset(r, k) for r in range(rounds)) % 256
+        return bytes(totals[k] for k in key_raw)
+
+    @instrumented("rounds", arg_size())
+    def encrypt_into(self, buf: BytesLike, start: int = 0) -> None:
+        """
+        Apply all rounds of encryption to a writable buffer in place.
+
+        :param buf: A writable byte buffer (bytearray, writable memoryview, mmap).
+        :param start: Absolute position of buf[0] within the whole message.
+        """
+        self.backend.transform(buf, self.offsets, start)
+
+    @instrumented("rounds", arg_size())
+    def decrypt_into(self, buf: BytesLike, start: int = 0) -> None:
+        """
+        Reverse all rounds of encryption on a writable buffer in place.
+
+        :param buf: A writable byte buffer (bytearray, writable memoryview, mmap).
+        :param start: Absolute position of buf[0] within the whole message.
+        """
+        self.backend.transform(buf, self.inverse, start)
+
+    @instrumented("rounds", arg_size())
+    def encrypt_packed(self, buf: bytearray, starts: Sequence[int]) -> None:
+        """
+        Encrypt several records packed into one buffer in place, each one from position 0.
+
+        :param buf: The packed records.
+        :param starts: Start index of every record in buf, ascending.
+        """
+        self.backend.transform_packed(buf, self.offsets, starts)
+
+    @instrumented("rounds", arg_size())
+    def decrypt_packed(self, buf: bytearray, starts: Sequence[int]) -> None:
+        """
+        Decrypt several records packed into one buffer in place, each one from position 0.
+
+        :param buf: The packed records.
+        :param starts: Start index of every record in buf, ascending.
+        """
+        self.backend.transform_packed(buf, self.inverse, starts)
+
+    def encrypt(self, data: BytesLike, start: int = 0) -> bytearray:
+        """
+        Apply all rounds of encryption to `data`.
+
+        :param data: The plain bytes.
+        :param start: Absolute position of data[0] within the whole message.
+        :return: The encrypted bytes.
+        """
+        out = bytearray(data)
+        self.encrypt_into(out, start)
+        return out
+
+    def decrypt(self, data: BytesLike, start: int = 0) -> bytearray:
+        """
+        Reverse all rounds of encryption on `data`.
+
+        :param data: The encrypted bytes.
+        :param start: Absolute position of data[0] within the whole message.
+        :return: The decrypted bytes.
+        """
+        out = bytearray(data)
+        self.decrypt_into(out, start)
+        return out
+
+
+def rekey(old_key: Union[KeySchedule, Key, str], new_key: Union[KeySchedule, Key, str],
+          backend: str = "auto") -> KeySchedule:
+    """
+    Combine two keys into one schedule that turns ciphertext of `old_key` directly into
+    ciphertext of `new_key`.
+
+    A byte at position i is encrypted as b + old[i % P_old] and b + new[i % P_new], so the
+    difference new - old repeats every lcm(P_old, P_new) positions. Applying that table with
+    encrypt_into() rotates the key in one pass, without ever producing the plain bytes.
+
+    :param old_key: The key the data is encrypted with (a string, Key or KeySchedule).
+    :param new_key: The key the data should end up encrypted with.
+    :param backend: Byte transform backend of the combined schedule.
+    :return: A schedule whose encrypt_into(buf, start) performs the rotation.
+    """
+    old, new = (k if isinstance(k, KeySchedule) else KeySchedule.from_key(k, backend) for k in (old_key, new_key))
+    period = old.period * new.period // math.gcd(old.period, new.period)
+    old_inverse = old.inverse * (period // old.period)
+    new_offsets = new.offsets * (period // new.period)
+    combined = bytes((a + b) & 0xFF for a, b in zip(new_offsets, old_inverse))
+    return KeySchedule.from_offsets(combined, backend)
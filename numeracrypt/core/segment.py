@@ -0,0 +1,187 @@
+"""
+Segmented engine: transforms one large buffer or raw-binary file with several workers.
+
+The offset of every byte only depends on its absolute position, so a file can be cut into
+independent ranges. Each range is transformed at its own position and written straight to
+the same position of the output, so the result is identical to a sequential pass.
+
+Range boundaries are multiples of SEGMENT_ALIGN, which is a multiple of the page size and
+of the mmap allocation granularity on all supported platforms, so every range can be
+mapped on its own. Workers are threads when the backend releases the GIL while it adds
+the offsets (NumPy), and processes otherwise (the Python backend holds it throughout).
+"""
+from numeracrypt.core.file import DEFAULT_CHUNK_SIZE, File
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+import os
+
+if TYPE_CHECKING:
+    from numeracrypt.core.schedule import KeySchedule
+
+# Boundaries of the ranges are multiples of this (64 KiB).
+SEGMENT_ALIGN = 1 << 16
+# Default length of one range. More ranges than workers keep all of them busy to the end.
+SEGMENT_SIZE = 16 << 20
+
+# An in-place transform, called as apply(buf, start): KeySchedule.encrypt_into or decrypt_into.
+Apply = Callable[[memoryview, int], None]
+
+# The transform of the current worker process, installed by _init_worker.
+_worker_apply: Optional[Apply] = None
+
+
+def segments(size: int, segment_size: int = SEGMENT_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split [0, size) into (start, end) ranges of about segment_size bytes, with every
+    boundary but the last a multiple of SEGMENT_ALIGN.
+    """
+    step = max(segment_size - segment_size % SEGMENT_ALIGN, SEGMENT_ALIGN)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def releases_gil(schedule: "KeySchedule") -> bool:
+    """Return whether the schedule's backend runs its transform without holding the GIL."""
+    # The auto backend switches to NumPy for buffers as long as a segment.
+    return schedule.backend.name in ("numpy", "auto")
+
+
+def _apply(schedule: "KeySchedule", encrypt: bool) -> Apply:
+    return schedule.encrypt_into if encrypt else schedule.decrypt_into
+
+
+def _init_worker(apply: Apply) -> None:
+    global _worker_apply
+    _worker_apply = apply
+
+
+def _transform_copy(data: bytes, start: int) -> bytearray:
+    buf = bytearray(data)
+    _worker_apply(buf, start)
+    return buf
+
+
+def _transform_range(apply: Apply, source: str, target: str, start: int, end: int, chunk_size: int) -> None:
+    """
+    Read [start, end) of `source`, transform it and write it to the same range of `target`,
+    chunk_size bytes at a time through one reused buffer. Every call opens its own handles,
+    so concurrent calls never share a file position.
+    """
+    buf = bytearray(min(chunk_size, end - start))
+    view = memoryview(buf)
+    with open(source, "rb", buffering=0) as src, open(target, "r+b", buffering=0) as dst:
+        position = start
+        while position < end:
+            src.seek(position)
+            count = src.readinto(view[:min(len(buf), end - position)])
+            if not count:
+                raise ValueError(f"{source} shrank while it was being processed.")
+            apply(view[:count], position)
+            dst.seek(position)
+            dst.write(view[:count])
+            position += count
+
+
+def _map_range(apply: Apply, path: str, start: int, end: int, chunk_size: int, flush: bool) -> None:
+    """Transform [start, end) of `path` in place through a map of just that range."""
+    import mmap
+    with open(path, "r+b") as handle:
+        with mmap.mmap(handle.fileno(), end - start, offset=start, access=mmap.ACCESS_WRITE) as mapped, \
+                memoryview(mapped) as view:
+            for begin in range(0, len(view), chunk_size):
+                apply(view[begin:begin + chunk_size], start + begin)
+            if flush:
+                mapped.flush()
+
+
+def _range_in_worker(func: Callable, *args) -> None:
+    func(_worker_apply, *args)
+
+
+def _run_ranges(schedule: "KeySchedule", apply: Apply, workers: int, tasks: List[tuple]) -> None:
+    """Run tasks of the form (func, *args) as func(apply, *args), concurrently if workers > 1."""
+    if workers <= 1 or len(tasks) <= 1:
+        for func, *args in tasks:
+            func(apply, *args)
+        return
+    pool, processes = _executor(schedule, apply, workers)
+    with pool:
+        if processes:
+            futures = [pool.submit(_range_in_worker, *task) for task in tasks]
+        else:
+            futures = [pool.submit(task[0], apply, *task[1:]) for task in tasks]
+        for future in futures:
+            future.result()
+
+
+def _executor(schedule: "KeySchedule", apply: Apply, workers: int):
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    if releases_gil(schedule):
+        return ThreadPoolExecutor(max_workers=workers), False
+    # apply (a bound method carrying the schedule) is shipped once per process.
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(apply,)), True
+
+
+def transform_buffer(schedule: "KeySchedule", buf: memoryview, encrypt: bool = True, start: int = 0,
+                     workers: int = 1, segment_size: int = SEGMENT_SIZE) -> None:
+    """
+    Encrypt or decrypt a writable buffer in place, one range per task.
+
+    Threads work on views of the buffer directly; worker processes receive a copy of their
+    range and send back the result, which is then copied into place.
+
+    :param schedule: The key schedule; its backend picks threads or processes.
+    :param buf: A writable, flat byte buffer.
+    :param encrypt: Encrypt, or decrypt.
+    :param start: Absolute position of buf[0] within the whole message.
+    :param workers: Number of threads or processes; buffers of one range run inline.
+    :param segment_size: Length of a range.
+    """
+    apply = _apply(schedule, encrypt)
+    ranges = segments(len(buf), segment_size)
+    if workers <= 1 or len(ranges) <= 1:
+        apply(buf, start)
+        return
+    pool, processes = _executor(schedule, apply, workers)
+    with pool:
+        if processes:
+            futures = [(begin, end, pool.submit(_transform_copy, bytes(buf[begin:end]), start + begin))
+                       for begin, end in ranges]
+            for begin, end, future in futures:
+                buf[begin:end] = future.result()
+        else:
+            futures = [pool.submit(apply, buf[begin:end], start + begin) for begin, end in ranges]
+            for future in futures:
+                future.result()
+
+
+def transform_file(schedule: "KeySchedule", path: str, encrypt: bool = True, workers: int = 1,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, segment_size: int = SEGMENT_SIZE,
+                   in_place: bool = False, fsync: bool = False) -> None:
+    """
+    Encrypt or decrypt a raw-binary file, one range per task.
+
+    By default the ranges are written to a temporary file of the same size that atomically
+    replaces the original once all of them are done (see File.writer()). With in_place=True
+    every task maps its own range of the file and transforms it there, which writes nothing
+    twice but is not atomic.
+
+    :param schedule: The key schedule; its backend picks threads or processes.
+    :param path: The file.
+    :param encrypt: Encrypt, or decrypt.
+    :param workers: Number of threads or processes.
+    :param chunk_size: Bytes transformed at a time within a range.
+    :param segment_size: Length of a range.
+    :param in_place: Transform the file through memory maps instead of writing a new file.
+    :param fsync: Flush the data to disk before returning.
+    """
+    apply = _apply(schedule, encrypt)
+    size = os.path.getsize(path)
+    ranges = segments(size, segment_size)
+    if in_place:
+        _run_ranges(schedule, apply, workers, [(_map_range, path, begin, end, chunk_size, fsync)
+                                               for begin, end in ranges])
+        return
+    with File(path).writer(fsync) as out:
+        out.truncate(size)
+        out.flush()
+        _run_ranges(schedule, apply, workers, [(_transform_range, path, out.name, begin, end, chunk_size)
+                                               for begin, end in ranges])
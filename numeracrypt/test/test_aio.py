@@ -0,0 +1,90 @@
+"""
+Asyncio facade: results equal those of the synchronous API, whether payloads are
+processed inline or on the executor, and streams may be sync or async iterables.
+"""
+import asyncio
+import random
+
+import pytest
+
+from numeracrypt.core.aio import AsyncNumeraCrypt
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.container import is_container
+from numeracrypt.core.key import Key
+
+KEY = Key("asyncio", 6).generate()
+CHUNK_SIZE = 4096
+DATA = random.Random(11).randbytes(5 * CHUNK_SIZE + 17)
+TEXT = b"compressible asyncio payload\n" * 2000
+
+
+def _chunked(data: bytes, size: int = 1000):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+async def _async_chunks(chunks):
+    for chunk in chunks:
+        await asyncio.sleep(0)
+        yield chunk
+
+
+async def _collect(pieces) -> bytes:
+    return b"".join([piece async for piece in pieces])
+
+
+@pytest.mark.parametrize("inline_threshold", [1 << 20, 0])
+def test_payloads_match_sync_api(inline_threshold):
+    nc = NumeraCrypt("", KEY)
+
+    async def run():
+        async with AsyncNumeraCrypt(KEY, inline_threshold=inline_threshold) as anc:
+            token = await anc.encrypt("payload text")
+            assert token == nc.encrypt_text("payload text")
+            assert await anc.decrypt(token) == "payload text"
+            cipher = await anc.encrypt(DATA)
+            assert cipher == nc.encrypt_bytes(DATA)
+            assert await anc.decrypt(cipher) == DATA
+            results = await asyncio.gather(*(anc.encrypt(DATA[i:]) for i in range(5)))
+            assert results == [nc.encrypt_bytes(DATA[i:]) for i in range(5)]
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("encoding", ["base91", "base64", "raw", "container"])
+@pytest.mark.parametrize("inline_threshold", [1 << 20, 0])
+def test_streams_match_sync_api(encoding, inline_threshold):
+    nc = NumeraCrypt("", KEY, encoding=encoding, chunk_size=CHUNK_SIZE)
+    expected = b"".join(nc.encrypt_stream(_chunked(DATA)))
+
+    async def run():
+        async with AsyncNumeraCrypt(KEY, encoding=encoding, chunk_size=CHUNK_SIZE,
+                                    inline_threshold=inline_threshold) as anc:
+            assert await _collect(anc.encrypt_iter(_async_chunks(_chunked(DATA)))) == expected
+            assert await _collect(anc.decrypt_iter(_chunked(expected, 777))) == DATA
+            if encoding != "container":
+                assert await _collect(anc.decrypt_iter([])) == b""
+
+    asyncio.run(run())
+
+
+def test_decrypt_iter_detects_container():
+    container = b"".join(NumeraCrypt("", KEY, encoding="container").encrypt_stream(_chunked(DATA)))
+    assert is_container(container)
+
+    async def run():
+        async with AsyncNumeraCrypt(KEY, encoding="base91") as anc:
+            # Chunks smaller than the magic number, so the header arrives in pieces.
+            return await _collect(anc.decrypt_iter(_async_chunks(_chunked(container, 3))))
+
+    assert asyncio.run(run()) == DATA
+
+
+def test_compression():
+    async def run():
+        async with AsyncNumeraCrypt(KEY, compression="zlib", inline_threshold=0) as anc:
+            cipher = await _collect(anc.encrypt_iter(_chunked(TEXT)))
+            assert cipher == b"".join(NumeraCrypt("", KEY, compression="zlib").encrypt_stream(_chunked(TEXT)))
+            assert len(cipher) < len(TEXT)
+            assert await _collect(anc.decrypt_iter(_chunked(cipher))) == TEXT
+
+    asyncio.run(run())
@@ -0,0 +1,75 @@
+"""
+Backend parity: the NumPy backend must produce exactly the bytes of the Python backend,
+for any buffer length and start offset, whether a message is transformed whole or in
+chunks, and for packed records.
+"""
+import random
+
+import pytest
+
+from numeracrypt.core.backend import SHORT_BUFFER_PERIODS
+from numeracrypt.core.key import Key
+from numeracrypt.core.schedule import KeySchedule, compute_offset
+
+pytest.importorskip("numpy")
+
+KEY = Key("backends", 7).generate()
+PYTHON = KeySchedule.from_key(KEY, "python")
+NUMPY = KeySchedule.from_key(KEY, "numpy")
+PERIOD = PYTHON.period
+DATA = random.Random(2).randbytes(20 * PERIOD * SHORT_BUFFER_PERIODS + 13)
+
+SIZES = (0, 1, PERIOD - 1, PERIOD, PERIOD + 1, SHORT_BUFFER_PERIODS * PERIOD - 1,
+         SHORT_BUFFER_PERIODS * PERIOD, SHORT_BUFFER_PERIODS * PERIOD + 1, len(DATA))
+STARTS = (0, 1, PERIOD - 1, PERIOD, 3 * PERIOD + 5, 10 ** 9 + 7)
+
+
+def _reference(data: bytes, start: int) -> bytes:
+    # The per-round definition the schedule collapses.
+    key_raw, rounds = PYTHON.key_raw, PYTHON.rounds
+    out = bytearray()
+    for i, b in enumerate(data, start):
+        for r in range(rounds):
+            b = (b + compute_offset(r, key_raw[i % len(key_raw)])) % 256
+        out.append(b)
+    return bytes(out)
+
+
+def test_whole_buffers_match():
+    for size in SIZES:
+        for start in STARTS:
+            data = DATA[:size]
+            expected = PYTHON.encrypt(data, start)
+            assert NUMPY.encrypt(data, start) == expected
+            assert NUMPY.decrypt(expected, start) == data
+            assert PYTHON.decrypt(expected, start) == data
+    assert PYTHON.encrypt(DATA[:300], 5) == _reference(DATA[:300], 5)
+
+
+def test_chunks_match_whole():
+    expected = PYTHON.encrypt(DATA)
+    rng = random.Random(3)
+    for schedule in (PYTHON, NUMPY):
+        buf = bytearray(DATA)
+        view = memoryview(buf)
+        position = 0
+        while position < len(buf):
+            # Chunk ends fall anywhere within the key period.
+            size = rng.choice((1, PERIOD - 1, PERIOD + 3, 1000, 4096))
+            schedule.encrypt_into(view[position:position + size], position)
+            position += size
+        assert buf == expected
+
+
+def test_packed_records_match():
+    rng = random.Random(4)
+    records = [DATA[:rng.choice(SIZES[:-1])] for _ in range(50)]
+    starts, buf = [], bytearray()
+    for record in records:
+        starts.append(len(buf))
+        buf += record
+    packed = {}
+    for schedule in (PYTHON, NUMPY):
+        packed[schedule] = bytearray(buf)
+        schedule.encrypt_packed(packed[schedule], starts)
+    assert packed[PYTHON] == packed[NUMPY] == b"".join(PYTHON.encrypt(r) for r in records)
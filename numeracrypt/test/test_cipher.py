@@ -0,0 +1,145 @@
+"""
+Cipher compatibility: content encrypted before the rounds were compiled into a key
+schedule must still decrypt, and new ciphertext must be identical to the old. Key
+rotation must give the same result as decrypting and encrypting again, and a file in
+another format than the one asked for is refused instead of being overwritten.
+
+The vectors were produced with the per-round implementation of the first release.
+"""
+import pytest
+
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.key import Key
+from numeracrypt.core.manifest import ENCRYPTED, Manifest
+
+LEGACY = [
+    (
+        "5/3texAk$G;IB.OCcRn!^axn2o$J5+hN|Qd%`E4i>Gh2U***FT4tQbUo>GFKq@jv*T<4;a^hJBwJo/XvG",
+        "Hello, World!",
+        ")Jm4nrIT**P!9)0)pKr[dpjC",
+    ),
+    (
+        "12/H)R.[h+GQJp/Z[AS@4Ib;m)G81G?Ek{QRzlEvnKuAJ:(|jlT=4YbBk1X817=}YbR/4),vnWurID?_YG",
+        "The quick brown fox jumps over the lazy dog. " * 3,
+        "l6ltbP>/5%K1T[0)iK;[)E9}#OED:;$)<5Xxcv%2}4tEFq8)RbP!!|3L?,3enB9Lm8IR|W+oNIHumEh)%M!n??^N4<"
+        "_331r)m0L:$u/U}cO~xICpZeEYFilTP,/.*P8)VHHNo+uMYc>C^cFe.I7[aCF^Vi#D_d%1OJakd]_2Q4[EFq662I?x"
+        "dv=UU.tE|0ZCSQ$nS?ISZ/`+<TlQOv=Ilv6DCTrCG<;)p@T3<sQV?Bw",
+    ),
+]
+
+
+def test_legacy_ciphertext_decrypts():
+    for key, plain, cipher in LEGACY:
+        assert NumeraCrypt(cipher, key).decrypt() == plain
+
+
+def test_ciphertext_matches_legacy():
+    for key, plain, cipher in LEGACY:
+        assert NumeraCrypt(plain, key).encrypt() == cipher
+
+
+def test_round_trip():
+    key = Key("round-trip", 9).generate()
+    for plain in ("", "a", "Ünïcödé text", "x" * 10000):
+        cipher = NumeraCrypt(plain, key).encrypt()
+        assert NumeraCrypt(cipher, key).decrypt() == plain
+
+
+REKEY_OLD = Key("rotate-old", 6).generate()
+REKEY_NEW = Key("rotate-new", 11).generate()
+
+
+def _reencrypt_file(path: str, **options) -> None:
+    NumeraCrypt(path, REKEY_OLD, file=True, **options).decrypt()
+    NumeraCrypt(path, REKEY_NEW, file=True, **options).encrypt()
+
+
+def test_rekey_content_matches_decrypt_encrypt():
+    for plain in ("", "rotate me", "Ünïcödé " * 500):
+        cipher = NumeraCrypt(plain, REKEY_OLD).encrypt()
+        expected = NumeraCrypt(NumeraCrypt(cipher, REKEY_OLD).decrypt(), REKEY_NEW).encrypt()
+        assert NumeraCrypt(cipher, REKEY_OLD).rekey(REKEY_NEW) == expected
+
+
+@pytest.mark.parametrize("options", [
+    dict(),
+    dict(stream=True),
+    dict(stream=True, encoding="base64"),
+    dict(stream=True, encoding="raw"),
+    dict(stream=True, encoding="container", chunk_size=4096),
+    dict(encoding="raw", mmap=True, chunk_size=4096),
+])
+def test_rekey_file_matches_decrypt_encrypt(tmp_path, options):
+    plain = bytes(range(32, 127)) * 200 if not options else bytes(range(256)) * 100
+    rotated, expected = str(tmp_path / "rotated"), str(tmp_path / "expected")
+    for path in (rotated, expected):
+        with open(path, "wb") as handle:
+            handle.write(plain)
+        NumeraCrypt(path, REKEY_OLD, file=True, **options).encrypt()
+
+    NumeraCrypt(rotated, REKEY_OLD, file=True, **options).rekey(REKEY_NEW)
+    _reencrypt_file(expected, **options)
+    with open(rotated, "rb") as a, open(expected, "rb") as b:
+        assert a.read() == b.read()
+
+    NumeraCrypt(rotated, REKEY_NEW, file=True, **options).decrypt()
+    with open(rotated, "rb") as handle:
+        assert handle.read() == plain
+
+
+def test_rekey_directory_matches_decrypt_encrypt(tmp_path):
+    files = {"a.txt": b"first file " * 300, "b.bin": bytes(range(256)) * 40, "sub/c.txt": b""}
+    trees = (tmp_path / "rotated", tmp_path / "expected")
+    for tree in trees:
+        for name, content in files.items():
+            (tree / name).parent.mkdir(parents=True, exist_ok=True)
+            (tree / name).write_bytes(content)
+        NumeraCrypt(str(tree), REKEY_OLD, dir=True, stream=True, manifest=True).encrypt()
+
+    results = NumeraCrypt(str(trees[0]), REKEY_OLD, dir=True, stream=True, manifest=True).rekey(REKEY_NEW)
+    assert len(results) == len(files) and all(r.ok for r in results)
+    NumeraCrypt(str(trees[1]), REKEY_OLD, dir=True, stream=True).decrypt()
+    NumeraCrypt(str(trees[1]), REKEY_NEW, dir=True, stream=True).encrypt()
+    for name in files:
+        assert (trees[0] / name).read_bytes() == (trees[1] / name).read_bytes()
+
+    NumeraCrypt(str(trees[0]), REKEY_NEW, dir=True, stream=True, manifest=True).decrypt()
+    for name, content in files.items():
+        assert (trees[0] / name).read_bytes() == content
+
+
+FORMATS = {
+    "legacy": dict(),
+    "base91": dict(stream=True),
+    "base64": dict(stream=True, encoding="base64"),
+    "raw": dict(stream=True, encoding="raw"),
+}
+
+
+@pytest.mark.parametrize("written", FORMATS)
+@pytest.mark.parametrize("read", FORMATS)
+def test_other_format_is_rejected(tmp_path, written, read):
+    plain = b"plain text that is long enough to tell the formats apart " * 20
+    path = tmp_path / "data.txt"
+    path.write_bytes(plain)
+    NumeraCrypt(str(path), REKEY_OLD, file=True, **FORMATS[written]).encrypt()
+    cipher = path.read_bytes()
+    if read == written:
+        NumeraCrypt(str(path), REKEY_OLD, file=True, **FORMATS[read]).decrypt()
+        assert path.read_bytes() == plain
+        return
+    with pytest.raises(ValueError):
+        NumeraCrypt(str(path), REKEY_OLD, file=True, **FORMATS[read]).decrypt()
+    with pytest.raises(ValueError):
+        NumeraCrypt(str(path), REKEY_OLD, file=True, **FORMATS[read]).rekey(REKEY_NEW)
+    assert path.read_bytes() == cipher
+
+
+def test_other_format_is_not_recorded_in_manifest(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"legacy text file content " * 20)
+    NumeraCrypt(str(tmp_path), REKEY_OLD, dir=True, manifest=True).encrypt()
+    cipher = (tmp_path / "a.txt").read_bytes()
+    results = NumeraCrypt(str(tmp_path), REKEY_OLD, dir=True, stream=True, manifest=True).decrypt()
+    assert [r.ok for r in results] == [False]
+    assert (tmp_path / "a.txt").read_bytes() == cipher
+    assert Manifest(str(tmp_path)).get("a.txt").state == ENCRYPTED
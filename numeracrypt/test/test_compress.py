@@ -0,0 +1,141 @@
+"""
+Compression: every method and level round-trips, incompressible data is left alone, and
+plain data that starts with the signature survives every encrypt/decrypt path.
+"""
+import os
+import random
+
+import pytest
+
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.compress import (
+    AUTO_SKIP_RATIO, HEADER_SIZE, METHOD_STORED, METHODS, SAMPLE_SIZE, SIGNATURE,
+    Compressor, Decompressor, compress, decompress, is_compressed,
+)
+from numeracrypt.core.key import Key
+from numeracrypt.core.reader import NumeraCryptReader
+
+KEY = Key("compress", 7).generate()
+CHUNK_SIZE = 4096
+
+TEXT = b"".join(b"line %d of a very repetitive log file\n" % i for i in range(5000))
+NOISE = random.Random(5).randbytes(3 * SAMPLE_SIZE)
+# Plain data that looks like a compression envelope.
+LOOKALIKE = SIGNATURE + bytes([METHODS["zlib"]]) + NOISE[:20000]
+
+
+def _chunked(data: bytes, size: int = 777):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _compress_chunked(data: bytes, method, level=None) -> bytes:
+    compressor = Compressor(method, level)
+    return b"".join(compressor.update(chunk) for chunk in _chunked(data)) + compressor.finish()
+
+
+def _decompress_chunked(data: bytes) -> bytes:
+    decompressor = Decompressor()
+    return b"".join(decompressor.update(chunk) for chunk in _chunked(data)) + decompressor.finish()
+
+
+@pytest.mark.parametrize("method, level", [
+    ("zlib", None), ("zlib", 1), ("zlib", 9),
+    ("lzma", None), ("lzma", 0), ("lzma", 6),
+    ("bz2", None), ("bz2", 1),
+])
+def test_round_trip(method, level):
+    packed = compress(TEXT, method, level)
+    assert packed[:HEADER_SIZE] == SIGNATURE + bytes([METHODS[method]])
+    assert len(packed) < len(TEXT) * AUTO_SKIP_RATIO
+    assert decompress(packed) == TEXT
+    assert _compress_chunked(TEXT, method, level) == packed
+    assert _decompress_chunked(packed) == TEXT
+
+    nc = NumeraCrypt("", KEY, compression=method, compression_level=level)
+    cipher = b"".join(nc.encrypt_stream(_chunked(TEXT)))
+    assert b"".join(nc.decrypt_stream(_chunked(cipher))) == TEXT
+    text = TEXT.decode("latin-1")
+    assert nc.decrypt_text(nc.encrypt_text(text)) == text
+
+
+def test_incompressible_data_is_left_alone():
+    for method in METHODS:
+        assert compress(NOISE, method) == NOISE
+        assert _compress_chunked(NOISE, method) == NOISE
+    # Short inputs are judged on all of their bytes.
+    assert compress(NOISE[:100], "zlib") == NOISE[:100]
+    assert is_compressed(compress(TEXT[:100], "zlib"))
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        Compressor("zip")
+    with pytest.raises(ValueError, match="Unsupported"):
+        decompress(SIGNATURE + b"\x7f" + b"payload")
+
+
+def test_lookalike_gets_stored_envelope():
+    for method in (None, *METHODS):
+        packed = compress(LOOKALIKE, method)
+        if method is None:
+            assert packed[:HEADER_SIZE] == SIGNATURE + bytes([METHOD_STORED])
+        assert decompress(packed) == LOOKALIKE
+        assert _decompress_chunked(_compress_chunked(LOOKALIKE, method)) == LOOKALIKE
+    assert compress(TEXT) is TEXT
+
+
+@pytest.mark.parametrize("options", [
+    dict(stream=True),
+    dict(stream=True, encoding="raw"),
+    dict(stream=True, encoding="container", chunk_size=CHUNK_SIZE),
+    dict(encoding="raw", mmap=True, chunk_size=CHUNK_SIZE),
+    dict(stream=True, encoding="raw", workers=2, chunk_size=CHUNK_SIZE),
+    dict(encoding="raw", mmap=True, workers=2, chunk_size=CHUNK_SIZE),
+])
+def test_lookalike_file_round_trip(tmp_path, options):
+    plain = LOOKALIKE
+    path = tmp_path / "data.bin"
+    path.write_bytes(plain)
+    NumeraCrypt(str(path), KEY, file=True, **options).encrypt()
+    if options.get("encoding") in ("raw", "container"):
+        with NumeraCryptReader(str(path), KEY) as reader:
+            assert reader.size == len(plain)
+            reader.seek(5000)
+            assert reader.read(100) == plain[5000:5100]
+    NumeraCrypt(str(path), KEY, file=True, **options).decrypt()
+    assert path.read_bytes() == plain
+
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "data.bin").write_bytes(plain)
+    NumeraCrypt(str(tmp_path / "dir"), KEY, dir=True, **options).encrypt()
+    NumeraCrypt(str(tmp_path / "dir"), KEY, dir=True, **options).decrypt()
+    assert (tmp_path / "dir" / "data.bin").read_bytes() == plain
+
+
+def test_lookalike_in_memory_round_trip():
+    nc = NumeraCrypt("", KEY)
+    cipher = b"".join(nc.encrypt_stream(_chunked(LOOKALIKE)))
+    assert b"".join(nc.decrypt_stream(_chunked(cipher))) == LOOKALIKE
+
+    text = LOOKALIKE.decode("latin-1")
+    assert nc.decrypt_text(nc.encrypt_text(text)) == text
+    for pack in (False, True):
+        records = list(nc.encrypt_many([text, LOOKALIKE], pack=pack))
+        assert list(nc.decrypt_many(records, pack=pack)) == [text, LOOKALIKE]
+
+    # encrypt_bytes() keeps the length and never adds an envelope.
+    cipher = nc.encrypt_bytes(LOOKALIKE)
+    assert len(cipher) == len(LOOKALIKE)
+    assert nc.decrypt_bytes(bytes(cipher)) == LOOKALIKE
+    assert nc.decrypt_range(bytes(cipher), 3, 50) == LOOKALIKE[3:53]
+
+
+def test_compressed_file_cannot_be_read_by_range(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_bytes(TEXT)
+    NumeraCrypt(str(path), KEY, file=True, stream=True, encoding="raw", compression="zlib").encrypt()
+    assert os.path.getsize(path) < len(TEXT)
+    with pytest.raises(ValueError, match="compressed"):
+        NumeraCrypt("", KEY).decrypt_range(str(path), 0, 10)
+    NumeraCrypt(str(path), KEY, file=True, encoding="raw", mmap=True).decrypt()
+    assert path.read_bytes() == TEXT
@@ -0,0 +1,115 @@
+"""
+Container format: round trips in memory and on disk, and rejection of damaged containers
+and wrong keys before anything is written.
+"""
+import io
+import random
+
+import pytest
+
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.container import FRAME, HEADER, ContainerReader, is_container
+from numeracrypt.core.key import Key
+
+CHUNK_SIZE = 4096
+
+KEY = Key("container", 7).generate()
+OTHER_KEY = Key("container", 9).generate()
+
+
+def _data(size: int = 3 * CHUNK_SIZE + 123) -> bytes:
+    rng = random.Random(19)
+    return bytes(rng.getrandbits(8) for _ in range(size))
+
+
+def _encrypt(data: bytes, key: str = KEY) -> bytes:
+    nc = NumeraCrypt("", key, encoding="container", chunk_size=CHUNK_SIZE)
+    return b"".join(nc.encrypt_stream([data[:1000], data[1000:]]))
+
+
+def _decrypt(container: bytes, key: str = KEY, encoding: str = "container") -> bytes:
+    nc = NumeraCrypt("", key, encoding=encoding, chunk_size=CHUNK_SIZE)
+    return b"".join(nc.decrypt_stream([container[i:i + 777] for i in range(0, len(container), 777)]))
+
+
+def _encrypted_file(tmp_path, data: bytes) -> str:
+    path = str(tmp_path / "data.bin")
+    with open(path, "wb") as handle:
+        handle.write(data)
+    NumeraCrypt(path, KEY, file=True, stream=True, encoding="container", chunk_size=CHUNK_SIZE).encrypt()
+    return path
+
+
+def test_round_trip_in_memory():
+    for data in (b"", b"x", _data()):
+        container = _encrypt(data)
+        assert is_container(container)
+        assert _decrypt(container) == data
+
+
+def test_payload_is_raw_ciphertext():
+    data = _data()
+    raw = bytes(NumeraCrypt("", KEY).encrypt_bytes(data))
+    reader = ContainerReader(io.BytesIO(_encrypt(data)))
+    reader.verify()
+    assert reader.size == len(data)
+    assert reader.read_cipher(0, len(data)) == raw
+    assert reader.read_cipher(5000, 100) == raw[5000:5100]
+
+
+def test_round_trip_file(tmp_path):
+    data = _data()
+    path = _encrypted_file(tmp_path, data)
+    with open(path, "rb") as handle:
+        assert is_container(handle.read(HEADER.size))
+    NumeraCrypt(path, KEY, file=True, stream=True, encoding="container", chunk_size=CHUNK_SIZE).decrypt()
+    with open(path, "rb") as handle:
+        assert handle.read() == data
+
+
+def test_bad_checksum_is_rejected(tmp_path):
+    container = bytearray(_encrypt(_data()))
+    container[HEADER.size + FRAME.size + 10] ^= 0x01
+    with pytest.raises(ValueError, match="checksum"):
+        _decrypt(bytes(container))
+    with pytest.raises(ValueError, match="checksum"):
+        ContainerReader(io.BytesIO(bytes(container))).verify()
+
+    path = str(tmp_path / "damaged.bin")
+    with open(path, "wb") as handle:
+        handle.write(container)
+    with pytest.raises(ValueError, match="checksum"):
+        NumeraCrypt(path, KEY, file=True, stream=True, encoding="container").decrypt()
+    with open(path, "rb") as handle:
+        assert handle.read() == container
+
+
+def test_wrong_key_is_rejected(tmp_path):
+    data = _data()
+    with pytest.raises(ValueError, match="different key"):
+        _decrypt(_encrypt(data), OTHER_KEY)
+
+    path = _encrypted_file(tmp_path, data)
+    with open(path, "rb") as handle:
+        before = handle.read()
+    with pytest.raises(ValueError, match="different key"):
+        NumeraCrypt(path, OTHER_KEY, file=True, stream=True, encoding="container").decrypt()
+    with open(path, "rb") as handle:
+        assert handle.read() == before
+
+
+@pytest.mark.parametrize("options", [
+    dict(encoding="base91"),
+    dict(encoding="base91", stream=True),
+    dict(encoding="base64", stream=True),
+    dict(encoding="raw", stream=True),
+    dict(encoding="raw", mmap=True),
+    dict(encoding="raw", stream=True, workers=2),
+])
+def test_other_encoding_still_reads_container(tmp_path, options):
+    data = _data()
+    path = _encrypted_file(tmp_path, data)
+    NumeraCrypt(path, KEY, file=True, **options).decrypt()
+    with open(path, "rb") as handle:
+        assert handle.read() == data
+    assert _decrypt(_encrypt(data), encoding=options["encoding"]) == data
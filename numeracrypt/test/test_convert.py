@@ -0,0 +1,79 @@
+"""
+Base91 codec: the table-driven encoder and decoder must produce exactly the text of the
+`base91` package they replaced, whether the data is fed whole or in chunks.
+
+The expected texts were produced with base91.encode().
+"""
+import hashlib
+import random
+
+from numeracrypt.core.convert import Base91Decoder, Base91Encoder, base91_decode, base91_encode
+
+VECTORS = [
+    (b"", ""),
+    (b"a", "GB"),
+    (b"test", "fPNKd"),
+    (b"Hello, World!", ">OwJh>}AQ;r@@Y?F"),
+    (b"\x00" * 20, "AAAAAAAAAAAAAAAAAAAAAAA"),
+    (b"\xff" * 7, 'B"B"B"B"P'),
+    (bytes(range(256)),
+     ':C#(:C?hVB$MSiVEwndBAMZRxwFfBB;IW<}YQV!A_v$Y_c%zr4cYQPFl0,@heMAJ<:N[*T+/SFGr*`b4PD}vgY'
+     'qU>cW0P*1NwV,O{cQ5u0m900[8@n4,wh?DP<2+~jQSW6nmLm1o.J,?jTs%2<WF%qb=oh|}.C+W`EI!bv"XJ5K'
+     'IV<G+aX]c[z$8)@aR67gb7p(`r4kHjOraEr8:A8y0G9KsDm7jpa{fh>hT8%;@!9;s>JX?#GT<W+vbf`A2a^wk'
+     'FZCr<:V$}SR##&<^lr<Jn?_K5qh.JyLp+99&B_6vZ&x[uhn}L@sh3}g__~#'),
+]
+
+# 5000 seeded random bytes: length and SHA-256 of their encoding.
+BLOB_TEXT_LENGTH = 6149
+BLOB_TEXT_SHA256 = "c66d76ed9ff948d8c63908f1a4fa721934185e6c621da465af4cbc07d7c36a79"
+
+CHUNK_SIZES = (1, 2, 3, 4, 5, 7, 13, 64, 4097)
+
+
+def _blob() -> bytes:
+    rng = random.Random(91)
+    return bytes(rng.getrandbits(8) for _ in range(5000))
+
+
+def _encode_chunked(data: bytes, size: int) -> bytes:
+    encoder = Base91Encoder()
+    out = b"".join(encoder.update(data[i:i + size]) for i in range(0, len(data), size))
+    return out + encoder.finish()
+
+
+def _decode_chunked(text: bytes, size: int) -> bytes:
+    decoder = Base91Decoder()
+    out = b"".join(decoder.update(text[i:i + size]) for i in range(0, len(text), size))
+    return out + decoder.finish()
+
+
+def test_known_vectors():
+    for data, text in VECTORS:
+        assert base91_encode(data) == text
+        assert base91_decode(text) == data
+
+
+def test_known_digest():
+    text = base91_encode(_blob())
+    assert len(text) == BLOB_TEXT_LENGTH
+    assert hashlib.sha256(text.encode("ascii")).hexdigest() == BLOB_TEXT_SHA256
+
+
+def test_chunked_matches_whole():
+    data = _blob()
+    text = base91_encode(data).encode("ascii")
+    for size in CHUNK_SIZES:
+        assert _encode_chunked(data, size) == text
+        assert _decode_chunked(text, size) == data
+    for data, expected in VECTORS:
+        for size in (1, 3):
+            assert _encode_chunked(data, size).decode("ascii") == expected
+            assert _decode_chunked(expected.encode("ascii"), size) == data
+
+
+def test_decoder_skips_foreign_characters():
+    data = _blob()
+    text = base91_encode(data)
+    wrapped = "\n".join(text[i:i + 76] for i in range(0, len(text), 76)) + " \t\r\n"
+    assert base91_decode(wrapped) == data
+    assert _decode_chunked(wrapped.encode("ascii"), 5) == data
@@ -0,0 +1,77 @@
+"""
+File layer: atomic writes and the directory walker.
+"""
+import os
+
+import pytest
+
+from numeracrypt.core.file import TEMP_SUFFIX, File
+
+
+def test_writer_replaces_atomically(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    with File(str(path)).writer() as out:
+        out.write(b"new")
+    assert path.read_bytes() == b"new"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(TEMP_SUFFIX)]
+
+
+def test_writer_keeps_original_on_error(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"old")
+    with pytest.raises(RuntimeError):
+        with File(str(path)).writer() as out:
+            out.write(b"partial")
+            raise RuntimeError
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["data.txt"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_writer_replaces_symlink_target(tmp_path):
+    (tmp_path / "outside").mkdir()
+    target = tmp_path / "outside" / "real.txt"
+    target.write_bytes(b"plain")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+    with File(str(link)).writer() as out:
+        out.write(b"cipher")
+    assert link.is_symlink()
+    assert target.read_bytes() == b"cipher"
+
+
+def _names(directory, **options) -> list:
+    return sorted(os.path.relpath(f.path, directory) for f in File(str(directory)).walk(**options))
+
+
+def test_walk_patterns_match_segments(tmp_path):
+    for rel in ("top.txt", "a/x.txt", "a/b/y.txt", "a/b/c/deep.txt", "a/skip.log"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(b"x")
+    assert _names(tmp_path, include=["*.txt"]) == ["a/b/c/deep.txt", "a/b/y.txt", "a/x.txt", "top.txt"]
+    assert _names(tmp_path, include=["a/*.txt"]) == ["a/x.txt"]
+    assert _names(tmp_path, include=["a/**/*.txt"]) == ["a/b/c/deep.txt", "a/b/y.txt", "a/x.txt"]
+    assert _names(tmp_path, include=["**/c/*"]) == ["a/b/c/deep.txt"]
+    assert _names(tmp_path, exclude=["a/b"]) == ["a/skip.log", "a/x.txt", "top.txt"]
+    assert _names(tmp_path, max_depth=1) == ["a/skip.log", "a/x.txt", "top.txt"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_walk_yields_each_file_once(tmp_path):
+    root = tmp_path / "root"
+    (root / "real").mkdir(parents=True)
+    (root / "real" / "f.txt").write_bytes(b"x")
+    (root / "a_link").symlink_to(root / "real", target_is_directory=True)
+    (root / "file_link.txt").symlink_to(root / "real" / "f.txt")
+    (root / "hard.txt").write_bytes(b"y")
+    os.link(root / "hard.txt", root / "real" / "hard_copy.txt")
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside" / "o.txt").write_bytes(b"z")
+    (root / "out_link").symlink_to(tmp_path / "outside", target_is_directory=True)
+
+    assert _names(root) == ["hard.txt", "real/f.txt"]
+    assert _names(root, symlinks="files") == ["hard.txt", "real/f.txt"]
+    assert _names(root, symlinks="follow") == ["hard.txt", "out_link/o.txt", "real/f.txt"]
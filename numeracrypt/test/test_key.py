@@ -0,0 +1,72 @@
+"""
+Key generation: the digits come uniformly from the CSPRNG, bulk generation yields valid,
+distinct keys, and `numeracrypt key --count/--out` writes them.
+"""
+import os
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+from numeracrypt.core.convert import base91_decode
+from numeracrypt.core.key import Key, random_digits
+from numeracrypt.core.keycache import key_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Chi-square with 9 (8) degrees of freedom; exceeded by chance with p < 1e-6.
+CHI2_LIMIT = {10: 45.0, 9: 42.0}
+
+
+def _chi2(counts: Counter, symbols: bytes) -> float:
+    expected = sum(counts.values()) / len(symbols)
+    return sum((counts[s] - expected) ** 2 / expected for s in symbols)
+
+
+def test_random_digits_range_and_uniformity():
+    assert random_digits(0) == b""
+    digits = random_digits(200000)
+    assert len(digits) == 200000 and set(digits) <= set(b"0123456789")
+    assert _chi2(Counter(digits), b"0123456789") < CHI2_LIMIT[10]
+
+    leading = random_digits(100000, leading=True)
+    assert len(leading) == 100000 and set(leading) <= set(b"123456789")
+    assert _chi2(Counter(leading), b"123456789") < CHI2_LIMIT[9]
+
+
+@pytest.mark.parametrize("salt, rounds, length", [("", 5, 64), ("", 8, 64), ("salt", 9, 100)])
+def test_generate_many(salt, rounds, length):
+    generator = Key(salt, rounds, length)
+    keys = generator.generate_many(200)
+    assert len(keys) == len(set(keys)) == 200
+    assert generator.value == ""
+    for key in keys:
+        assert key.startswith(f"{rounds}/")
+        digits = bytes(base91_decode(key.split("/", 1)[1]))
+        assert len(digits) == length and digits.isdigit() and digits[:1] != b"0"
+        assert key_cache.validate(key)
+    assert generator.generate_many(0) == []
+    with pytest.raises(ValueError):
+        generator.generate_many(-1)
+    assert key_cache.validate(generator.generate())
+
+
+def _cli(*args, check=True):
+    env = dict(os.environ, NUMERACRYPT_DAEMON="0")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    return subprocess.run([sys.executable, "-m", "numeracrypt.cli", "key", *args], env=env,
+                          capture_output=True, text=True, check=check)
+
+
+def test_cli_count_and_out(tmp_path):
+    printed = _cli("--count", "3").stdout.splitlines()
+    assert len(printed) == 3 and all(key_cache.validate(k) for k in printed)
+
+    out = tmp_path / "keys.txt"
+    _cli("--count", "50", "--rounds", "6", "--out", str(out))
+    keys = out.read_text(encoding="utf-8").splitlines()
+    assert len(keys) == len(set(keys)) == 50
+    assert all(k.startswith("6/") and key_cache.validate(k) for k in keys)
+
+    assert _cli("--count", "0", check=False).returncode == 1
@@ -0,0 +1,37 @@
+"""
+Key cache: schedule lookups and validate() calls are counted separately, so the hit rate
+of compiled schedules is not inflated by validation.
+"""
+from numeracrypt.core.key import Key
+from numeracrypt.core.keycache import KeyCache
+
+KEYS = [Key("keycache", 6).generate() for _ in range(3)]
+
+
+def test_validate_and_get_counted_separately():
+    cache = KeyCache(maxsize=2)
+    key = KEYS[0]
+    assert cache.validate(key) and cache.validate(key)
+    info = cache.info()
+    assert (info.hits, info.misses) == (0, 0)
+    assert (info.validate_hits, info.validate_misses) == (1, 1)
+
+    # A validated key has no schedule yet: the first get() is a miss.
+    schedule = cache.get(key, "python")
+    assert cache.get(key, "python") is schedule
+    info = cache.info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert (info.validate_hits, info.validate_misses) == (1, 1)
+    assert info.size == 1
+
+
+def test_evictions():
+    cache = KeyCache(maxsize=2)
+    for key in KEYS:
+        cache.get(key, "python")
+    info = cache.info()
+    assert (info.misses, info.evictions, info.size, info.maxsize) == (3, 1, 2, 2)
+    cache.get(KEYS[0], "python")
+    assert cache.info().misses == 4
+    cache.invalidate()
+    assert cache.info().size == 0
@@ -0,0 +1,113 @@
+"""
+Key store: fingerprints, storing and looking up keys, importing old key files, and
+decrypting fingerprinted containers with their stored key (also through the CLI).
+"""
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.key import Key
+from numeracrypt.core.keystore import (
+    FINGERPRINT_SIZE, KeyStore, default_store_path, file_fingerprint, fingerprint, fingerprint_bytes,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+KEY = Key("keystore", 6).generate()
+OTHER_KEY = Key("keystore-other", 8).generate()
+
+
+def _encrypt_file(path, key: str, **options) -> bytes:
+    plain = b"fingerprinted " * 500
+    path.write_bytes(plain)
+    NumeraCrypt(str(path), key, file=True, stream=True, encoding="container", **options).encrypt()
+    return plain
+
+
+def test_fingerprint():
+    fp = fingerprint(KEY)
+    assert fp == fingerprint(KEY) == fingerprint_bytes(KEY).hex()
+    assert len(fp) == 2 * FINGERPRINT_SIZE
+    assert fp != fingerprint(OTHER_KEY)
+
+
+def test_add_and_lookup(tmp_path):
+    with KeyStore(default_store_path(str(tmp_path))) as store:
+        fp = store.add(KEY, label="tenant")
+        assert fp == fingerprint(KEY)
+        assert store.key(fp) == KEY
+        stored = store.get(fp)
+        assert (stored.key, stored.rounds, stored.label) == (KEY, 6, "tenant")
+        # Adding again keeps the key and only updates a given label.
+        assert store.add(KEY) == fp
+        assert store.get(fp).label == "tenant"
+        store.add(OTHER_KEY, label="tenant")
+        assert [s.key for s in store.find("tenant")] == [KEY, OTHER_KEY]
+        assert len(store) == 2 and fp in store
+
+        assert store.remove(fp) and not store.remove(fp)
+        assert fp not in store
+        with pytest.raises(KeyError):
+            store.key(fp)
+        with pytest.raises(ValueError):
+            store.add("not a key")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_database_is_private(tmp_path):
+    path = default_store_path(str(tmp_path / "keys"))
+    with KeyStore(path) as store:
+        store.add(KEY)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_import_files(tmp_path):
+    (tmp_path / "key_20240101120000.nkey").write_text(KEY + "\n", encoding="utf-8")
+    (tmp_path / "key_20240102120000.nkey").write_text(OTHER_KEY, encoding="utf-8")
+    (tmp_path / "key_broken.nkey").write_text("garbage", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text(KEY, encoding="utf-8")
+    with KeyStore(str(tmp_path / "store" / "keys.db")) as store:
+        assert store.import_files(str(tmp_path)) == [fingerprint(KEY), fingerprint(OTHER_KEY)]
+        assert len(store) == 2
+
+
+def test_file_fingerprint(tmp_path):
+    _encrypt_file(tmp_path / "with.bin", KEY, fingerprint=True)
+    _encrypt_file(tmp_path / "without.bin", KEY)
+    (tmp_path / "plain.txt").write_bytes(b"not a container")
+    assert file_fingerprint(str(tmp_path / "with.bin")) == fingerprint(KEY)
+    assert file_fingerprint(str(tmp_path / "without.bin")) is None
+    assert file_fingerprint(str(tmp_path / "plain.txt")) is None
+
+
+def test_decrypt_directory_with_key_store(tmp_path):
+    files = {"a.bin": KEY, "b.bin": OTHER_KEY}
+    plain = {name: _encrypt_file(tmp_path / name, key, fingerprint=True) for name, key in files.items()}
+    with KeyStore(str(tmp_path / "keys.db")) as store:
+        store.add_many([KEY, OTHER_KEY])
+        results = NumeraCrypt(str(tmp_path), "", dir=True, stream=True, encoding="container",
+                              exclude=["keys.db"], key_store=store).decrypt()
+    assert all(r.ok for r in results)
+    for name in files:
+        assert (tmp_path / name).read_bytes() == plain[name]
+
+
+def test_cli_decrypt_with_key_store(tmp_path):
+    store_dir = tmp_path / "keys"
+    with KeyStore(default_store_path(str(store_dir))) as store:
+        store.add(KEY)
+    path = tmp_path / "data.bin"
+    plain = _encrypt_file(path, KEY, fingerprint=True)
+    env = dict(os.environ, KEY_STORAGE_DIRECTORY=str(store_dir), NUMERACRYPT_DAEMON="0")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+
+    out = subprocess.run([sys.executable, "-m", "numeracrypt.cli", "keys", "--file", str(path)],
+                         env=env, capture_output=True, text=True, check=True).stdout
+    assert fingerprint(KEY) in out
+    subprocess.run([sys.executable, "-m", "numeracrypt.cli", "decrypt", "--file", str(path), "--key-store"],
+                   env=env, capture_output=True, check=True)
+    assert path.read_bytes() == plain
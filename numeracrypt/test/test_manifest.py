@@ -0,0 +1,93 @@
+"""
+Directory manifest: a repeated --dir run skips files already in the wanted state, never
+encrypts a file twice, and picks up files that changed since the last run.
+"""
+import os
+
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.key import Key
+from numeracrypt.core.manifest import CHANGED, DECRYPTED, ENCRYPTED, MANIFEST_NAME, Manifest, snapshot
+
+KEY = Key("manifest", 6).generate()
+FILES = {"a.txt": b"first file " * 100, "b.txt": b"second file " * 100, "sub/c.txt": b"third file " * 100}
+
+
+def _tree(tmp_path):
+    for name, content in FILES.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_bytes(content)
+
+
+def _run(tmp_path, encrypt: bool):
+    nc = NumeraCrypt(str(tmp_path), KEY, dir=True, stream=True, manifest=True)
+    results = nc.encrypt() if encrypt else nc.decrypt()
+    assert all(r.ok for r in results)
+    return {os.path.relpath(r.path, tmp_path).replace(os.sep, "/") for r in results if not r.skipped}
+
+
+def _contents(tmp_path):
+    return {name: (tmp_path / name).read_bytes() for name in FILES}
+
+
+def test_second_run_skips_done_files(tmp_path):
+    _tree(tmp_path)
+    assert _run(tmp_path, True) == set(FILES)
+    encrypted = _contents(tmp_path)
+    assert _run(tmp_path, True) == set()
+    assert _contents(tmp_path) == encrypted
+    manifest = Manifest(str(tmp_path))
+    assert {rel: e.state for rel, e in manifest.entries.items()} == dict.fromkeys(FILES, ENCRYPTED)
+
+    assert _run(tmp_path, False) == set(FILES)
+    assert _run(tmp_path, False) == set()
+    assert _contents(tmp_path) == FILES
+    assert MANIFEST_NAME not in Manifest(str(tmp_path)).entries
+
+
+def test_changed_files_are_picked_up(tmp_path):
+    _tree(tmp_path)
+    _run(tmp_path, True)
+    # New plaintext in place of an encrypted file.
+    (tmp_path / "a.txt").write_bytes(b"rewritten " * 100)
+    assert Manifest(str(tmp_path)).check("a.txt", str(tmp_path / "a.txt"))[0] == CHANGED
+
+    # Decrypting leaves the changed file alone instead of garbling it.
+    assert _run(tmp_path, False) == {"b.txt", "sub/c.txt"}
+    assert (tmp_path / "a.txt").read_bytes() == b"rewritten " * 100
+
+    # Encrypting picks up the changed file and a new one, and only those.
+    _run(tmp_path, True)
+    (tmp_path / "a.txt").write_bytes(b"rewritten " * 100)
+    (tmp_path / "d.txt").write_bytes(b"new file " * 100)
+    assert _run(tmp_path, True) == {"a.txt", "d.txt"}
+    assert _run(tmp_path, False) == {"a.txt", "b.txt", "sub/c.txt", "d.txt"}
+    assert (tmp_path / "a.txt").read_bytes() == b"rewritten " * 100
+    assert (tmp_path / "d.txt").read_bytes() == b"new file " * 100
+
+
+def test_touched_file_is_not_processed_again(tmp_path):
+    _tree(tmp_path)
+    _run(tmp_path, True)
+    encrypted = _contents(tmp_path)
+    # Same content, new mtime: the hash shows nothing changed.
+    os.utime(tmp_path / "a.txt", ns=(0, 0))
+    assert _run(tmp_path, True) == set()
+    assert _contents(tmp_path) == encrypted
+    assert Manifest(str(tmp_path)).get("a.txt").mtime_ns == 0
+
+
+def test_interrupted_run_resumes(tmp_path):
+    _tree(tmp_path)
+    # An earlier run encrypted a.txt and recorded it, then stopped before save().
+    NumeraCrypt(str(tmp_path / "a.txt"), KEY, file=True, stream=True).encrypt()
+    manifest = Manifest(str(tmp_path))
+    manifest.record("a.txt", snapshot(str(tmp_path / "a.txt"), ENCRYPTED))
+    manifest._journal.write("e\t12\t")
+    manifest._journal.close()
+    encrypted_a = (tmp_path / "a.txt").read_bytes()
+
+    assert _run(tmp_path, True) == {"b.txt", "sub/c.txt"}
+    assert (tmp_path / "a.txt").read_bytes() == encrypted_a
+    assert _run(tmp_path, False) == set(FILES)
+    assert _contents(tmp_path) == FILES
+    assert Manifest(str(tmp_path)).get("a.txt").state == DECRYPTED
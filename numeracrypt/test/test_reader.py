@@ -0,0 +1,96 @@
+"""
+Random access: NumeraCryptReader and decrypt_range() must return exactly the plain bytes
+at any offset, also across chunk and container frame boundaries, and refuse files whose
+bytes do not line up with the plain data (compressed or text-encoded ones).
+"""
+import io
+import random
+
+import pytest
+
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.key import Key
+from numeracrypt.core.reader import NumeraCryptReader
+
+KEY = Key("reader", 8).generate()
+CHUNK_SIZE = 4096
+DATA = random.Random(20).randbytes(7 * CHUNK_SIZE + 99)
+
+
+def _encrypted_file(tmp_path, **options) -> str:
+    path = str(tmp_path / "data.bin")
+    with open(path, "wb") as handle:
+        handle.write(DATA)
+    NumeraCrypt(path, KEY, file=True, stream=True, chunk_size=CHUNK_SIZE, **options).encrypt()
+    return path
+
+
+def _ranges():
+    rng = random.Random(21)
+    ranges = [(rng.randrange(len(DATA)), rng.randrange(3 * CHUNK_SIZE)) for _ in range(100)]
+    # Around chunk and frame boundaries, at the end and past it.
+    ranges += [(CHUNK_SIZE * i - 5, 10) for i in range(1, 8)]
+    ranges += [(CHUNK_SIZE - 1, 2 * CHUNK_SIZE + 2), (0, len(DATA)), (len(DATA) - 3, 10), (len(DATA) + 5, 10)]
+    return ranges
+
+
+@pytest.mark.parametrize("encoding", ["raw", "container"])
+def test_random_ranges(tmp_path, encoding):
+    path = _encrypted_file(tmp_path, encoding=encoding)
+    nc = NumeraCrypt("", KEY)
+    with NumeraCryptReader(path, KEY) as reader:
+        assert reader.size == len(DATA)
+        for start, length in _ranges():
+            reader.seek(start)
+            assert reader.read(length) == DATA[start:start + length]
+            assert reader.tell() == start + len(DATA[start:start + length])
+            assert nc.decrypt_range(path, start, length) == DATA[start:start + length]
+    with open(path, "rb") as handle:
+        assert nc.decrypt_range(handle, 5000, 100) == DATA[5000:5100]
+        assert not handle.closed
+
+
+def test_file_object_interface(tmp_path):
+    path = _encrypted_file(tmp_path, encoding="container")
+    with NumeraCryptReader(path, KEY) as reader:
+        assert reader.seek(-10, io.SEEK_END) == len(DATA) - 10
+        assert reader.read() == DATA[-10:]
+        reader.seek(100)
+        assert reader.seek(50, io.SEEK_CUR) == 150
+        buf = bytearray(CHUNK_SIZE)
+        assert reader.readinto(buf) == CHUNK_SIZE and buf == DATA[150:150 + CHUNK_SIZE]
+        reader.seek(0)
+        assert io.BufferedReader(reader).read() == DATA
+        with pytest.raises(ValueError):
+            reader.seek(-1)
+
+
+def test_buffer_ranges():
+    nc = NumeraCrypt("", KEY)
+    cipher = bytes(nc.encrypt_bytes(DATA))
+    for start, length in _ranges():
+        assert nc.decrypt_range(cipher, start, length) == DATA[start:start + length]
+    with pytest.raises(ValueError):
+        nc.decrypt_range(cipher, -1, 10)
+
+
+@pytest.mark.parametrize("encoding", ["base91", "base64"])
+def test_text_encodings_are_rejected(tmp_path, encoding):
+    path = _encrypted_file(tmp_path, encoding=encoding)
+    nc = NumeraCrypt("", KEY, encoding=encoding)
+    with pytest.raises(ValueError, match="text"):
+        NumeraCryptReader(path, KEY)
+    with pytest.raises(ValueError, match="text"):
+        nc.decrypt_range(path, 0, 10)
+    with open(path, "rb") as handle:
+        with pytest.raises(ValueError, match="raw"):
+            nc.decrypt_range(handle.read(), 0, 10)
+
+
+def test_compressed_file_is_rejected(tmp_path):
+    path = str(tmp_path / "log.txt")
+    with open(path, "wb") as handle:
+        handle.write(b"compressible line\n" * 5000)
+    NumeraCrypt(path, KEY, file=True, stream=True, encoding="container", compression="zlib").encrypt()
+    with pytest.raises(ValueError, match="compressed"):
+        NumeraCryptReader(path, KEY)
@@ -0,0 +1,72 @@
+"""
+Segmented engine: splitting a buffer or file across threads or processes must give
+exactly the bytes of a sequential pass, whatever the chunk size.
+"""
+import random
+
+import pytest
+
+from numeracrypt.core.backend import numpy_available
+from numeracrypt.core.cipher import NumeraCrypt
+from numeracrypt.core.key import Key
+from numeracrypt.core.schedule import KeySchedule
+from numeracrypt.core.segment import SEGMENT_ALIGN, releases_gil, segments, transform_buffer, transform_file
+
+KEY = Key("segments", 9).generate()
+DATA = random.Random(22).randbytes(5 * SEGMENT_ALIGN + 123)
+
+BACKENDS = [
+    # Processes: the Python backend holds the GIL.
+    "python",
+    # Threads.
+    pytest.param("numpy", marks=pytest.mark.skipif(not numpy_available(), reason="needs NumPy")),
+]
+
+
+def test_segments_are_aligned():
+    assert segments(0) == []
+    ranges = segments(len(DATA), SEGMENT_ALIGN + 1)
+    assert ranges[0] == (0, SEGMENT_ALIGN) and ranges[-1][1] == len(DATA)
+    assert all(begin % SEGMENT_ALIGN == 0 for begin, _ in ranges)
+    assert all(end == begin for (_, end), (begin, _) in zip(ranges, ranges[1:]))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_buffer_matches_sequential(backend):
+    schedule = KeySchedule.from_key(KEY, backend)
+    assert releases_gil(schedule) == (backend == "numpy")
+    for start in (0, 7):
+        expected = schedule.encrypt(DATA, start)
+        buf = bytearray(DATA)
+        transform_buffer(schedule, memoryview(buf), True, start=start, workers=3, segment_size=SEGMENT_ALIGN)
+        assert buf == expected
+        transform_buffer(schedule, memoryview(buf), False, start=start, workers=3, segment_size=SEGMENT_ALIGN)
+        assert buf == DATA
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("in_place", [False, True])
+# Chunk sizes that are no multiple of the key period.
+@pytest.mark.parametrize("chunk_size", [1000, 4099])
+def test_file_matches_sequential(tmp_path, backend, in_place, chunk_size):
+    schedule = KeySchedule.from_key(KEY, backend)
+    assert SEGMENT_ALIGN % schedule.period and chunk_size % schedule.period
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    transform_file(schedule, str(path), True, workers=3, chunk_size=chunk_size,
+                   segment_size=SEGMENT_ALIGN, in_place=in_place)
+    assert path.read_bytes() == schedule.encrypt(DATA)
+    transform_file(schedule, str(path), False, workers=3, chunk_size=chunk_size,
+                   segment_size=SEGMENT_ALIGN, in_place=in_place)
+    assert path.read_bytes() == DATA
+
+
+@pytest.mark.parametrize("options", [dict(stream=True), dict(mmap=True)])
+def test_workers_match_single_worker(tmp_path, options):
+    paths = {workers: tmp_path / f"workers-{workers}.bin" for workers in (1, 2)}
+    for workers, path in paths.items():
+        path.write_bytes(DATA)
+        NumeraCrypt(str(path), KEY, file=True, encoding="raw", workers=workers, chunk_size=3333,
+                    **options).encrypt()
+    assert paths[1].read_bytes() == paths[2].read_bytes()
+    assert bytes(NumeraCrypt("", KEY, workers=2).encrypt_bytes(DATA)) == paths[1].read_bytes()
@@ -0,0 +1,60 @@
+"""
+Startup cost: scripts call the CLI thousands of times, so importing the library and
+running a short `numeracrypt encrypt --content` must not pull in heavy modules.
+
+Wall-clock startup times are measured by the `startup` group of numeracrypt.bench.
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Never needed to encrypt a short string.
+HEAVY_MODULES = ("numpy", "typer", "sqlite3", "dotenv", "concurrent.futures", "multiprocessing", "tracemalloc")
+# The CLI needs typer, but nothing else from the list above.
+CLI_HEAVY_MODULES = tuple(m for m in HEAVY_MODULES if m != "typer")
+
+
+def _run(script: str, *args: str) -> str:
+    env = dict(os.environ, NUMERACRYPT_DAEMON="0")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    out = subprocess.run([sys.executable, "-c", script, *args], check=True, env=env, cwd=ROOT,
+                         capture_output=True, text=True)
+    return out.stdout.strip()
+
+
+def _loaded(modules) -> str:
+    # Script line printing which of `modules` the process imported.
+    return f"print('loaded:' + ','.join(m for m in {modules!r} if m in sys.modules))\n"
+
+
+def test_library_import_skips_heavy_modules():
+    script = (
+        "import sys\n"
+        "from numeracrypt.core.cipher import NumeraCrypt\n"
+        "from numeracrypt.core.key import Key\n"
+        "NumeraCrypt('hello', Key('salt', 8).generate()).encrypt()\n"
+        + _loaded(HEAVY_MODULES)
+    )
+    assert _run(script) == "loaded:"
+
+
+def test_cli_content_skips_heavy_modules():
+    key = _run("from numeracrypt.core.key import Key; print(Key('startup', 8).generate())")
+    script = (
+        "import runpy, sys\n"
+        "sys.argv = ['numeracrypt', 'encrypt', '--content', 'hello', '--key', sys.argv[1]]\n"
+        "try:\n"
+        "    runpy.run_module('numeracrypt.cli', run_name='__main__')\n"
+        "except SystemExit as exit:\n"
+        "    assert not exit.code, exit.code\n"
+        + _loaded(CLI_HEAVY_MODULES)
+    )
+    lines = _run(script, key).splitlines()
+    assert "Encrypted content" in lines[0]
+    assert lines[-1] == "loaded:"
+
+
+def test_package_import_is_lazy():
+    assert _run("import sys, numeracrypt; print('numeracrypt.core.cipher' in sys.modules)") == "False"
@@ -4,10 +4,11 @@ setup(
     name="numeracrypt",
     version="1.0.0",
     packages=find_packages(),
-    install_requires=["base91", "typer"],
+    install_requires=["typer"],
+    extras_require={"numpy": ["numpy"]},
     entry_points={
         "console_scripts": [
-            "numeracrypt=numeracrypt.cli:app"
+            "numeracrypt=numeracrypt.client:main"
         ]
     },
     author="PauWol",